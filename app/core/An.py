@@ -1,7 +1,12 @@
 import math
-from typing import Tuple, NamedTuple, Optional, List
-from statistics import stdev, variance, mean
-from .template import DesignationTemplate, Data, Config
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Tuple, NamedTuple, Optional, List, Sequence
+import numpy as np
+from .template import DesignationTemplate, Data, Config, Window
+from .tools import sufficient_statistics, fit_line, fit_segments,\
+    IntegralIndex, LineFit
+from .ballistics import Ballistics, BallisticsOutput, TraceFit
 from ..head.objects import Survey
 
 class SurveyDetails(NamedTuple):
@@ -14,6 +19,8 @@ class SurveyDetails(NamedTuple):
     smp_time: float
     press_values: Tuple[float, ...]
     point_time: Optional[float] = None #ms
+    burn_window: Optional[Window] = None #t0-tk view of press_values
+    trace: Optional[np.ndarray] = None #(p, u) rows of the whole-trace method
 
 
 class AnOutput(NamedTuple):
@@ -21,86 +28,276 @@ class AnOutput(NamedTuple):
     n: float
     surveys_details: Tuple[SurveyDetails, ...]
     work_pressures: Tuple[float, ...]
+    A_se: Optional[float] = None
+    n_se: Optional[float] = None
+    r2: Optional[float] = None
+    residuals: Optional[np.ndarray] = None #ln(u) - ln(A * p^n)
+    A_ci: Optional[Tuple[float, float]] = None #95%
+    n_ci: Optional[Tuple[float, float]] = None #95%
+    bootstrap: Optional["Bootstrap"] = None
+    regimes: Optional[Tuple["Regime", ...]] = None #from the lowest pressure
+    nozzle_design: Optional["NozzleDesign"] = None
+    simulations: Optional[Tuple[BallisticsOutput, ...]] = None
+    trace_fit: Optional[TraceFit] = None #A, n fitted to pressure traces
+
+
+class Bootstrap(NamedTuple):
+    A: np.ndarray #A of every resample
+    n: np.ndarray
+    A_ci: Tuple[float, float] #95% percentile interval
+    n_ci: Tuple[float, float]
+
+
+class Regime(NamedTuple):
+    A: float
+    n: float
+    n_se: float
+    p_min: float #Pa
+    p_max: float #Pa
+
+
+class NozzleDesign(NamedTuple):
+    pressures: np.ndarray #MPa
+    jet_d: np.ndarray #mm, (grains, pressures)
+    grains: Tuple[str, ...]
+    jet_d_low: Optional[np.ndarray] = None #95% bootstrap band
+    jet_d_high: Optional[np.ndarray] = None
+
+
+class AnFit(NamedTuple):
+    A: float
+    n: float
+    A_se: float
+    n_se: float
+    r2: float
+    residuals: np.ndarray
+    A_ci: Tuple[float, float]
+    n_ci: Tuple[float, float]
+
+
+def bootstrap_fits(statistics: np.ndarray, resamples: int, seed=None)\
+    -> Tuple[np.ndarray, np.ndarray]:
+    """ln(A) and n of the least-squares lines of resamples of surveys drawn
+    with replacement, all solved at once from the rows of sufficient
+    statistics (count, sx, sy, sxx, sxy, syy) of the surveys' points.
+    Resamples whose points share one x are left out."""
+    surveys = len(statistics)
+    picks = np.random.default_rng(seed).integers(
+        0, surveys, (resamples, surveys))
+    picks += surveys * np.arange(resamples)[:, None]
+    counts = np.bincount(picks.ravel(), minlength=resamples * surveys)
+    count, sx, sy, sxx, sxy, syy =\
+        (counts.reshape(resamples, surveys) @ statistics).T
+
+    Sxx = sxx - sx * sx / count
+    Sxy = sxy - sx * sy / count
+    valid = Sxx > 1e-12 * sxx
+    n = Sxy[valid] / Sxx[valid]
+    return (sy[valid] - n * sx[valid]) / count[valid], n
 
 
 class An(DesignationTemplate):
+    BOOTSTRAP_CHUNK = 20_000
+    DESIGN_SAMPLES = 1000
+    TRACE_ITERATIONS = 30
+    TRACE_TOLERANCE = 1e-9 #of n
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.details: List[SurveyDetails, ...] = []
+        self.log_points: Tuple[np.ndarray, ...] = ()
 
     def get_p_u(self, surveys: Tuple[Survey, ...])\
-        -> Tuple[Tuple[float, float], ...]:
-        values = list()
+        -> Tuple[np.ndarray, ...]:
+        "(p, u) rows of every survey, one row unless the whole trace is used."
         if self.config.calculation_method == 0: #mean
-            for survey in surveys:
-                values.append(self.get_average_p_u(survey))
-        else:
-            for survey, t in zip(surveys, self.data.times):
-                values.append(self.get_pointed_p_u(survey, t))
-        return tuple(values)
+            return tuple(np.array([self.get_average_p_u(survey)])
+                         for survey in surveys)
+        if self.config.calculation_method == 1: #moment
+            return tuple(np.array([self.get_pointed_p_u(survey, t)])
+                         for survey, t in zip(surveys, self.data.times))
+        decimation = getattr(self.data.variables, "decimation", 1)
+        _, traces = self.solve_traces(surveys, decimation)
+        return tuple(np.array([self.get_trace_p_u(survey, trace)])
+                     for survey, trace in zip(surveys, traces))
 
     def get_average_p_u(self, survey: Survey)\
         -> Tuple[float, float]:
-        smp_time = self.ms_to_s(survey.sampling_time)
         times = (survey.t0, survey.tk, survey.tc)
-
-        press_values = self.cut_values(
+        ave_p, ave_u, Ipk = self.average_p_u(survey)
+        window = self.cut_values(
             survey.values[0], survey.sampling_time, times, 1)
-        press_values = self.MPa_to_Pa(press_values)
+
+        F_min = self.F_min(survey)
+
+        self.details.append(SurveyDetails(ave_p, ave_u,
+            times, Ipk, survey.jet_diameter, F_min,
+            survey.sampling_time, survey.values[0], None, window))
+        return ave_p, ave_u
+
+    def average_p_u(self, survey: Survey)\
+        -> Tuple[float, float, float]:
+        "Mean pressure, burn rate and pressure impulse Ipk from t0 to tk."
+        times = (survey.t0, survey.tk, survey.tc)
 
         t0 = self.ms_to_s(survey.t0)
         tk = self.ms_to_s(survey.tk)
-        Ipk = self.integrate(press_values, smp_time)
+        Ipk = self.MPa_to_Pa(self.integrate_window(survey, 0, times, 1))
         ave_p = Ipk / (tk - t0)
 
+        ave_u = self.web(survey) / (tk - t0)
+        return ave_p, ave_u, Ipk
+
+    def web(self, survey: Survey)\
+        -> float:
+        "Web [m] of the grain burning on both its surfaces."
         d = self.mm_to_m(survey.fuel_inner_diameter)
         D = self.mm_to_m(survey.fuel_outer_diameter)
-        e = (D - d) / 4
-        ave_u = e / (tk - t0)
+        return (D - d) / 4
+
+    def get_pointed_p_u(self, survey: Survey, time: float)\
+        -> Tuple[float, float]:
+        times = (survey.t0, survey.tk, survey.tc)
+        p, u, Ip = self.pointed_p_u(survey, time)
+        window = self.cut_values(
+            survey.values[0], survey.sampling_time, times, 1)
 
         F_min = self.F_min(survey)
 
-        self.details.append(SurveyDetails(ave_p, ave_u,
-            times, Ipk, survey.jet_diameter, F_min,
-            survey.sampling_time, survey.values[0], None))
-        return ave_p, ave_u
+        self.details.append(SurveyDetails(p, u, times, Ip,
+            survey.jet_diameter, F_min, survey.sampling_time,
+            survey.values[0], time, window))
+        return p, u
 
-    def get_pointed_p_u(self, survey: Survey, time: float)\
-        -> Tuple[float, float]:
-        smp_time = self.ms_to_s(survey.sampling_time)
+    def pointed_p_u(self, survey: Survey, time: float)\
+        -> Tuple[float, float, float]:
+        "Pressure, burn rate at the given time [ms] and pressure impulse Ip."
         times = (survey.t0, survey.tk, survey.tc)
 
-        press_values = self.MPa_to_Pa(survey.values[0])
         index = int(round(time / survey.sampling_time, 0))
-        p = press_values[index]
+        p = self.MPa_to_Pa(float(survey.values[0][index]))
 
-        press_values = self.cut_values(
-            press_values, survey.sampling_time,
-            times, 1)
-        Ip = self.integrate(press_values, smp_time)
-        D = self.mm_to_m(survey.fuel_outer_diameter)
-        d = self.mm_to_m(survey.fuel_inner_diameter)
-        L = self.mm_to_m(survey.fuel_length)
-        V = math.pi*((D/2)**2 - (d/2)**2)*L
-        S = (2*math.pi*d/2*L) + (2*math.pi*D/2*L) +\
-             2*(math.pi*((D/2)**2 - (d/2)**2))
-        u = (V * p) / (S * Ip)
+        Ip = self.MPa_to_Pa(self.integrate_window(survey, 0, times, 1))
+        u = self.volume_to_surface(survey) * p / Ip
+        return p, u, Ip
+
+    def get_trace_p_u(self, survey: Survey, trace: np.ndarray)\
+        -> Tuple[float, float]:
+        "Geometric means of p and u over the trace points, nan without any."
+        times = (survey.t0, survey.tk, survey.tc)
+        window = self.cut_values(
+            survey.values[0], survey.sampling_time, times, 1)
+        Ip = self.MPa_to_Pa(self.integrate_window(survey, 0, times, 1))
+        p, u = self.trace_centroid(trace)
 
         F_min = self.F_min(survey)
 
         self.details.append(SurveyDetails(p, u, times, Ip,
             survey.jet_diameter, F_min, survey.sampling_time,
-            survey.values[0], time))
+            survey.values[0], None, window, trace))
         return p, u
 
-    def calculate_An(self, surveys: Tuple[Survey, ...])\
+    @staticmethod
+    def trace_centroid(trace: np.ndarray)\
         -> Tuple[float, float]:
-        cords = self.get_p_u(surveys)
-        xs = tuple(math.log(p) for p, _ in cords)
-        ys = tuple(math.log(u) for _, u in cords)
-        n = self.correlation(xs, ys) * stdev(ys) / stdev(xs)
-        A = math.exp(mean(ys) - n * mean(xs))
-        return A, n
+        "Geometric means of p and u of the (p, u) rows, nan without any."
+        if not len(trace):
+            return math.nan, math.nan
+        p, u = np.exp(np.log(trace).mean(axis=0))
+        return float(p), float(u)
+
+    def trace_pressure(self, survey: Survey)\
+        -> np.ndarray:
+        "Pressure [Pa] from t0 to tk, negative samples as 0."
+        times = (survey.t0, survey.tk, survey.tc)
+        window = self.cut_values(
+            survey.values[0], survey.sampling_time, times, 1)
+        return self.MPa_to_Pa(1) * np.maximum(
+            np.asarray(window.values, dtype=float), 0.0)
+
+    def trace_p_u(self, survey: Survey, n: float, decimation: int = 1,
+        pressure: Optional[np.ndarray] = None)\
+        -> np.ndarray:
+        """(p, u) rows of every decimation-th sample from t0 to tk with
+        pressure above 0. The web burned by t is e * J(t) / J(tk) with J
+        the cumulative integral of p^n, so u = e * p^n / J(tk)."""
+        p = self.trace_pressure(survey) if pressure is None else pressure
+        power = p ** n
+        J = IntegralIndex(power, self.ms_to_s(survey.sampling_time),
+            self.config.integration_method).cumulative(0, len(p) - 1)[-1]
+        p, power = p[::decimation], power[::decimation]
+        kept = p > 0
+        return np.column_stack((p[kept], self.web(survey) / J * power[kept]))
+
+    def solve_traces(self, surveys: Sequence[Survey], decimation: int = 1)\
+        -> Tuple[Optional[LineFit], Tuple[np.ndarray, ...]]:
+        """Fit through one point per survey, the geometric means of its
+        trace points built with the n the fit returns, and the points of
+        every survey. Within a trace the points lie on a line of slope n
+        by construction and tell nothing of n, so only the differences
+        between surveys decide it, as in the mean method; the errors and
+        R² of the fit count surveys, not samples. Secant steps find the n
+        where the slope meets n. None without two surveys of different
+        pressure, the traces then empty."""
+        pressures = [self.trace_pressure(survey) for survey in surveys]
+        ln_p = [np.log(p[p > 0]).mean() for p in pressures if np.any(p > 0)]
+        if len(ln_p) < 2 or np.ptp(ln_p) == 0:
+            return None, tuple(np.empty((0, 2)) for _ in surveys)
+
+        def fit(n):
+            traces = tuple(self.trace_p_u(survey, n, decimation, p)
+                           for survey, p in zip(surveys, pressures))
+            cords = np.log([self.trace_centroid(trace)
+                            for trace in traces if len(trace)])
+            return fit_line(sufficient_statistics(cords[:, 0], cords[:, 1])),\
+                traces
+
+        n0, n1 = 0.5, 0.6
+        g0 = fit(n0)[0].slope - n0
+        line, traces = fit(n1)
+        for _ in range(self.TRACE_ITERATIONS):
+            g1 = line.slope - n1
+            if abs(g1) <= self.TRACE_TOLERANCE or g1 == g0:
+                break
+            n0, n1, g0 = n1, n1 - g1 * (n1 - n0) / (g1 - g0), g1
+            line, traces = fit(n1)
+        return line, traces
+
+    def volume_to_surface(self, survey: Survey)\
+        -> float:
+        "Grain volume to burning surface ratio [m] of the moment method."
+        D = self.mm_to_m(survey.fuel_outer_diameter)
+        d = self.mm_to_m(survey.fuel_inner_diameter)
+        L = self.mm_to_m(survey.fuel_length)
+        V = math.pi*((D/2)**2 - (d/2)**2)*L
+        S = (2*math.pi*d/2*L) + (2*math.pi*D/2*L) +\
+             2*(math.pi*((D/2)**2 - (d/2)**2))
+        return V / S
+
+    def calculate_An(self, surveys: Tuple[Survey, ...])\
+        -> AnFit:
+        """Least-squares line ln(u) = ln(A) + n * ln(p). Standard error
+        of A follows from the one of ln(A). All nan without points of two
+        different pressures."""
+        self.log_points = tuple(points for points in
+            (np.log(points) for points in self.get_p_u(surveys))
+            if np.all(np.isfinite(points)))
+        cords = np.concatenate(self.log_points or (np.empty((0, 2)),))
+        xs, ys = cords[:, 0], cords[:, 1]
+        if len(np.unique(xs)) < 2:
+            nan = math.nan
+            return AnFit(nan, nan, nan, nan, nan, np.full(len(ys), nan),
+                         (nan, nan), (nan, nan))
+        fit = fit_line(sufficient_statistics(xs, ys))
+
+        n = fit.slope
+        #a wide interval of ln(A) from close pressures overflows to inf
+        with np.errstate(over="ignore"):
+            A = float(np.exp(fit.intercept))
+            A_ci = tuple(float(bound) for bound in np.exp(fit.intercept_ci))
+        residuals = ys - (fit.intercept + n * xs)
+        return AnFit(A, n, A * fit.intercept_se, fit.slope_se, fit.r2,
+            residuals, A_ci, fit.slope_ci)
 
     def F_min(self, survey: Survey)\
         -> float:
@@ -125,47 +322,156 @@ class An(DesignationTemplate):
 
     def work_p(self, survey: Survey, A, n)\
         -> float:
-        D = self.mm_to_m(survey.fuel_outer_diameter)
-        d = self.mm_to_m(survey.fuel_inner_diameter)
-        L = self.mm_to_m(survey.fuel_length)
+        return float(self.work_p_sweep(survey.jet_diameter, (survey,), A, n)[0, 0, 0])
+
+    def grain_constants(self, surveys: Sequence[Survey])\
+        -> np.ndarray:
+        "density * S / c of the grain of every survey."
+        to_m = self.mm_to_m(1)
+        D, d, L = (to_m * np.array(values, dtype=float)
+            for values in zip(*((s.fuel_outer_diameter, s.fuel_inner_diameter,
+                                 s.fuel_length) for s in surveys)))
+        mass = self.g_to_kg(1) * np.array([s.fuel_mass for s in surveys],
+                                          dtype=float)
         fp = self.MPa_to_Pa(self.data.variables.fuel.strength)
         k = self.data.variables.fuel.k
-        dmin = self.mm_to_m(survey.jet_diameter)
 
         V = (math.pi * (D**2 - d**2) / 4) * L
-        density = self.g_to_kg(survey.fuel_mass) / V
+        density = mass / V
 
         S = (2 * math.pi * (D**2 - d**2) / 4) + (2 * math.pi * L * (D + d) / 2)
         K0 = ((2 / (k + 1))**(1/(k-1))) * math.sqrt((2*k)/(k+1))
         c = K0 / math.sqrt(fp)
-        Fm = (math.pi * dmin ** 2) / 4
-        return self.Pa_to_MPa(((density * S * A) / (c * Fm)) ** (1 / (1 - n)))
+        return density * S / c
 
-    def correlation(self, xs: Tuple[float, ...], ys: Tuple[float, ...])\
-        -> float:
-        stdev_x = stdev(xs)
-        stdev_y = stdev(ys)
-        if stdev_x > 0 and stdev_y > 0:
-            return self.covariance(xs, ys) / stdev_x / stdev_y
+    def work_p_sweep(self, jet_ds, surveys: Sequence[Survey], A, n)\
+        -> np.ndarray:
+        """Equilibrium pressure [MPa] for every jet diameter [mm], grain of
+        the surveys and (A, n) pair, shaped (jets, grains, pairs)."""
+        dmin = self.mm_to_m(1) * np.atleast_1d(np.asarray(jet_ds, dtype=float))
+        Fm = ((math.pi * dmin ** 2) / 4)[:, None, None]
+        K = self.grain_constants(surveys)[None, :, None]
+        A = np.atleast_1d(A)[None, None, :]
+        n = np.atleast_1d(n)[None, None, :]
+        return self.Pa_to_MPa(1) * (K * A / Fm) ** (1 / (1 - n))
+
+    def jet_d_sweep(self, pressures, surveys: Sequence[Survey], A, n)\
+        -> np.ndarray:
+        """Jet diameter [mm] giving every equilibrium pressure [MPa] for
+        every grain of the surveys and (A, n) pair, shaped
+        (pressures, grains, pairs). Inverse of work_p_sweep."""
+        p = self.MPa_to_Pa(1) *\
+            np.atleast_1d(np.asarray(pressures, dtype=float))[:, None, None]
+        K = self.grain_constants(surveys)[None, :, None]
+        A = np.atleast_1d(A)[None, None, :]
+        n = np.atleast_1d(n)[None, None, :]
+        Fm = K * A / p ** (1 - n)
+        return self.m_to_mm(1) * 2 * np.sqrt(Fm / math.pi)
+
+    def nozzle_design(self, fit: AnFit, bootstrap: Optional[Bootstrap],
+        work_pressures: Tuple[float, ...], points: int = 100)\
+        -> NozzleDesign:
+        """Jet diameters over a range of target pressures around the work
+        pressures, for every distinct grain of the surveys."""
+        grains = {}
+        for survey in self.data.surveys:
+            key = (survey.fuel_outer_diameter, survey.fuel_inner_diameter,
+                   survey.fuel_length, survey.fuel_mass)
+            grains.setdefault(key, survey)
+        surveys = tuple(grains.values())
+
+        pressures = np.linspace(0.5 * min(work_pressures),
+                                1.5 * max(work_pressures), points)
+        jet_d = self.jet_d_sweep(pressures, surveys, fit.A, fit.n)[:, :, 0].T
+        low = high = None
+        if bootstrap:
+            step = max(len(bootstrap.n) // self.DESIGN_SAMPLES, 1)
+            samples = self.jet_d_sweep(pressures, surveys,
+                bootstrap.A[::step], bootstrap.n[::step])
+            low, high = np.percentile(samples, (2.5, 97.5), axis=2)
+            low, high = low.T, high.T
+        labels = tuple(f"D = {D}, d = {d}, L = {L} mm"
+                       for D, d, L, _ in grains)
+        return NozzleDesign(pressures, jet_d, labels, low, high)
+
+    def bootstrap_An(self, resamples: int, workers: int = 1, seed=None)\
+        -> Optional[Bootstrap]:
+        """Percentile intervals of A and n over resamples of the surveys,
+        each drawn with all of its (p, u) points. Chunks of resamples go
+        to a process pool when more than one worker is given."""
+        if len(self.log_points) < 2 or resamples < 1:
+            return None
+        statistics = np.array([sufficient_statistics(*points.T)
+                               for points in self.log_points])
+
+        chunks = -(-resamples // self.BOOTSTRAP_CHUNK)
+        sizes = [len(c) for c in np.array_split(np.empty(resamples), chunks)]
+        seeds = np.random.SeedSequence(seed).spawn(chunks)
+        if workers > 1 and chunks > 1:
+            with ProcessPoolExecutor(workers) as executor:
+                results = list(executor.map(bootstrap_fits,
+                    repeat(statistics), sizes, seeds))
         else:
-            return 0
+            results = [bootstrap_fits(statistics, size, s)
+                       for size, s in zip(sizes, seeds)]
 
-    def covariance(self, xs: Tuple[float, ...], ys: Tuple[float, ...])\
-        -> float:
-        return self.dot(self.de_mean(xs), self.de_mean(ys)) / (len(xs) - 1)
+        with np.errstate(over="ignore"):
+            A = np.exp(np.concatenate([result[0] for result in results]))
+        n = np.concatenate([result[1] for result in results])
+        if not len(n):
+            return None
+        A_ci = tuple(float(v) for v in np.percentile(A, (2.5, 97.5)))
+        n_ci = tuple(float(v) for v in np.percentile(n, (2.5, 97.5)))
+        return Bootstrap(A, n, A_ci, n_ci)
 
-    @staticmethod
-    def dot(xs: Tuple[float, ...], ys: Tuple[float, ...])\
-        -> float:
-        return sum(x_i * y_i for x_i, y_i in zip(xs, ys))
+    def segmented_An(self, max_segments: int)\
+        -> Tuple[Regime, ...]:
+        """A and n of every pressure regime of the piecewise fit of the
+        points used by calculate_An."""
+        cords = np.concatenate(self.log_points)
+        fit = fit_segments(cords[:, 0], cords[:, 1], max_segments)
+        with np.errstate(over="ignore"):
+            return tuple(Regime(float(np.exp(line.intercept)), line.slope,
+                line.slope_se, math.exp(low), math.exp(high))
+                for line, (low, high) in zip(fit.lines, fit.bounds))
 
-    @staticmethod
-    def de_mean(xs: Tuple[float, ...])\
-        -> Tuple[float, ...]:
-        x_bar = mean(xs)
-        return tuple(x - x_bar for x in xs)
-    
     def get_results(self) -> AnOutput:
-        A, n = self.calculate_An(self.data.surveys)
-        w_p = tuple((self.work_p(s, A, n) for s in self.data.surveys))
-        return AnOutput(A, n, self.details, w_p)
+        trace = self.trace
+        with trace.stage("fit"):
+            fit = self.calculate_An(self.data.surveys)
+            w_p = tuple((self.work_p(s, fit.A, fit.n)
+                         for s in self.data.surveys))
+            trace.record("A", fit.A, "m/(s*Pa^n)")
+            trace.record("n", fit.n)
+            trace.record("r2", fit.r2)
+            trace.record("work pressures", w_p, "MPa")
+        if not math.isfinite(fit.n): #nothing to build on
+            return AnOutput(fit.A, fit.n, self.details, w_p, *fit[2:])
+
+        variables = self.data.variables
+        resamples = getattr(variables, "bootstrap_resamples", 0)
+        with trace.stage("bootstrap"):
+            bootstrap = self.bootstrap_An(resamples,
+                getattr(variables, "bootstrap_workers", 1))\
+                if resamples else None
+        max_segments = getattr(variables, "max_segments", 1)
+        with trace.stage("segments"):
+            regimes = self.segmented_An(max_segments)\
+                if max_segments > 1 else None
+        with trace.stage("nozzle design"):
+            design = self.nozzle_design(fit, bootstrap, w_p)
+
+        ballistics = Ballistics(self.data, self.config, trace)
+        with trace.stage("simulation"):
+            simulations = ballistics.simulate(fit.A, fit.n)\
+                if getattr(variables, "simulate", False) else None
+        with trace.stage("trace fit"):
+            trace_fit = ballistics.fit_traces(fit.A, fit.n)\
+                if getattr(variables, "fit_traces", False) else None
+            if trace_fit:
+                trace.record("A", trace_fit.A, "m/(s*Pa^n)")
+                trace.record("n", trace_fit.n)
+                trace.record("rms", trace_fit.rms, "MPa")
+                trace.record("iterations", trace_fit.iterations)
+        return AnOutput(fit.A, fit.n, self.details, w_p, *fit[2:], bootstrap,
+            regimes, design, simulations, trace_fit)
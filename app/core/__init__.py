@@ -1,4 +1,7 @@
-from .template import Data, Config
-from .impulse import Impulse, ImpulseOutput
-from .An import An, AnOutput
-from .enginepara import EnginePara, EngineParaOutput
\ No newline at end of file
+from .template import Data, Config, Quantity, Window
+from .impulse import Impulse, ImpulseOutput, ThrustCoefficient
+from .An import An, AnOutput, Bootstrap, Regime, NozzleDesign
+from .enginepara import EnginePara, EngineParaOutput, EngineParaSummary,\
+    EngineInputs, Sensitivity
+from .ballistics import Ballistics, BallisticsOutput, TraceFit
+
@@ -0,0 +1,323 @@
+import math
+from typing import NamedTuple, Optional, Tuple, Sequence
+import numpy as np
+from .template import DesignationTemplate, Data, Config
+from .tools import window_bounds
+from ..head.objects import Survey
+
+
+class BallisticsOutput(NamedTuple):
+    time: np.ndarray #ms, sampling grid of the survey
+    pressure: np.ndarray #MPa
+    thrust: np.ndarray #kN
+    burn_time: float #ms from t0
+    max_pressure: float #MPa
+
+
+class Grains(NamedTuple):
+    "Grains of the simulated surveys, every field an array [SI]."
+    D: np.ndarray
+    d: np.ndarray
+    L: np.ndarray
+    density: np.ndarray
+    volume: np.ndarray
+    free_volume: np.ndarray
+    Fm: np.ndarray
+    web: np.ndarray
+
+
+class Burn(NamedTuple):
+    "Simulated pressure of one grain, the burn starting at time 0."
+    time: np.ndarray #s, of the steps up to the burnout or the end time
+    pressure: np.ndarray #Pa
+    decay: float #1/s, rate of the emptying of the chamber after the steps
+    burn_time: float #s
+
+
+class TraceFit(NamedTuple):
+    A: float
+    n: float
+    A_se: float
+    n_se: float
+    rms: float #MPa, of measured minus simulated pressure
+    iterations: int
+    simulations: Tuple[BallisticsOutput, ...]
+
+
+class Ballistics(DesignationTemplate):
+    """Burnback of tubular grains burning on all surfaces with the chamber
+    mass balance V dp/dt = f (rho S u - c p Fm) - p S u, u = A p^n,
+    integrated for all surveys at once. The outflow term, whose time
+    constant is far shorter than the burn, is integrated exactly by
+    exponential steps (ETD2), so every grain takes STEPS_PER_BURN steps
+    of its own length over its estimated burn. The burn starts at t0
+    from the igniter pressure."""
+    IGNITION_PRESSURE = 100_000 #Pa
+    STEPS_PER_BURN = 100
+    STEP_GROWTH = 1.2 #per step, from a quarter of the filling time
+    MIN_STEP = 1e-6 #s
+    MIN_FREE_VOLUME = 0.1 #part of the grain volume
+    FIT_ITERATIONS = 30
+    FIT_TOLERANCE = 1e-3 #of the cost
+    JACOBIAN_STEP = 1e-2 #of ln(A), relative change of the burn rate
+    N_BOUNDS = 0.01, 0.99 #of the fitted n
+    MAX_DAMPING = 1e12
+
+    def simulate(self, A: float, n: float,
+        thrust_coefficient: Optional[float] = None)\
+        -> Tuple[BallisticsOutput, ...]:
+        """Pressure and thrust of every survey's grain on its sampling grid.
+        Without a thrust coefficient the one of an ideal convergent nozzle
+        is used."""
+        surveys = self.data.surveys
+        grains = self.get_grains(surveys)
+        k = self.data.variables.fuel.k
+        if thrust_coefficient is None:
+            K0 = ((2 / (k + 1))**(1/(k-1))) * math.sqrt((2*k)/(k+1))
+            thrust_coefficient = K0 * math.sqrt(2*k / (k+1)) +\
+                (2 / (k+1))**(k / (k-1))
+
+        A = np.full(len(surveys), A, dtype=float)
+        n = np.full(len(surveys), n, dtype=float)
+        burns = self.integrate(grains, A, n, self.get_end_time(surveys))
+        outputs = []
+        for i, (survey, burn) in enumerate(zip(surveys, burns)):
+            time = survey.sampling_time * np.arange(len(survey.values[0]))
+            pressure = self.on_grid(survey, burn)
+            thrust = self.N_to_kN(1) * thrust_coefficient *\
+                grains.Fm[i] * self.MPa_to_Pa(1) * pressure
+            outputs.append(BallisticsOutput(time, pressure, thrust,
+                self.s_to_ms(1) * burn.burn_time, float(np.max(pressure))))
+        return tuple(outputs)
+
+    def pressure_traces(self, surveys: Sequence[Survey], A: np.ndarray,
+        n: np.ndarray, grains: Optional[Grains] = None)\
+        -> Tuple[np.ndarray, ...]:
+        """Pressure [MPa] on the sampling grid of every survey, each with
+        its own A and n, all integrated at once."""
+        grains = grains or self.get_grains(surveys)
+        burns = self.integrate(grains, A, n, self.get_end_time(surveys))
+        return tuple(self.on_grid(survey, burn)
+                     for survey, burn in zip(surveys, burns))
+
+    def integrate(self, grains: Grains, A: np.ndarray, n: np.ndarray,
+        t_end: float)\
+        -> Tuple[Burn, ...]:
+        "Burn of every grain up to its burnout or t_end [s]."
+        fuel = self.data.variables.fuel
+        f = self.MPa_to_Pa(fuel.strength)
+        k = fuel.k
+        K0 = ((2 / (k + 1))**(1/(k-1))) * math.sqrt((2*k)/(k+1))
+        c = K0 / math.sqrt(f)
+
+        outflow = f * c * grains.Fm
+        end_volume = grains.free_volume + grains.volume
+        r_sum = (grains.D + grains.d) / 2 #of the inner and outer radius
+        wall = 2 * math.pi * r_sum
+        ring_depth = (grains.D - grains.d) / 2 #of the ring at x = 0
+        L, web, gas = grains.L, grains.web, f * grains.density
+
+        def rates(p, x):
+            """Source of dp/dt, its decay rate and the burn rate, which
+            goes on past the web to place the burnout within a step."""
+            length = np.maximum(L - 2 * x, 0.0)
+            ring = wall / 2 * np.maximum(ring_depth - 2 * x, 0.0)
+            S = (wall * length + 2 * ring) * (x < web)
+            V = end_volume - ring * length
+            u = A * np.maximum(p, 0.0)**n
+            return (gas - p) * S * u / V, outflow / V, u
+
+        #steps from the burn time at the equilibrium pressure of the start
+        S0 = wall * (L + ring_depth)
+        with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+            p_eq = np.minimum(gas, (grains.density * A * S0 /
+                                    (c * grains.Fm))**(1 / (1 - n)))
+            estimate = web / (A * p_eq**n)
+        estimate = np.where(np.isfinite(estimate), estimate, t_end)
+        h = np.clip(estimate, self.MIN_STEP * self.STEPS_PER_BURN, t_end) /\
+            self.STEPS_PER_BURN
+
+        count = len(A)
+        t = np.zeros(count)
+        p = np.full(count, float(self.IGNITION_PRESSURE))
+        x = np.zeros(count)
+        burn_times = np.full(count, math.nan)
+        active = np.ones(count, dtype=bool)
+        times, pressures, steps = [t], [p], [active]
+
+        def step(p, x, h):
+            "ETD2 step, the decay rate frozen at its start."
+            g0, decay, u0 = rates(p, x)
+            z = decay * h
+            e = np.exp(-z)
+            phi1 = -np.expm1(-z) / z
+            phi2 = (e - 1 + z) / (z * z)
+            p_mid = p * e + h * phi1 * g0
+            x_mid = x + h * u0
+            g1, decay1, u1 = rates(p_mid, x_mid)
+            g1 -= (decay1 - decay) * p_mid
+            return p_mid + h * phi2 * (g1 - g0), x + h / 2 * (u0 + u1)
+
+        #the first steps resolve the rise of the pressure to equilibrium
+        h_rise = np.minimum(grains.free_volume / outflow / 4, h)
+        while active.any():
+            h_now = np.minimum(h_rise * self.STEP_GROWTH**(len(times) - 1), h)
+            p_new, x_new = step(p, x, h_now)
+            burnt = active & (x_new >= web)
+            if burnt.any():
+                #the last step of a grain ends at its burnout
+                share = np.ones(count)
+                share[burnt] = ((web - x) / (x_new - x))[burnt]
+                h_now = h_now * share
+                p_new, x_new = step(p, x, h_now)
+                burn_times[burnt] = (t + h_now)[burnt]
+            t = np.where(active, t + h_now, t)
+            p = np.where(active, p_new, p)
+            x = np.where(active, x_new, x)
+            times.append(t)
+            pressures.append(p)
+            steps.append(active)
+            active = active & ~burnt & (t < t_end) & np.isfinite(p)
+
+        burn_times = np.where(np.isnan(burn_times), t, burn_times)
+        times, pressures, steps =\
+            np.array(times), np.array(pressures), np.array(steps)
+        return tuple(Burn(times[steps[:, i], i], pressures[steps[:, i], i],
+                          float(outflow[i] / end_volume[i]),
+                          float(burn_times[i]))
+                     for i in range(count))
+
+    @staticmethod
+    def sample(burn: Burn, time: np.ndarray)\
+        -> np.ndarray:
+        "Pressure [Pa] of the burn at times [s], 0 before its start."
+        pressure = np.interp(time, burn.time, burn.pressure, left=0.0)
+        after = time > burn.time[-1]
+        pressure[after] = burn.pressure[-1] *\
+            np.exp(-burn.decay * (time[after] - burn.time[-1]))
+        return pressure
+
+    def fit_traces(self, A: float, n: float)\
+        -> Optional[TraceFit]:
+        """Levenberg-Marquardt fit of ln(A) and n starting from the given
+        ones, minimizing squared differences of measured and simulated
+        pressure over t0..tc of all surveys. Residuals of the parameters
+        and the central differences of the Jacobian come from one
+        integration of the surveys' grains tiled five times. n is kept
+        within N_BOUNDS and steps giving non-finite residuals are turned
+        down like ones raising the cost. None if the start itself gives
+        non-finite residuals."""
+        surveys = self.data.surveys
+        count = len(surveys)
+        grains = self.get_grains(surveys)
+        tiled = Grains(*(np.tile(field, 5) for field in grains))
+        t_end = self.get_end_time(surveys)
+
+        times, measured = [], []
+        for survey in surveys:
+            start, end = window_bounds(len(survey.values[0]),
+                survey.sampling_time, (survey.t0, survey.tk, survey.tc), 2)
+            times.append(survey.sampling_time * np.arange(start, end + 1)
+                         - survey.t0)
+            measured.append(np.asarray(survey.values[0][start:end+1],
+                                       dtype=float))
+        measured = np.concatenate(measured)
+
+        def simulated(grains, ln_A, n):
+            #non-finite pressures of overshooting steps are turned down below
+            with np.errstate(all="ignore"):
+                burns = self.integrate(grains, np.exp(ln_A), n, t_end)
+            return self.Pa_to_MPa(1) * np.concatenate([self.sample(burn,
+                self.ms_to_s(1) * times[i % count])
+                for i, burn in enumerate(burns)])
+
+        #steps of ln(A) and n changing the burn rate alike at mean pressure
+        p_mean = self.MPa_to_Pa(max(float(np.mean(measured)), 1.0))
+        h = np.array((1.0, 1 / math.log(p_mean))) * self.JACOBIAN_STEP
+        def jacobian(theta):
+            ln_A = np.repeat((theta[0], theta[0] + h[0], theta[0],
+                              theta[0] - h[0], theta[0]), count)
+            n = np.repeat((theta[1], theta[1], theta[1] + h[1],
+                           theta[1], theta[1] - h[1]), count)
+            base, *shifted = simulated(tiled, ln_A, n).reshape(5, -1)
+            shifted = np.array(shifted)
+            return base - measured, (shifted[:2] - shifted[2:]).T / (2 * h)
+
+        def finite(residuals, J):
+            return bool(np.all(np.isfinite(residuals)) and
+                        np.all(np.isfinite(J)))
+
+        n_min, n_max = self.N_BOUNDS
+        theta = np.array((math.log(A), min(max(n, n_min), n_max)))
+        residuals, J = jacobian(theta)
+        if not finite(residuals, J):
+            return None
+        cost = float(residuals @ residuals)
+        damping = 1e-3
+        iterations = 0
+        while iterations < self.FIT_ITERATIONS and damping < self.MAX_DAMPING:
+            iterations += 1
+            JtJ = J.T @ J
+            gradient = J.T @ residuals
+            try:
+                step = np.linalg.lstsq(JtJ + damping * np.diag(np.diag(JtJ)),
+                                       -gradient, rcond=None)[0]
+            except np.linalg.LinAlgError:
+                break
+            #reduction of the cost the linearized model promises
+            predicted = -float(step @ (2 * gradient + JtJ @ step))
+            if predicted <= self.FIT_TOLERANCE * cost:
+                break
+
+            trial = theta + step
+            trial[1] = min(max(trial[1], n_min), n_max)
+            trial_residuals = simulated(grains, np.full(count, trial[0]),
+                np.full(count, trial[1])) - measured
+            trial_cost = float(trial_residuals @ trial_residuals)
+            if math.isfinite(trial_cost) and trial_cost < cost:
+                trial_residuals, trial_J = jacobian(trial)
+                if finite(trial_residuals, trial_J):
+                    theta, cost, damping = trial, trial_cost, damping / 3
+                    residuals, J = trial_residuals, trial_J
+                    continue
+            damping *= 10
+
+        dof = max(len(measured) - 2, 1)
+        try:
+            covariance = cost / dof * np.linalg.pinv(J.T @ J)
+        except np.linalg.LinAlgError:
+            covariance = np.full((2, 2), math.nan)
+        A_se, n_se = np.sqrt(np.maximum(np.diag(covariance), 0.0))
+        A, n = math.exp(theta[0]), float(theta[1])
+        return TraceFit(A, n, A * float(A_se), float(n_se),
+            math.sqrt(cost / len(measured)), iterations, self.simulate(A, n))
+
+    def on_grid(self, survey: Survey, burn: Burn)\
+        -> np.ndarray:
+        "Pressures [MPa] at the survey's samples, the burn starting at t0."
+        time = survey.sampling_time * np.arange(len(survey.values[0]))
+        return self.Pa_to_MPa(1) * self.sample(burn,
+            self.ms_to_s(1) * (time - survey.t0))
+
+    def get_end_time(self, surveys: Sequence[Survey]) -> float:
+        "Longest time [s] from t0 to the last sample of the surveys."
+        return max(self.ms_to_s(len(s.values[0]) * s.sampling_time - s.t0)
+                   for s in surveys)
+
+    def get_grains(self, surveys: Sequence[Survey])\
+        -> Grains:
+        to_m = self.mm_to_m(1)
+        D, d, L, D_ch, L_ch, dmin = (to_m * np.array(values, dtype=float)
+            for values in zip(*((s.fuel_outer_diameter, s.fuel_inner_diameter,
+                s.fuel_length, s.chamber_diameter, s.chamber_length,
+                s.jet_diameter) for s in surveys)))
+        mass = self.g_to_kg(1) * np.array([s.fuel_mass for s in surveys],
+                                          dtype=float)
+
+        volume = math.pi * (D**2 - d**2) / 4 * L
+        chamber = math.pi * D_ch**2 / 4 * L_ch
+        free_volume = np.maximum(chamber - volume,
+                                 self.MIN_FREE_VOLUME * volume)
+        web = np.minimum((D - d) / 4, L / 2)
+        return Grains(D, d, L, mass / volume, volume, free_volume,
+            math.pi * dmin**2 / 4, web)
@@ -1,7 +1,8 @@
-from typing import List, NamedTuple
+from typing import List, NamedTuple, Optional, Tuple
 import math
-import scipy.optimize as spo
+import numpy as np
 from .template import DesignationTemplate, Data, Config
+from .tools import solve_Xa, XaTable, NULL_TRACE
 
 
 class EngineParaOutput(NamedTuple):
@@ -19,115 +20,213 @@ class EngineParaOutput(NamedTuple):
     P: float  #[MPa*s]
 
 
+class EngineInputs(NamedTuple):
+    "Inputs of the loss coefficients, every field a float or an array."
+    k: float  #[-]
+    strength: float  #[MJ/kg]
+    da: float  #[mm]
+    pz: float  #[hPa]
+    I1: float  #[kN*s/kg]
+    g: float  #[m/s2]
+    jet_d: float  #[mm]
+    mass: float  #[g]
+    tc: float  #[ms]
+    P: float  #[Pa*s]
+    R: float  #[N*s]
+
+
+class Coefficients(NamedTuple):
+    fi1: np.ndarray
+    fi2: np.ndarray
+    lam: np.ndarray
+    K0_k: np.ndarray
+    zeta_a: np.ndarray
+    Xa: np.ndarray
+    Fw: np.ndarray
+    K_k: np.ndarray
+    Fmin: np.ndarray  #[m2]
+
+
+class Sensitivity(NamedTuple):
+    inputs: Tuple[str, ...]
+    step: float  #relative change of every input
+    derivatives: np.ndarray  #(fi1, fi2, lam) x inputs x surveys, per unit
+    elasticities: np.ndarray  #relative change per relative input change
+    low: np.ndarray  #coefficients with the input lowered by step
+    high: np.ndarray  #and raised by step
+
+
+class EngineParaSummary(NamedTuple):
+    surveys: Tuple[EngineParaOutput, ...]
+    mean: EngineParaOutput
+    stdev: EngineParaOutput #0 for a single survey
+    sensitivity: Optional[Sensitivity] = None
+
+
 class EnginePara(DesignationTemplate):
-    def get_results(self):
-        fuel = self.data.variables.fuel
-        survey = self.data.surveys[0]
-
-        k = fuel.k
-        fp = self.MJ_to_J(fuel.strength)
-        dmin = self.mm_to_m(survey.jet_diameter)
-        mp = self.g_to_kg(survey.fuel_mass)
-        tc = self.ms_to_s(survey.tc)
-
-        da = self.mm_to_m(self.data.variables.da)
-        pz = self.hPa_to_Pa(self.data.variables.pz)
-        I1 = self.kN_to_N(self.data.variables.I1)
-        g = self.data.variables.g
-
-        K0_k = self.K0_k(k)
-        zeta_a = da / dmin
-        Xa = self.Xa(k, K0_k, zeta_a)
-        Fw = self.Fw(k, Xa)
-        K_k = self.K_k(k, g)
-        P = self.P(survey)
-        fi2 = self.fi2(K_k, fp, Fw, mp, P)
-
-        Fmin = self.Fmin(dmin)
-        R = self.R(survey)
-        fi1fi2 = self.fi1fi2(K0_k, Fw, g, Fmin, R, P, tc, Xa, zeta_a)
-        print(f"fi1fi2 = {fi1fi2}")
-        fi1 = self.fi1(fi1fi2, fi2)
-
-        f0 = self.MJ_to_J(fp / k)
-        fi1_lam = self.fi1_lam(
-            K0_k, I1, f0, g, Fw, zeta_a, fi1fi2, Xa, pz, tc, P)
-        lam = self.lam(fi1, fi1_lam)
-        return EngineParaOutput(
-            fi1, fi2, lam, K0_k, zeta_a, Xa, Fw, K_k, 
-            self.m2_to_mm2(Fmin), R, self.Pa_to_MPa(P))
+    XA_TABLE: Optional[XaTable] = None #Xa interpolated instead of solved
+    SENSITIVITY_INPUTS = ("da", "pz", "I1", "g", "k", "strength", "jet_d",
+                          "mass")
+    SENSITIVITY_STEP = 0.01
+
+    def get_results(self) -> EngineParaSummary:
+        """Loss coefficients of every survey, computed for all surveys at
+        once, with their mean and standard deviation."""
+        inputs = self.get_inputs()
+        trace = self.trace
+        c = self.evaluate(inputs, trace)
+
+        columns = np.broadcast_arrays(c.fi1, c.fi2, c.lam, c.K0_k, c.zeta_a,
+            c.Xa, c.Fw, c.K_k, self.m2_to_mm2(1) * c.Fmin, inputs.R,
+            self.Pa_to_MPa(1) * inputs.P)
+        table = np.column_stack(columns)
+        rows = tuple(EngineParaOutput(*map(float, row)) for row in table)
+        stdev = np.std(table, axis=0, ddof=1) if len(rows) > 1 else\
+            np.zeros(table.shape[1])
+
+        sensitivity = None
+        if getattr(self.data.variables, "sensitivity", False):
+            with trace.stage("sensitivity"):
+                sensitivity = self.sensitivity(inputs)
+        return EngineParaSummary(rows,
+            EngineParaOutput(*map(float, np.mean(table, axis=0))),
+            EngineParaOutput(*map(float, stdev)), sensitivity)
+
+    def get_inputs(self) -> EngineInputs:
+        "Inputs of every survey, survey values as arrays."
+        variables = self.data.variables
+        surveys = self.data.surveys
+        with self.trace.stage("integrals"):
+            P = np.array([self.P(s) for s in surveys], dtype=float)
+            R = np.array([self.R(s) for s in surveys], dtype=float)
+            self.trace.record("P", P, "Pa*s")
+            self.trace.record("R", R, "N*s")
+        return EngineInputs(variables.fuel.k, variables.fuel.strength,
+            variables.da, variables.pz, variables.I1, variables.g,
+            *(np.array([getattr(s, name) for s in surveys], dtype=float)
+              for name in ("jet_diameter", "fuel_mass", "tc")), P, R)
+
+    def evaluate(self, inputs: EngineInputs, trace=None)\
+        -> Coefficients:
+        "Coefficients for inputs of any broadcastable shapes."
+        trace = trace or NULL_TRACE
+        k = np.asarray(inputs.k, dtype=float)
+        fp = self.MJ_to_J(1) * np.asarray(inputs.strength, dtype=float)
+        dmin = self.mm_to_m(1) * np.asarray(inputs.jet_d, dtype=float)
+        mp = self.g_to_kg(1) * np.asarray(inputs.mass, dtype=float)
+        tc = self.ms_to_s(1) * np.asarray(inputs.tc, dtype=float)
+        da = self.mm_to_m(1) * np.asarray(inputs.da, dtype=float)
+        pz = self.hPa_to_Pa(1) * np.asarray(inputs.pz, dtype=float)
+        I1 = self.kN_to_N(1) * np.asarray(inputs.I1, dtype=float)
+        g = np.asarray(inputs.g, dtype=float)
+        P, R = inputs.P, inputs.R
+
+        with trace.stage("nozzle"):
+            K0_k = self.K0_k(k)
+            zeta_a = da / dmin
+            if self.XA_TABLE is not None:
+                Xa = self.XA_TABLE(k, zeta_a)
+            else:
+                Xa = self.Xa(k, K0_k, zeta_a)
+            Fw = self.Fw(k, Xa)
+            K_k = self.K_k(k, g)
+            Fmin = self.Fmin(dmin)
+            trace.record("K0_k", K0_k)
+            trace.record("zeta_a", zeta_a)
+            trace.record("Xa", Xa)
+            trace.record("Fw", Fw)
+            trace.record("K_k", K_k, "m^(1/2)/s")
+            trace.record("Fmin", Fmin, "m2")
+
+        with trace.stage("fi2"):
+            fi2 = self.fi2(K_k, fp, Fw, mp, P)
+            trace.record("fp", fp, "J/kg")
+            trace.record("mp", mp, "kg")
+            trace.record("fi2", fi2)
+
+        with trace.stage("fi1"):
+            fi1fi2 = self.fi1fi2(K0_k, Fw, g, Fmin, R, P, tc, Xa, zeta_a)
+            fi1 = self.fi1(fi1fi2, fi2)
+            trace.record("g", g, "m/s2")
+            trace.record("tc", tc, "s")
+            trace.record("fi1fi2", fi1fi2)
+            trace.record("fi1", fi1)
+
+        with trace.stage("lam"):
+            f0 = self.MJ_to_J(fp / k)
+            fi1_lam = self.fi1_lam(
+                K0_k, I1, f0, g, Fw, zeta_a, fi1fi2, Xa, pz, tc, P)
+            lam = self.lam(fi1, fi1_lam)
+            trace.record("f0", f0, "J/kg")
+            trace.record("fi1_lam", fi1_lam)
+            trace.record("lam", lam)
+        return Coefficients(fi1, fi2, lam, K0_k, zeta_a, Xa, Fw, K_k, Fmin)
+
+    def sensitivity(self, inputs: EngineInputs, step: Optional[float] = None)\
+        -> Sensitivity:
+        """Central differences of fi1, fi2 and lam over every input of
+        SENSITIVITY_INPUTS raised and lowered by step relative to its
+        value. The base inputs and both changes of each input are stacked
+        along a new first axis and evaluated in one call."""
+        step = step or self.SENSITIVITY_STEP
+        names = self.SENSITIVITY_INPUTS
+        count = len(names)
+        shape = np.broadcast(*(np.asarray(v) for v in inputs)).shape
+        stacked = {name: np.repeat(np.broadcast_to(
+            np.asarray(value, dtype=float), shape)[None], 2 * count + 1, 0)
+            for name, value in inputs._asdict().items()}
+        for i, name in enumerate(names):
+            stacked[name][1 + i] *= 1 + step
+            stacked[name][1 + count + i] *= 1 - step
+
+        c = self.evaluate(EngineInputs(**stacked))
+        values = np.stack((c.fi1, c.fi2, c.lam))
+        base = values[:, :1]
+        high = values[:, 1:count + 1]
+        low = values[:, count + 1:]
+        x = np.stack([stacked[name][0] for name in names])
+        derivatives = (high - low) / (2 * step * x)
+        return Sensitivity(names, step, derivatives,
+            derivatives * x / base, low, high)
 
     @staticmethod
     def K0_k(k):
-        return math.sqrt((k-1)/(k+1)) * (2/(k+1))**(1/(k-1))
+        return np.sqrt((k-1)/(k+1)) * (2/(k+1))**(1/(k-1))
 
     @staticmethod
     def Xa(k, K0_k, zeta_a):
-        A = K0_k / (zeta_a**2)
-        a = 1 / k
-        b = (k+1) / k
-
-        def equation(x):
-            return math.sqrt(x**a - x**b) - A
-
-        return spo.fsolve(equation, x0=0)[0]
+        return solve_Xa(k, K0_k, zeta_a)
 
     @staticmethod
     def Fw(k, Xa):
-        return math.sqrt((2*k)/(k-1) * (1 - Xa**((k-1)/k)))
+        return np.sqrt((2*k)/(k-1) * (1 - Xa**((k-1)/k)))
 
     @staticmethod
     def K_k(k, g):
         A = 2 / (k+1)
         B = 1 / (k - 1)
-        C = math.sqrt((2*g*k) / (k+1))
+        C = np.sqrt((2*g*k) / (k+1))
         return (A**B)*C
 
     def P(self, survey):
-        smp_time = self.ms_to_s(survey.sampling_time)
         times = (survey.t0, survey.tk, survey.tc)
-        press_values = self.cut_values(
-            survey.values[0], survey.sampling_time,
-            times, 2)
-        press_values = self.MPa_to_Pa(press_values)
-        return self.integrate(press_values, smp_time)
+        return self.MPa_to_Pa(self.integrate_window(survey, 0, times, 2))
 
     @staticmethod
     def fi2(K_k, fp, Fw, mp, P):
-        print(f"""fi2:
-K_k = {K_k}
-fp = {fp} J/kg
-Fw = {Fw} 
-mp = {mp} kg
-P = {P} Pa*s
--------------------""")
         A = (K_k * Fw * P)
-        return mp * math.sqrt(fp) / A
+        return mp * np.sqrt(fp) / A
 
     @staticmethod
     def Fmin(dmin):
         return math.pi * (dmin**2) / 4
 
     def R(self, survey):
-        smp_time = self.ms_to_s(survey.sampling_time)
         times = (survey.t0, survey.tk, survey.tc)
-        thrust_values = self.cut_values(
-            survey.values[1], survey.sampling_time,
-            times, 2)
-        thrust_values = self.kN_to_N(thrust_values)
-        return self.integrate(thrust_values, smp_time)
+        return self.kN_to_N(self.integrate_window(survey, 1, times, 2))
 
     @staticmethod
     def fi1fi2(K0_k, Fw, g, Fmin, R, P, tc, Xa, zeta_a):
-        print(f"""fi1fi2:
-K0_k = {K0_k}
-g = {g} m/s2
-Fmin = {Fmin} m2
-R = {R} N*s
-tc = {tc} s
-Xa = {Xa}
-zeta_a = {zeta_a}
--------------------""")
         A = g / (K0_k * Fw)
         B = R / (Fmin * P)
         C = (zeta_a**2 * Xa * tc) / P
@@ -140,7 +239,7 @@ zeta_a = {zeta_a}
 
     @staticmethod
     def fi1_lam(K0_k, I1, f0, g, Fw, zeta_a, fi1fi2, Xa, pz, tc, P):
-        return (K0_k * I1 / math.sqrt(f0)) / ((K0_k * Fw / g) +
+        return (K0_k * I1 / np.sqrt(f0)) / ((K0_k * Fw / g) +
          (zeta_a**2 * Xa / fi1fi2) - (zeta_a**2 * pz * tc / (fi1fi2 * P)))
 
     @staticmethod
@@ -1,6 +1,8 @@
 from typing import Optional, Type, NamedTuple, Tuple
 import math
-from .template import DesignationTemplate, Data, Config
+import numpy as np
+from .template import DesignationTemplate, Data, Config, Quantity
+from .tools import IntegralIndex, window_bounds
 from ..head.objects import Survey, Fuel
 
 
@@ -13,58 +15,135 @@ class ImpulseOutput(NamedTuple):
     fuel_mass: float # g
     chamber_length: float
     chamber_d: float
-    a: Optional[float] = None
+    a: float = math.nan #nan without a pressure channel
+    a_series: np.ndarray = np.empty(0) #nan where pressure is 0
+    a_min: float = math.nan
+    a_max: float = math.nan
+    a_stdev: float = math.nan
+    time: Optional[np.ndarray] = None #ms from t0
+    cumulative_impulse: Optional[np.ndarray] = None #N*s
+    action_time: Optional[float] = None #s
+    burn_time: Optional[float] = None #s
+    burn_threshold: Optional[float] = None #part of peak thrust
+    average_thrust: Optional[float] = None #N
+    peak_thrust: Optional[float] = None #N
+
+
+class ThrustCoefficient(NamedTuple):
+    mean: float
+    series: np.ndarray
+    min: float
+    max: float
+    stdev: float
+
+    @classmethod
+    def empty(cls) -> "ThrustCoefficient":
+        "Coefficient of a survey without a pressure channel."
+        return cls(math.nan, np.empty(0), math.nan, math.nan, math.nan)
+
+
+class ThrustCurve(NamedTuple):
+    time: Optional[np.ndarray] = None
+    cumulative_impulse: Optional[np.ndarray] = None
+    action_time: Optional[float] = None
+    burn_time: Optional[float] = None
+    burn_threshold: Optional[float] = None
+    average_thrust: Optional[float] = None
+    peak_thrust: Optional[float] = None
 
 
 class Impulse(DesignationTemplate):
     def calculate_impulse(self, survey: Survey)\
         -> Type[ImpulseOutput]:
         fuel_mass = self.g_to_kg(survey.fuel_mass)
-        smp_time = self.ms_to_s(survey.sampling_time)
         jet_d = self.mm_to_m(survey.jet_diameter)
 
         times = (survey.t0, survey.tc, survey.tk)
-        values = tuple(self.cut_values(val, survey.sampling_time,
-                       times, 2)
-                       for val in survey.values)
-
-        if survey.type == "pressthru":
-            thrust_values = self.kN_to_N(values[1])
-            press_values = self.MPa_to_Pa(values[0])
-        else:
-            thrust_values = self.kN_to_N(values[0])
+        thrust_channel = 1 if survey.type == "pressthru" else 0
 
         jet_field = math.pi * (jet_d**2) / 4
-        total_impulse = self.integrate(
-            thrust_values, smp_time)
+        total_impulse = self.kN_to_N(
+            self.integrate_window(survey, thrust_channel, times, 2))
         unit_impulse = total_impulse / fuel_mass
 
         if survey.type == "pressthru":
+            values = tuple(self.cut_values(val, survey.sampling_time,
+                           times, 2)
+                           for val in survey.values)
+            thrust_values = self.kN_to_N(values[1])
+            press_values = self.MPa_to_Pa(values[0])
             a = self.get_a(press_values, thrust_values, jet_field)
         else:
-            a = None
+            a = ThrustCoefficient.empty()
+
+        variables = self.data.variables
+        if variables and variables.time_resolved:
+            curve = self.get_thrust_curve(survey, thrust_channel, times,
+                                          variables.burn_threshold)
+        else:
+            curve = ThrustCurve()
         return ImpulseOutput(total_impulse, unit_impulse,
             survey.sampling_time, survey.jet_diameter, jet_field,
-            fuel_mass, survey.chamber_length, survey.chamber_diameter, a)
+            fuel_mass, survey.chamber_length, survey.chamber_diameter,
+            a.mean, a.series, a.min, a.max, a.stdev, *curve)
 
     def get_results(self) -> Tuple[ImpulseOutput, ...]:
-        return tuple(self.calculate_impulse(survey)
-                    for survey in self.data.surveys)
+        with self.trace.stage("impulse"):
+            outputs = tuple(self.calculate_impulse(survey)
+                            for survey in self.data.surveys)
+            self.trace.record("total impulse",
+                [o.total_impulse for o in outputs], "N*s")
+            self.trace.record("unit impulse",
+                [o.unit_impulse for o in outputs], "N*s/kg")
+        return outputs
+
+    def get_thrust_curve(self, survey: Survey, thrust_channel: int,
+        times: Tuple[float, float, float], burn_threshold: float)\
+        -> ThrustCurve:
+        """Cumulative impulse over the window t0..tk and its thrust figures.
+        Burn time spans the samples from the first to the last one with
+        thrust at least burn_threshold times the peak thrust."""
+        smp_time = self.ms_to_s(survey.sampling_time)
+        index = IntegralIndex.of(survey, thrust_channel,
+            self.config.integration_method, smp_time)
+        start, end = window_bounds(
+            len(index), survey.sampling_time, times, 2)
+
+        to_N = self.kN_to_N(1)
+        thrust = to_N * index.samples[start:end+1]
+        cumulative = to_N * index.cumulative(start, end)
+        time = np.arange(len(thrust)) * survey.sampling_time
+
+        peak_thrust = float(np.max(thrust))
+        above = np.flatnonzero(thrust >= burn_threshold * peak_thrust)
+        burn_time = (above[-1] - above[0]) * smp_time if len(above) else 0.0
+        action_time = (end - start) * smp_time
+        average_thrust = float(cumulative[-1]) / action_time\
+            if action_time else 0.0
+        return ThrustCurve(time, cumulative, action_time, float(burn_time),
+            burn_threshold, average_thrust, peak_thrust)
 
-    def get_a(self, press_values: Tuple[float, ...], thrust_values: Tuple[float, ...],
+    def get_a(self, press_values: Quantity, thrust_values: Quantity,
         jet_field: float)\
-        -> float:
-        sum_a = float(0)
-        skip = 0
+        -> ThrustCoefficient:
+        """Thrust coefficient a = F / (p * Fm) of every sample. Samples
+        without pressure count as 0 in the mean, unless there is no thrust
+        either, and are left out of the series statistics."""
+        press = np.asarray(press_values.values, dtype=float)
+        thrust = np.asarray(thrust_values.values, dtype=float)
+        factor = thrust_values.factor / (press_values.factor * jet_field)
 
-        for press, thrust in zip(press_values, thrust_values):
-            if press:
-                a = thrust / (press * jet_field)
-            else:
-                a = 0
-                if not thrust:
-                    skip += 1
+        measured = press != 0
+        series = np.full(len(press), np.nan)
+        np.divide(thrust, press, out=series, where=measured)
+        series *= factor
 
-            sum_a += a
+        skip = np.count_nonzero(~measured & (thrust == 0))
+        valid = series[measured]
+        mean = float(np.sum(valid)) / max(len(press) - skip, 1)
+        if not len(valid):
+            return ThrustCoefficient(mean, series, 0.0, 0.0, 0.0)
 
-        return sum_a / max((len(press_values) - skip), 1)
+        stdev = float(np.std(valid, ddof=1)) if len(valid) > 1 else 0.0
+        return ThrustCoefficient(mean, series, float(np.min(valid)),
+            float(np.max(valid)), stdev)
@@ -1,6 +1,9 @@
-from typing import NamedTuple, Tuple, Optional, Any, Union
+from typing import NamedTuple, Tuple, Optional, Any, Union, Sequence
+import array
+import numpy as np
 from ..head.objects import Survey, Fuel
-from .tools import Integrals
+from .tools import Integrals, IntegralIndex, as_samples, window_bounds,\
+    NullTrace, NULL_TRACE
 from abc import ABCMeta
 
 
@@ -12,18 +15,75 @@ class Data(NamedTuple):
 
 class Config(NamedTuple):
     integration_method: Optional[int]
-    #0-rect, 1-trapeze, 2-simpson
+    #0-rect, 1-trapeze, 2-simpson, 3-composite simpson
     calculation_method: Optional[int] = 0
-    #0-mean, 1-moment
+    #0-mean, 1-moment, 2-whole trace
+
+
+class Quantity:
+    """Samples in their stored unit with a unit factor applied lazily.
+    Integration is linear, so the factor multiplies only the result."""
+    __slots__ = "values", "factor"
+
+    def __init__(self, values: Sequence[float], factor: float = 1):
+        self.values = values
+        self.factor = factor
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return Quantity(self.values[key], self.factor)
+        return self.values[key] * self.factor
+
+    def __array__(self, dtype=None):
+        return np.asarray(as_samples(self.values) * self.factor, dtype=dtype)
+
+    def scaled(self, m: Union[int, float]) -> "Quantity":
+        return Quantity(self.values, self.factor * m)
+
+
+class Window:
+    """Samples start..end (both inclusive) of a channel. For NumPy arrays
+    and memoryviews values is a view into the original buffer."""
+    __slots__ = "buffer", "start", "end", "values"
+
+    def __init__(self, buffer: Sequence[float], start: int, end: int):
+        self.buffer = buffer
+        self.start = start
+        self.end = end
+        if isinstance(buffer, array.array):
+            buffer = memoryview(buffer)
+        self.values = as_samples(buffer[start:end+1])
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __array__(self, dtype=None):
+        return np.asarray(self.values, dtype=dtype)
+
+    @property
+    def bounds(self) -> Tuple[int, int]:
+        return self.start, self.end
 
 
 class DesignationTemplate(metaclass=ABCMeta):
-    def __init__(self, data: Data, config: Config):
+    def __init__(self, data: Data, config: Config,
+        trace: Optional[NullTrace] = None):
         self.data = data
         self.config = config
+        self.trace = trace or NULL_TRACE
         self.__integrals = (Integrals.rect,
                             Integrals.trapeze,
-                            Integrals.simpson)
+                            Integrals.simpson,
+                            Integrals.composite_simpson)
 
         self.g_to_kg = lambda v: self.multiply(0.001, v)
         self.kg_to_g = lambda v: self.multiply(1000, v)
@@ -42,25 +102,38 @@ class DesignationTemplate(metaclass=ABCMeta):
         self.mm2_to_m2 = lambda v: self.multiply(0.000_001, v)
 
     def integrate(self, 
-        values: Tuple[float, ...], smp_time: float)\
+        values: Union[Quantity, Sequence[float]], smp_time: float)\
+        -> float:
+        integral = self.__integrals[self.config.integration_method]
+        if isinstance(values, Quantity):
+            return values.factor * integral(values.values, smp_time)
+        return integral(values, smp_time)
+
+    def integrate_window(self, survey: Survey, channel: int,
+        times: Tuple[float, float, float], end_t_index: int)\
         -> float:
-        return self.__integrals[self.config.integration_method]\
-               (values, smp_time)
+        "Integral [unit*s] of survey.values[channel] from cached prefix sums."
+        index = IntegralIndex.of(survey, channel,
+            self.config.integration_method,
+            self.ms_to_s(survey.sampling_time))
+        start, end = window_bounds(
+            len(index), survey.sampling_time, times, end_t_index)
+        return index.window(start, end)
 
     @staticmethod
-    def cut_values(values: Tuple[float, ...], smp_time: float,
+    def cut_values(values: Sequence[float], smp_time: float,
         times: Tuple[float, float, float], end_t_index: int)\
-        -> Tuple[float, ...]:
-        start = int(round((times[0] / smp_time), 0))
-        end = int(round((times[end_t_index] / smp_time), 0))
-        if end >= len(values):
-            return values[start:]
-        return values[start:end+1]
+        -> Window:
+        start, end = window_bounds(
+            len(values), smp_time, times, end_t_index)
+        return Window(values, start, end)
 
     @staticmethod
     def multiply(m: Union[int, float],
-        vals: Union[Tuple[float, ...], float])\
-        -> Union[Tuple[float, ...], float]:
-        if isinstance(vals, float):
+        vals: Union[Quantity, Sequence[float], float])\
+        -> Union[Quantity, float]:
+        if isinstance(vals, (int, float)):
             return vals * m
-        return tuple(val * m for val in vals)
+        if isinstance(vals, Quantity):
+            return vals.scaled(m)
+        return Quantity(vals, m)
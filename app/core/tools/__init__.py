@@ -1 +1,6 @@
-from .integrals import Integrals
\ No newline at end of file
+from .integrals import Integrals, as_samples
+from .integral_index import IntegralIndex, window_bounds
+from .regression import sufficient_statistics, fit_line, LineFit, Statistics,\
+    RunningStatistics, SegmentedFit, fit_segments, f_test
+from .nozzle import solve_Xa, XaTable
+from .trace import Trace, TraceRecord, NullTrace, NULL_TRACE
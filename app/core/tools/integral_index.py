@@ -0,0 +1,129 @@
+import weakref
+from typing import Sequence, Tuple
+import numpy as np
+from .integrals import as_samples
+
+
+class IntegralIndex:
+    """Cumulative integrals of one channel for one integration method.
+    Integral of any window of samples costs two lookups and gives the
+    same value as integrating the cut window with Integrals."""
+
+    __cache = weakref.WeakKeyDictionary()
+
+    def __init__(self, values: Sequence[float], smp_time: float, method: int):
+        self.samples = as_samples(values)
+        self.smp_time = smp_time
+        self.method = method
+        self.__cumulative = self.__build()
+
+    def __len__(self):
+        return len(self.samples)
+
+    @classmethod
+    def of(cls, owner, channel: int, method: int, smp_time: float)\
+        -> "IntegralIndex":
+        """Returns the index of owner.values[channel], built once and kept
+        until the channel is replaced or the owner is garbage collected."""
+        values = owner.values[channel]
+        indexes = cls.__cache.setdefault(owner, {})
+        key = channel, method, smp_time
+        entry = indexes.get(key)
+        if entry is None or entry[0] is not values:
+            entry = values, cls(values, smp_time, method)
+            indexes[key] = entry
+        return entry[1]
+
+    def window(self, start: int, end: int) -> float:
+        "Integral of samples from start to end, both inclusive."
+        y = self.samples
+        h = self.smp_time
+        if end <= start:
+            return float(y[start] * h)
+
+        if self.method == 0:
+            cum = self.__cumulative
+            return float(h * (cum[end + 1] - cum[start]))
+
+        if self.method in (1, 2) or end - start == 1:
+            cum = self.__cumulative if self.method in (1, 2)\
+                else self.__trapezes
+            return float(h * (cum[end] - cum[start]))
+
+        total_sum = 0.0
+        if (end - start) % 2:
+            tail = y[end - 3:end + 1]
+            total_sum += 3 * h / 8 *\
+                (tail[0] + 3 * tail[1] + 3 * tail[2] + tail[3])
+            end -= 3
+
+        if end > start:
+            parity = start % 2
+            cum = self.__cumulative[parity]
+            total_sum += h / 3 * (cum[(end - parity) // 2] -
+                                  cum[(start - parity) // 2])
+        return float(total_sum)
+
+    def cumulative(self, start: int, end: int) -> np.ndarray:
+        """Integrals from start to every sample up to end, the k-th item
+        equal to window(start, start + k)."""
+        y = self.samples
+        h = self.smp_time
+        ends = np.arange(start, max(end, start) + 1)
+        if self.method == 0:
+            cum = self.__cumulative
+            return h * (cum[ends + 1] - cum[start])
+
+        trapezes = self.__cumulative if self.method in (1, 2)\
+            else self.__trapezes
+        result = h * (trapezes[ends] - trapezes[start])
+        result[0] = y[start] * h
+        if self.method in (1, 2) or len(ends) < 3:
+            return result
+
+        parity = start % 2
+        cum = self.__cumulative[parity]
+        first = (start - parity) // 2
+        even = ends[2::2]
+        result[2::2] = h / 3 * (cum[(even - parity) // 2] - cum[first])
+
+        odd = ends[3::2]
+        if len(odd):
+            pairs = h / 3 * (cum[(odd - 3 - parity) // 2] - cum[first])
+            tails = 3 * h / 8 * (y[odd - 3] + 3 * y[odd - 2] +
+                                 3 * y[odd - 1] + y[odd])
+            result[3::2] = pairs + tails
+        return result
+
+    def __build(self):
+        y = self.samples
+        if self.method == 0:
+            return self.__prefix(y)
+
+        if self.method == 1:
+            return self.__prefix((y[:-1] + y[1:]) / 2)
+
+        if self.method == 2:
+            y_1 = y[:-1]
+            y_3 = y[1:]
+            return self.__prefix((y_1 + 4 * (y_1 + y_3) / 2 + y_3) / 6)
+
+        self.__trapezes = self.__prefix((y[:-1] + y[1:]) / 2)
+        pairs = y[:-2] + 4 * y[1:-1] + y[2:]
+        return self.__prefix(pairs[0::2]), self.__prefix(pairs[1::2])
+
+    @staticmethod
+    def __prefix(values: np.ndarray) -> np.ndarray:
+        cum = np.empty(len(values) + 1)
+        cum[0] = 0
+        np.cumsum(values, out=cum[1:])
+        return cum
+
+
+def window_bounds(length: int, smp_time: float,
+    times: Tuple[float, float, float], end_t_index: int)\
+    -> Tuple[int, int]:
+    "Indexes of the first and the last sample between times[0] and times[end_t_index]."
+    start = int(round((times[0] / smp_time), 0))
+    end = int(round((times[end_t_index] / smp_time), 0))
+    return min(max(start, 0), length - 1), min(end, length - 1)
@@ -1,57 +1,63 @@
 import numpy as np
 
 
+def as_samples(values) -> np.ndarray:
+    """Returns samples as a float ndarray. NumPy arrays, array.array and
+    memoryviews of doubles are wrapped without copying."""
+    return np.asarray(values, dtype=float)
+
+
 class Integrals:
+    """Integrals of samples taken every smp_time. All methods accept
+    sequences, NumPy arrays, array.array and memoryviews and sum with
+    NumPy's pairwise summation."""
+
     @staticmethod
     def rect(prep_p_sur, smp_time):
-        return smp_time * sum(prep_p_sur)
+        y = as_samples(prep_p_sur)
+        return float(smp_time * np.sum(y))
 
     @staticmethod
     def trapeze(prep_p_sur, smp_time):
-        if len(prep_p_sur) < 2:
-            return prep_p_sur[0] * smp_time
+        y = as_samples(prep_p_sur)
+        if len(y) < 2:
+            return float(y[0] * smp_time)
 
-        A = (prep_p_sur[0] + prep_p_sur[-1]) / 2
-        return smp_time * (sum(prep_p_sur[1:-1]) + A)
+        A = (y[0] + y[-1]) / 2
+        return float(smp_time * (np.sum(y[1:-1]) + A))
 
     @staticmethod
     def simpson(prep_p_sur, smp_time):
-        if len(prep_p_sur) < 2:
-            return prep_p_sur[0] * smp_time
-
-        h_smp_time = smp_time / 2
-        x = [h_smp_time * i for i in range(2 * len(prep_p_sur) - 1)]
-        y = [prep_p_sur[0]]
-        total_sum = 0
-
-        for val in prep_p_sur[1:]:
-            y.append((val + y[-1]) / 2)
-            y.append(val)
-
-        for v in range(len(prep_p_sur) - 1):
-            j = 2 * v
-
-            y_1 = y[j]
-            y_2 = y[j + 1]
-            y_3 = y[j + 2]
+        """Parabola through both samples of every interval and their
+        averaged midpoint, integrated in closed form for all intervals
+        at once."""
+        y = as_samples(prep_p_sur)
+        if len(y) < 2:
+            return float(y[0] * smp_time)
+
+        y_1 = y[:-1]
+        y_3 = y[1:]
+        y_2 = (y_1 + y_3) / 2
+        return float(smp_time / 6 * np.sum(y_1 + 4 * y_2 + y_3))
 
-            f_1 = [x[j] ** 2, x[j], 1]
-            f_2 = [x[j + 1] ** 2, x[j + 1], 1]
-            f_3 = [x[j + 2] ** 2, x[j + 2], 1]
-
-            f_m = np.array([f_1, f_2, f_3])
-            y_m = np.array([y_1, y_2, y_3])
-
-            f_r = np.linalg.inv(f_m)
-            para = f_r @ y_m
-
-            a = para[0]
-            b = para[1]
-            c = para[2]
-
-            x_p = x[j]
-            x_k = x[j + 2]
-
-            P = a * ((x_k ** 3) - (x_p ** 3)) / 3 + b * ((x_k ** 2) - (x_p ** 2)) / 2 + c * (x_k - x_p)
-            total_sum += P
-        return total_sum
+    @staticmethod
+    def composite_simpson(prep_p_sur, smp_time):
+        """Classic composite Simpson's 1/3 rule. For an odd number of
+        intervals the last three are integrated with Simpson's 3/8 rule."""
+        y = as_samples(prep_p_sur)
+        if len(y) < 3:
+            return Integrals.trapeze(y, smp_time)
+
+        intervals = len(y) - 1
+        total_sum = 0.0
+
+        if intervals % 2:
+            tail = y[-4:]
+            total_sum += 3 * smp_time / 8 *\
+                (tail[0] + 3 * tail[1] + 3 * tail[2] + tail[3])
+            y = y[:-3]
+
+        if len(y) > 1:
+            total_sum += smp_time / 3 * (y[0] + y[-1] +
+                4 * np.sum(y[1:-1:2]) + 2 * np.sum(y[2:-1:2]))
+        return float(total_sum)
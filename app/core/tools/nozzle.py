@@ -0,0 +1,90 @@
+from typing import Tuple, Union
+import numpy as np
+
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def K0_k(k: ArrayLike) -> ArrayLike:
+    k = np.asarray(k, dtype=float)
+    return np.sqrt((k-1)/(k+1)) * (2/(k+1))**(1/(k-1))
+
+
+def solve_Xa(k: ArrayLike, K0_k: ArrayLike, zeta_a: ArrayLike,
+    tolerance: float = 1e-13, iterations: int = 60)\
+    -> np.ndarray:
+    """Supersonic root Xa of sqrt(x^(1/k) - x^((k+1)/k)) = K0_k / zeta_a^2
+    for every element of the broadcast arguments, nan where the nozzle
+    expansion has no solution. With y = ln(x) the equation reads
+    y/k + ln(1 - e^y) = 2 ln(K0_k / zeta_a^2), concave and rising in y
+    below ln(1/(k+1)), so Newton steps from the root of y/k = rhs never
+    overshoot it."""
+    k, K0_k, zeta_a = np.broadcast_arrays(*(np.asarray(v, dtype=float)
+                                             for v in (k, K0_k, zeta_a)))
+    a = 1 / k
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rhs = 2 * (np.log(K0_k) - 2 * np.log(zeta_a))
+    y_max = -np.log1p(k)
+    solvable = rhs <= a * y_max + np.log1p(-np.exp(y_max))
+
+    y = np.where(solvable, np.minimum(rhs * k, y_max), y_max)
+    for _ in range(iterations):
+        e = np.exp(y)
+        g = a * y + np.log1p(-e) - rhs
+        slope = a - e / (1 - e)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(solvable & (slope > 0), g / slope, 0.0)
+        y = np.minimum(y - step, y_max)
+        if np.all(np.abs(step) <= tolerance * np.maximum(1, np.abs(y))):
+            break
+    return np.where(solvable, np.exp(y), np.nan)
+
+
+class XaTable:
+    """Xa tabulated over k and ln(zeta_a), read by bilinear interpolation
+    of ln(Xa), which is nearly linear in both. error is the largest
+    relative error found at the centres of the cells, where interpolation
+    is the least accurate. Points outside the table are solved exactly."""
+
+    def __init__(self, k_range: Tuple[float, float] = (1.1, 1.4),
+        zeta_range: Tuple[float, float] = (1.5, 20.0),
+        shape: Tuple[int, int] = (61, 201)):
+        self.k = np.linspace(*k_range, shape[0])
+        self.ln_zeta = np.linspace(*np.log(zeta_range), shape[1])
+        k, ln_zeta = np.meshgrid(self.k, self.ln_zeta, indexing="ij")
+        self.ln_Xa = np.log(solve_Xa(k, K0_k(k), np.exp(ln_zeta)))
+
+        k_mid = (self.k[:-1] + self.k[1:]) / 2
+        ln_zeta_mid = (self.ln_zeta[:-1] + self.ln_zeta[1:]) / 2
+        k, ln_zeta = np.meshgrid(k_mid, ln_zeta_mid, indexing="ij")
+        exact = solve_Xa(k, K0_k(k), np.exp(ln_zeta))
+        table = self(k, np.exp(ln_zeta))
+        self.error = float(np.nanmax(np.abs(table / exact - 1)))
+
+    def __call__(self, k: ArrayLike, zeta_a: ArrayLike)\
+        -> np.ndarray:
+        k, zeta_a = np.broadcast_arrays(np.asarray(k, dtype=float),
+                                        np.asarray(zeta_a, dtype=float))
+        ln_zeta = np.log(zeta_a)
+        i, u = self.cell(self.k, k)
+        j, v = self.cell(self.ln_zeta, ln_zeta)
+        T = self.ln_Xa
+        ln_Xa = (1-u) * (1-v) * T[i, j] + u * (1-v) * T[i+1, j] +\
+            (1-u) * v * T[i, j+1] + u * v * T[i+1, j+1]
+        Xa = np.exp(ln_Xa)
+
+        outside = (k < self.k[0]) | (k > self.k[-1]) |\
+            (ln_zeta < self.ln_zeta[0]) | (ln_zeta > self.ln_zeta[-1])
+        if np.any(outside):
+            Xa[outside] = solve_Xa(k[outside], K0_k(k[outside]),
+                                   zeta_a[outside])
+        return Xa
+
+    @staticmethod
+    def cell(grid: np.ndarray, values: np.ndarray)\
+        -> Tuple[np.ndarray, np.ndarray]:
+        "Index of the cell of every value and its position within the cell."
+        step = grid[1] - grid[0]
+        position = np.clip((values - grid[0]) / step, 0, len(grid) - 1)
+        index = np.minimum(position.astype(int), len(grid) - 2)
+        return index, position - index
@@ -0,0 +1,258 @@
+import math
+from typing import NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+
+
+#two-sided 95% quantiles of Student's t distribution for 1..30 d.o.f.
+T_975 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262,
+         2.228, 2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101,
+         2.093, 2.086, 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052,
+         2.048, 2.045, 2.042)
+Z_975 = 1.959964
+
+
+class Statistics(NamedTuple):
+    "Sums the least-squares line is solved from."
+    count: int
+    sx: float
+    sy: float
+    sxx: float
+    sxy: float
+    syy: float
+
+
+class LineFit(NamedTuple):
+    slope: float
+    intercept: float
+    slope_se: float
+    intercept_se: float
+    r2: float
+    df: int
+    slope_ci: Tuple[float, float]
+    intercept_ci: Tuple[float, float]
+
+
+class RunningStatistics:
+    "Sufficient statistics of points added and removed one at a time."
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+        self.sx = self.sy = self.sxx = self.sxy = self.syy = 0.0
+
+    def add(self, x: float, y: float):
+        self.add_statistics(Statistics(1, x, y, x * x, x * y, y * y))
+
+    def remove(self, x: float, y: float):
+        self.remove_statistics(Statistics(1, x, y, x * x, x * y, y * y))
+
+    def add_statistics(self, stats: Statistics, weight: int = 1):
+        "Adds all points summed up in stats."
+        self.count += weight * stats.count
+        self.sx += weight * stats.sx
+        self.sy += weight * stats.sy
+        self.sxx += weight * stats.sxx
+        self.sxy += weight * stats.sxy
+        self.syy += weight * stats.syy
+
+    def remove_statistics(self, stats: Statistics):
+        self.add_statistics(stats, -1)
+
+    @property
+    def statistics(self) -> Statistics:
+        return Statistics(self.count, self.sx, self.sy,
+                          self.sxx, self.sxy, self.syy)
+
+    def fit(self) -> Optional[LineFit]:
+        if self.count < 2:
+            return None
+        return fit_line(self.statistics)
+
+
+def sufficient_statistics(xs: Sequence[float], ys: Sequence[float])\
+    -> Statistics:
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    return Statistics(len(xs), float(np.sum(xs)), float(np.sum(ys)),
+        float(xs @ xs), float(xs @ ys), float(ys @ ys))
+
+
+def t_quantile(df: int) -> float:
+    "Two-sided 95% quantile of Student's t distribution."
+    if df < 1:
+        return math.nan
+    if df <= len(T_975):
+        return T_975[df - 1]
+    z = Z_975
+    return z + (z**3 + z) / (4 * df)
+
+
+def regularized_beta(x: float, a: float, b: float)\
+    -> float:
+    "Regularized incomplete beta function I_x(a, b) by continued fraction."
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if x > (a + 1) / (a + b + 2): #the fraction converges fast below
+        return 1 - regularized_beta(1 - x, b, a)
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                     + a * math.log(x) + b * math.log1p(-x)) / a
+    tiny = 1e-300
+    c, d = 1.0, 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    fraction = d
+    for m in range(1, 300):
+        for numerator in (m * (b - m) * x / ((a + 2*m - 1) * (a + 2*m)),
+                          -(a + m) * (a + b + m) * x /
+                          ((a + 2*m) * (a + 2*m + 1))):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            fraction *= c * d
+        if abs(c * d - 1) < 1e-12:
+            break
+    return front * fraction
+
+
+def f_test(error: float, df: int, reduced_error: float, reduced_df: int)\
+    -> float:
+    """p-value of the F-test of a model with sum of squared errors
+    reduced_error on reduced_df degrees of freedom against a nested one
+    with error on df degrees of freedom."""
+    extra = df - reduced_df
+    if reduced_df < 1 or extra < 1:
+        return math.nan
+    if reduced_error <= 0:
+        return 0.0 if error > 0 else 1.0
+    F = (error - reduced_error) / extra / (reduced_error / reduced_df)
+    if F <= 0:
+        return 1.0
+    return regularized_beta(reduced_df / (reduced_df + extra * F),
+                            reduced_df / 2, extra / 2)
+
+
+def fit_line(stats: Statistics) -> LineFit:
+    """Least-squares line y = slope * x + intercept with standard errors
+    and 95% confidence bounds, which are nan without spare points."""
+    count = stats.count
+    x_bar = stats.sx / count
+    y_bar = stats.sy / count
+    Sxx = max(stats.sxx - count * x_bar**2, 0.0)
+    Sxy = stats.sxy - count * x_bar * y_bar
+    Syy = max(stats.syy - count * y_bar**2, 0.0)
+
+    slope = Sxy / Sxx if Sxx > 0 else 0.0
+    intercept = y_bar - slope * x_bar
+    sse = max(Syy - slope * Sxy, 0.0)
+    r2 = slope * Sxy / Syy if Syy > 0 else 1.0
+
+    df = count - 2
+    if df > 0 and Sxx > 0:
+        s2 = sse / df
+        slope_se = math.sqrt(s2 / Sxx)
+        intercept_se = math.sqrt(s2 * (1 / count + x_bar**2 / Sxx))
+    else:
+        slope_se = intercept_se = math.nan
+
+    t = t_quantile(df)
+    return LineFit(slope, intercept, slope_se, intercept_se, r2, df,
+        (slope - t * slope_se, slope + t * slope_se),
+        (intercept - t * intercept_se, intercept + t * intercept_se))
+
+
+class SegmentedFit(NamedTuple):
+    lines: Tuple[LineFit, ...] #from the lowest x
+    breaks: Tuple[float, ...] #x between neighbouring segments
+    bounds: Tuple[Tuple[float, float], ...] #x range of every segment
+    p_value: float #F-test of the segments against one line, nan for one
+
+
+def fit_segments(xs: Sequence[float], ys: Sequence[float],
+    max_segments: int = 3, min_points: int = 3, max_first_splits: int = 500,
+    alpha: float = 0.01)\
+    -> SegmentedFit:
+    """Piecewise least-squares lines over x with up to three segments of
+    at least min_points points each. Sums of squared errors of every
+    candidate split come from prefix sums of the sorted points at once.
+    A segment more is kept only if the F-test against the fewer ones
+    gives a p-value below alpha, its break counted as a parameter and the
+    p-value multiplied by the number of break positions tried. Three
+    segments try at most max_first_splits first splits evenly, then every
+    first split closer to the best one than their stride."""
+    order = np.argsort(xs, kind="stable")
+    x = np.asarray(xs, dtype=float)[order]
+    y = np.asarray(ys, dtype=float)[order]
+    count = len(x)
+    prefix = np.zeros((count + 1, 6))
+    np.cumsum(np.column_stack((np.ones(count), x, y, x * x, x * y, y * y)),
+              axis=0, out=prefix[1:])
+
+    def sse(start, end):
+        c, sx, sy, sxx, sxy, syy = np.moveaxis(prefix[end] - prefix[start], -1, 0)
+        Sxx = sxx - sx * sx / c
+        Sxy = sxy - sx * sy / c
+        Syy = syy - sy * sy / c
+        slope_part = np.divide(Sxy * Sxy, Sxx, out=np.zeros_like(Sxx),
+                               where=Sxx > 1e-12 * sxx)
+        return np.maximum(Syy - slope_part, 0.0)
+
+    candidates = [(float(sse(0, count)), ())]
+    splits = np.arange(min_points, count - min_points + 1)
+    if max_segments >= 2 and len(splits):
+        errors = sse(0, splits) + sse(splits, count)
+        best = int(np.argmin(errors))
+        candidates.append((float(errors[best]), (int(splits[best]),)))
+
+    if max_segments >= 3 and count >= 3 * min_points:
+        #one row of all second splits per first split keeps memory O(count)
+        tails = sse(splits, count)
+        firsts = splits[:count - 3 * min_points + 1]
+
+        def best_of(firsts, best):
+            for first in firsts:
+                seconds = splits[first:] #at least min_points after first
+                errors = sse(0, first) + sse(first, seconds) +\
+                    tails[seconds - min_points]
+                k = int(np.argmin(errors))
+                if errors[k] < best[0]:
+                    best = float(errors[k]), (int(first), int(seconds[k]))
+            return best
+
+        #rows of every stride-th first split, then all rows around the best
+        stride = -(-len(firsts) // max_first_splits)
+        best = best_of(firsts[::stride], (math.inf, ()))
+        if stride > 1:
+            near = np.abs(firsts - best[1][0]) < stride
+            best = best_of(firsts[near], best)
+        candidates.append(best)
+
+    def df(cuts):
+        return count - (3 * len(cuts) + 2)
+
+    def p_value(error, cuts, reduced_error, reduced_cuts):
+        p = f_test(error, df(cuts), reduced_error, df(reduced_cuts))
+        #the best of every break position tried, Bonferroni-corrected
+        spare = count - (len(reduced_cuts) + 1) * min_points + 1
+        tried = spare if len(reduced_cuts) == 1 else spare * (spare + 1) / 2
+        return min(p * max(tried, 1), 1.0)
+
+    error, cuts = candidates[0]
+    for candidate in candidates[1:]:
+        if p_value(error, cuts, *candidate) < alpha:
+            error, cuts = candidate
+    p = p_value(*candidates[0], error, cuts) if cuts else math.nan
+    edges = (0, *cuts, count)
+    lines = tuple(fit_line(Statistics(end - start,
+                                      *(prefix[end] - prefix[start])[1:]))
+                  for start, end in zip(edges[:-1], edges[1:]))
+    breaks = tuple(float((x[cut - 1] + x[cut]) / 2) for cut in cuts)
+    bounds = tuple((float(x[start]), float(x[end - 1]))
+                   for start, end in zip(edges[:-1], edges[1:]))
+    return SegmentedFit(lines, breaks, bounds, p)
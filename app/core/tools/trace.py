@@ -0,0 +1,71 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, NamedTuple, Optional, TextIO
+import numpy as np
+
+
+class TraceRecord(NamedTuple):
+    stage: str
+    name: str
+    value: Any
+    unit: str = ""
+
+
+class NullTrace:
+    "Trace sink of designations run without tracing, recording nothing."
+    enabled = False
+    _NO_STAGE = nullcontext()
+
+    def stage(self, name: str):
+        return self._NO_STAGE
+
+    def record(self, name: str, value: Any, unit: str = ""):
+        pass
+
+
+NULL_TRACE = NullTrace()
+
+
+class Trace(NullTrace):
+    """Intermediate quantities of a designation, each recorded under the
+    stage open at the time, and wall times of the stages."""
+    enabled = True
+
+    def __init__(self):
+        self.records: List[TraceRecord] = []
+        self.timings: Dict[str, float] = {} #s, summed over every entry
+        self.__stages: List[str] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        self.__stages.append(name)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) +\
+                time.perf_counter() - start
+            self.__stages.pop()
+
+    def record(self, name: str, value: Any, unit: str = ""):
+        stage = self.__stages[-1] if self.__stages else ""
+        self.records.append(TraceRecord(stage, name, value, unit))
+
+    def to_dict(self) -> dict:
+        return {"records": [{"stage": r.stage, "name": r.name,
+                             "value": self.plain(r.value), "unit": r.unit}
+                            for r in self.records],
+                "timings": dict(self.timings)}
+
+    def dump_json(self, file: TextIO, indent: Optional[int] = 2):
+        json.dump(self.to_dict(), file, indent=indent, ensure_ascii=False)
+
+    @staticmethod
+    def plain(value: Any) -> Any:
+        "Value with NumPy types turned into ones JSON can hold."
+        if isinstance(value, (np.ndarray, np.generic)):
+            return value.tolist()
+        if isinstance(value, (tuple, list)):
+            return [Trace.plain(v) for v in value]
+        return value
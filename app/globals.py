@@ -1,13 +1,16 @@
 version = 1.1
 TITLE = "Badanie stałych paliw rakietowych v" + str(version)
 FUELS_FOLDER = 'database'
+DATABASE_FILE = 'bspr.sqlite3' #in FUELS_FOLDER
 SURVEY_TYPES = {"ciśnienia i ciągu": "pressthru",
                 "ciśnienia": 'press',
                 "ciągu": "thrust"}
-INTEGRATION_METHODS = {"prostokątów": 0, "trapezów": 1, "Simpsona": 2}
-CALCULATION_METHODS = {"średnich": 0, "chwilowych": 1}
+INTEGRATION_METHODS = {"prostokątów": 0, "trapezów": 1, "Simpsona": 2,
+                       "Simpsona (złożona)": 3}
+CALCULATION_METHODS = {"średnich": 0, "chwilowych": 1, "przebiegu": 2}
 SURVEY_VALUES_SEPARATOR = "    "
 PRESS = "press"
 THRUST = "thrust"
 PRESSTHRU = "pressthru"
-FORBIDDEN_NAME_SIGNS = "*.\"/[]:;|,"
\ No newline at end of file
+FORBIDDEN_NAME_SIGNS = "*.\"/[]:;|,"
+TRACE_CALCULATIONS = False #intermediate values shown under the results
@@ -1,8 +1,12 @@
 import tkinter as tk
+import numpy as np
 from .tree_list import TreeList
 from .plots import PlotFrame
 from .btns import Button
-from typing import Tuple, AnyStr
+from typing import Callable, Sequence, Tuple, AnyStr
+
+#samples loaded on demand, sampling time [ms], comment and initial time [ms]
+PlotData = Tuple[Callable[[], np.ndarray], float, AnyStr, float]
 
 
 class CheckTreeList(TreeList):
@@ -32,20 +36,18 @@ class ChooseList(tk.Frame):
         self.plot_frame.pack(side="right", fill="both")
         self.comment_frame.pack(side="bottom", fill="x")
 
-        self.plots_data = Tuple[Tuple, int, AnyStr]
+        self.plots_data: Sequence[PlotData] = ()
         self.surveys_t_lines = []
         self.drawn_plots = []
 
         #Hiding unsupported buttons
         self.plot_buttons[0].pack_forget()
 
-    def set_plots_data(self, data: Tuple[Tuple, int, AnyStr]):
+    def set_plots_data(self, data: Sequence[PlotData]):
         self.plot_frame.plot.lines = []
         self.plots_data = data
-        max_val_time = \
-            lambda plot_data: plot_data[0].index(max(plot_data[0])) * plot_data[1]
         self.surveys_t_lines = \
-            [self.__draw_line(x, hidden=True) for x in (max_val_time(d) for d in data)]
+            [self.__draw_line(d[3], hidden=True) for d in data]
         self.hide_lines()
 
     def hide_lines(self):
@@ -135,9 +137,9 @@ class ChooseList(tk.Frame):
 
         for index in ids:
             data = self.plots_data[index]
-            y_data = data[0]
-            max_y = max(y_data) if max(y_data) > max_y else max_y
-            x_data = [data[1] * i for i in range(len(y_data))]
+            y_data = data[0]()
+            max_y = max(np.max(y_data), max_y)
+            x_data = data[1] * np.arange(len(y_data))
             max_x = x_data[-1] if x_data[-1] > max_x else max_x
             self.drawn_plots.append(*plot.plot(x_data, y_data))
             time = self.surveys_t_lines[index].get_xdata()
@@ -31,6 +31,7 @@ class TreeList(tk.Frame):
             self.checked_img = tk.PhotoImage(file='app/graphic/checked.gif')
             self.unchecked_img = tk.PhotoImage(file='app/graphic/unchecked.gif')
             self.chosen_items_ids = []
+            self.on_toggle = None
             tree.bind("<Button-1>", self._toggle_item)
 
     def set_data(self, data):
@@ -73,6 +74,7 @@ class TreeList(tk.Frame):
 
         if self.CHECK_OPTION:
             self.chosen_items_ids = []
+            self._notify_toggle()
 
     def set_columns(self, columns):
         if self.AUTO_NUMBERING:
@@ -120,6 +122,7 @@ class TreeList(tk.Frame):
         else:
             set_checkout_img(self.unchecked_img)
             self.chosen_items_ids = []
+        self._notify_toggle()
 
     @check_option
     def _toggle_item(self, event):
@@ -133,3 +136,8 @@ class TreeList(tk.Frame):
         else:
             self.chosen_items_ids.append(index)
             self.tree.item(row_id, image=self.checked_img)
+        self._notify_toggle()
+
+    def _notify_toggle(self):
+        if self.on_toggle:
+            self.on_toggle()
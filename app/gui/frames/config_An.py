@@ -1,7 +1,27 @@
+import tkinter as tk
 from .templates.config_calculation_frame import ConfigCalculationFrameTemplate
 
 
 class ConfigAnFrame(ConfigCalculationFrameTemplate):
-    INPUT_VARIABLES = ("Zakładane prędkości maksymalne gazów [m/s]", )
+    INPUT_VARIABLES = ("Zakładane prędkości maksymalne gazów [m/s]",
+                       "Co który punkt przebiegu (metoda przebiegu)")
+
+    OPTIONS = "nie", "tak"
+    SIMULATE = "Symulacja przebiegów"
+    FIT_TRACES = "Dopasowanie A i n do przebiegów"
+    SEGMENTS = "Zakresy ciśnień o różnym n"
+    #options left empty are off
+    OPTION_VARIABLES = {SIMULATE: OPTIONS, FIT_TRACES: OPTIONS,
+                        SEGMENTS: OPTIONS}
+    CBOX_VARIABLES = ConfigCalculationFrameTemplate.CBOX_VARIABLES +\
+        (OPTION_VARIABLES,)
 
     TITLE = "WYZNACZANIE WSPÓŁCZYNNIKÓW A i n PRAWA SZYBKOŚCI SPALANIA"
+
+    def generate_structure(self):
+        super().generate_structure()
+        self.fit_preview = tk.Label(self.interior, font=("bold", 12))
+        self.fit_preview.pack(pady=5)
+
+    def show_fit_preview(self, text: str):
+        self.fit_preview.configure(text=text)
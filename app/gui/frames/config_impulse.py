@@ -2,7 +2,7 @@ from .templates.config_calculation_frame import ConfigCalculationFrameTemplate
 from ...globals import INTEGRATION_METHODS
 
 class ConfigImpulseFrame(ConfigCalculationFrameTemplate):
-    INPUT_VARIABLES = False
+    INPUT_VARIABLES = ("Próg ciągu dla czasu spalania [% ciągu maks.]", )
 
     CBOX_VARIABLES = (
         {"Metoda całkowania": tuple(INTEGRATION_METHODS.keys())}
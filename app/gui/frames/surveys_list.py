@@ -57,7 +57,7 @@ class SurveysListFrame(ListFrameTemplate):
         self.reload_list()
 
     def load_data(self):
-        return db.load_surveys(
+        return db.list_survey_headers(
             self.fuel_name, SURVEY_TYPES[self.survey_type])
 
     @staticmethod
@@ -1,6 +1,6 @@
 from tkinter.filedialog import askopenfilename
 from .add_values import AddSurveyValuesAct
-from ....head.objects import Survey
+from ....head.objects import Survey, SignalSet
 from ....globals import SURVEY_TYPES, SURVEY_VALUES_SEPARATOR, PRESS,\
                     THRUST
 from ....gui.configure import IMP_VALUES_BTN_COLOR_1
@@ -190,11 +190,13 @@ class AddSurveyAct:
             raw_survey_values[0] = [val/1000 
                 for val in raw_survey_values[0]]
     
+        raw_values = SignalSet.for_survey(
+            survey_type, raw_survey_values, sampling_time)
         self.survey.update({"type": survey_type,
                             "sampling_time": sampling_time,
-                            "raw_values": raw_survey_values[:],
-                            "values": raw_survey_values[:],
-                            "multipliers": [1 for _ in raw_survey_values]})
+                            "raw_values": raw_values,
+                            "multipliers": [1 for _ in raw_survey_values],
+                            "patches": []})
         self.start_adding_act()
 
     def start_adding_act(self):
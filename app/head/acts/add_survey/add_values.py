@@ -1,8 +1,10 @@
 import tkinter as tk
-import copy
+import numpy as np
 from typing import Dict
 from ....gui.configure import T0_COLOR, TK_COLOR, TC_COLOR,\
     IMP_VALUES_BTN_COLOR_2
+from ....globals import INTEGRATION_METHODS, PRESS, PRESSTHRU
+from ....core.tools import IntegralIndex, window_bounds
 
 
 class AddSurveyValuesAct:
@@ -33,9 +35,8 @@ class AddSurveyValuesAct:
             show_message("Zaimportowano plik pomyślnie.", "green")
 
     def reset_plot(self):
-        self.survey.update({"values": copy.deepcopy(self.survey.raw_values),
-                            "multipliers": [1 for _ in self.survey.raw_values],
-                            "t0": None,
+        self.survey.reset_values()
+        self.survey.update({"t0": None,
                             "tk": None,
                             "tc": None})
         self.load_plots(self.import_frame.plot_frames, self.survey)
@@ -96,7 +97,7 @@ class AddSurveyValuesAct:
     @staticmethod
     def draw_plot(plot, x, y):
         if not isinstance(x, (tuple, list)):
-            x = [x * i for i in range(len(y))]
+            x = x * np.arange(len(y))
         return plot.plot(x, y)
 
     def set_widgets(self, i, plot_frame, plot_data):
@@ -130,16 +131,14 @@ class AddSurveyValuesAct:
             self.import_frame.show_message("Wartość mnożnika musi być liczbą.")
         else:
             if 0 < m_value < 10000:
-                new_ys = [val * m_value 
-                    for val in self.survey.raw_values[index]]
+                self.survey.set_multiplier(index, m_value)
+                new_ys = self.survey.values[index]
                 plot_data.set_ydata(new_ys)
                 _, xmax, _, _ = plot_frame.plot.axis()
-                y_max = max(new_ys) * 1.05
+                y_max = np.max(new_ys) * 1.05
                 plot_frame.plot.axis([0, xmax, 0, y_max])
                 plot_frame.canvas.draw()
-                self.survey.multipliers[index] = m_value
                 self.import_frame.hide_message()
-                self.survey.values[index] = new_ys
 
     @staticmethod
     def get_times(data, smp_time):
@@ -166,7 +165,7 @@ class AddSurveyValuesAct:
                         return first_no_zero
             return length - 1
 
-        tk = data.index(max(data)) * smp_time       #highest value
+        tk = int(np.argmax(data)) * smp_time        #highest value
         t0 = get_first_no_zero() * smp_time
         tc = get_last_zero() * smp_time             #last 0 value form right
         return tk, t0, tc
@@ -188,6 +187,7 @@ class AddSurveyValuesAct:
                 self.refresh_legend(plot_f.plot)
                 plot_f.canvas.draw()
             self.survey.update({time_name: round(new_x, 2)})
+            self.show_integrals()
 
         def start_updating():
             return plot_canvas.mpl_connect("motion_notify_event",
@@ -200,6 +200,29 @@ class AddSurveyValuesAct:
         plot_canvas.mpl_connect("button_press_event",
                                 lambda event: end_updating())
 
+    def show_integrals(self):
+        times = (self.survey.t0, self.survey.tk, self.survey.tc)
+        if None in times:
+            return
+
+        method = INTEGRATION_METHODS["trapezów"]
+        smp_time = self.survey.sampling_time
+        texts = []
+        for i in range(len(self.survey.values)):
+            index = IntegralIndex.of(self.survey, i, method, smp_time / 1000)
+            if self.is_press_channel(i):
+                bounds = window_bounds(len(index), smp_time, times, 1)
+                texts.append(f"Ipk = {index.window(*bounds):.3f} MPa⋅s")
+            else:
+                #the window of Impulse.calculate_impulse, t0..tk
+                bounds = window_bounds(len(index), smp_time, times, 1)
+                texts.append(f"Ic = {index.window(*bounds) * 1000:.1f} N⋅s")
+        self.import_frame.show_message("    ".join(texts), "green")
+
+    def is_press_channel(self, i):
+        return self.survey.type == PRESS or\
+            (self.survey.type == PRESSTHRU and i == 0)
+
     def refresh_legend(self, plot):
         plot.legend(["Wykres pomiaru", "t0 = %s ms" % self.survey.t0,
                      "tk = %s ms" % self.survey.tk, "tc = %s ms" % self.survey.tc])
@@ -235,30 +258,13 @@ class AddSurveyValuesAct:
             "Zaznacz kliknięciem pierwszą granicę.", "yellow")
 
     def fix_survey(self, i, x1, x2, plot_frame, plot_data):
-        y_data = copy.deepcopy(plot_data.get_ydata())
-
         x = [x1, x2]
         t1 = min(x)
         t2 = max(x)
 
         index1 = int(t1 // self.survey.sampling_time)
         index2 = int(t2 // self.survey.sampling_time)
-        delta_x = abs(index1 - index2)
+        self.survey.add_patch(i, index1, index2)
 
-        y1 = y_data[index1]
-        y2 = y_data[index2]
-        delta_y = y2 - y1
-
-        step = delta_y / delta_x
-
-        change = 0
-        for index in range(index1, index2+1):
-            y_data[index] = y1 + change
-            change += step
-
-        plot_data.set_ydata(y_data)
+        plot_data.set_ydata(self.survey.values[i])
         plot_frame.canvas.draw()
-        if not isinstance(y_data, list):
-            y_data = y_data.tolist()
-
-        self.survey.values[i] = y_data
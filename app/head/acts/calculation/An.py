@@ -1,18 +1,25 @@
 from typing import Tuple, List
 import math
 import tkinter as tk
+import numpy as np
 from ..templates import CalculationActTemplate
 from ....core import An, AnOutput
 from ....gui.frames import ResultsFrame
 
 
 class AnAct(CalculationActTemplate):
+    TRACE_NOTE = ("Punkty przebiegu leżą z założenia na prostych o nachyleniu "
+        "n i nie niosą informacji o n.\nO n decydują różnice między "
+        "pomiarami, jak w metodzie średnich: błędy, przedziały i R²\n"
+        "liczone z jednego punktu na pomiar (średnich geometrycznych "
+        "przebiegu).")
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.fuel_name = args[1]
         data = args[2]
         self.config = args[3]
-        output = An(data, self.config).get_results()
+        output = An(data, self.config, self.trace).get_results()
         self.generate_report(self.frame, output)
         self.min_precision = 0
 
@@ -27,6 +34,11 @@ class AnAct(CalculationActTemplate):
         An_subtitle = frame.create_subtitle(frame.interior, "WARTOŚCI CHARAKTERYSTYK")
         final_output = tk.Label(frame.interior, text=f"A = {output.A:.3e} m/(s⋅Pa^n)\
             n = {output.n:.3g}", font=("bold", 20))
+        fit_text = self.get_fit_text(output)
+        if self.config.calculation_method == 2: #whole trace
+            fit_text += "\n" + self.TRACE_NOTE
+        fit_output = tk.Label(frame.interior, text=fit_text,
+            font=("bold", 12), justify="left")
 
         table_subtitle = frame.create_subtitle(frame.interior, "TABELA WYNIKÓW")
         data = self.get_table_data(output)
@@ -34,6 +46,28 @@ class AnAct(CalculationActTemplate):
 
         export_btn = frame.create_export_btn(frame.interior)
 
+        if output.trace_fit:
+            trace_fit_output = tk.Label(frame.interior,
+                text=self.get_trace_fit_text(output), font=("bold", 12),
+                justify="left")
+
+        if self.has_regimes(output):
+            regimes_output = tk.Label(frame.interior,
+                text=self.get_regimes_text(output), font=("bold", 12),
+                justify="left")
+
+        if output.bootstrap:
+            bs_subtitle = frame.create_subtitle(frame.interior,
+                "ROZKŁAD BOOTSTRAP WSPÓŁCZYNNIKÓW A i n")
+            bs_output = tk.Label(frame.interior,
+                text=self.get_bootstrap_text(output), font=("bold", 12))
+            bs_plotfig = self.draw_bootstrap_plot(frame, output)
+
+        if output.nozzle_design:
+            nd_subtitle = frame.create_subtitle(frame.interior,
+                "DOBÓR ŚREDNICY KRYTYCZNEJ DYSZY")
+            nd_plotfig = self.draw_nozzle_design_plot(frame, output)
+
         wp_subtitle = frame.create_subtitle(frame.interior, "WYKRESY POMIARÓW")
         wp_plotfig = self.draw_work_p_plots(frame, output)
 
@@ -41,14 +75,47 @@ class AnAct(CalculationActTemplate):
         app_plotfig.pack(expand=1, fill="both")
         An_subtitle.pack(fill="both", pady=5)
         final_output.pack(pady=10)
+        fit_output.pack(pady=5)
+        if output.trace_fit:
+            trace_fit_output.pack(pady=5)
+        if self.has_regimes(output):
+            regimes_output.pack(pady=5)
         table_subtitle.pack(fill="both", pady=5)
         table.pack()
         export_btn.pack(pady=5)
+        if output.bootstrap:
+            bs_subtitle.pack(fill="both", pady=5)
+            bs_output.pack(pady=5)
+            bs_plotfig.pack(expand=1, fill="both")
+        if output.nozzle_design:
+            nd_subtitle.pack(fill="both", pady=5)
+            nd_plotfig.pack(expand=1, fill="both")
         wp_subtitle.pack(fill="both", pady=5)
         wp_plotfig.pack(expand=1, fill="both")
+        self.show_trace(frame)
 
         data.append('')
         data.append(("A [m/(s⋅Pa^n)]", output.A, "n", output.n), )
+        data.append(("Bł. std. A", output.A_se, "Bł. std. n", output.n_se,
+            "R^2", output.r2))
+        data.append(("A 95% min.", output.A_ci[0], "A 95% maks.", output.A_ci[1],
+            "n 95% min.", output.n_ci[0], "n 95% maks.", output.n_ci[1]))
+        if output.trace_fit:
+            tf = output.trace_fit
+            data.append(("Dopasowanie przebiegów A [m/(s⋅Pa^n)]", tf.A,
+                "Bł. std. A", tf.A_se, "n", tf.n, "Bł. std. n", tf.n_se,
+                "RMS [MPa]", tf.rms))
+        if self.has_regimes(output):
+            for i, regime in enumerate(output.regimes, start=1):
+                data.append((f"Zakres {i} p min. [MPa]", regime.p_min/1000_000,
+                    "p maks. [MPa]", regime.p_max/1000_000,
+                    "A [m/(s⋅Pa^n)]", regime.A, "n", regime.n))
+        if output.bootstrap:
+            bs = output.bootstrap
+            data.append(("Bootstrap A 95% min.", bs.A_ci[0],
+                "Bootstrap A 95% maks.", bs.A_ci[1], "Bootstrap n 95% min.",
+                bs.n_ci[0], "Bootstrap n 95% maks.", bs.n_ci[1],
+                "Liczba prób", len(bs.n)))
         export_btn.configure(command=lambda: self.export_data(data))
 
     def get_table_data(self, output: AnOutput)\
@@ -64,7 +131,16 @@ class AnAct(CalculationActTemplate):
                     round(item.d_min, 1))
                     for i, item in enumerate(output.surveys_details, start=1)]
             return list((headings, *data))
-        
+
+        if self.config.calculation_method == 2: #whole trace
+            headings = ("Nr\npomiaru", "p śr. geom.\n[MPa]", "u śr. geom.\n[mm/s]","t0\n[ms]", "tk\n[ms]",
+                "Ipk\n[MPa⋅s]", "dm\n[mm]", "Max. dm\n[mm]", "Punkty\nprzebiegu")
+            data = [(i, round(item.p/1000_000, 3), round(item.u*1000, 1), *item.times[:-1],
+                    round(item.Ipk/1000_000, 3), format(item.jet_d, f'.{self.min_precision}f'),
+                    round(item.d_min, 1), len(item.trace))
+                    for i, item in enumerate(output.surveys_details, start=1)]
+            return list((headings, *data))
+
         headings = ("Nr.\npomiaru", "p chw.\n[MPa]", "u chw.\n[mm/s]","t0\n[ms]", "tk\n[ms]", 
             "Ipk\n[MPa⋅s]", "dm\n[mm]", "Max. dm\n[mm]", "t chwil.\n[ms]")
         data = [(i, round(item.p/1000_000, 3), round(item.u*1000, 1), *item.times[:-1],
@@ -73,6 +149,86 @@ class AnAct(CalculationActTemplate):
                 for i, item in enumerate(output.surveys_details, start=1)]
         return list((headings, *data))
 
+    @staticmethod
+    def get_fit_text(output: AnOutput) -> str:
+        if not math.isfinite(output.n):
+            return "Za mało pomiarów o różnych ciśnieniach do wyznaczenia A i n"
+        if not math.isfinite(output.n_se):
+            return f"R² = {output.r2:.4f} (za mało pomiarów dla błędów standardowych)"
+        return (f"A = {output.A:.3e} ± {output.A_se:.2e} m/(s⋅Pa^n),  "
+            f"95%: [{output.A_ci[0]:.3e}; {output.A_ci[1]:.3e}]\n"
+            f"n = {output.n:.4f} ± {output.n_se:.4f},  "
+            f"95%: [{output.n_ci[0]:.4f}; {output.n_ci[1]:.4f}]\n"
+            f"R² = {output.r2:.4f}")
+
+    @staticmethod
+    def get_trace_fit_text(output: AnOutput) -> str:
+        tf = output.trace_fit
+        return (f"Dopasowanie symulowanych przebiegów ciśnienia "
+            f"({tf.iterations} iteracji):\n"
+            f"A = {tf.A:.3e} ± {tf.A_se:.2e} m/(s⋅Pa^n),  "
+            f"n = {tf.n:.4f} ± {tf.n_se:.4f},  RMS = {tf.rms:.3g} MPa")
+
+    @staticmethod
+    def has_regimes(output: AnOutput) -> bool:
+        return bool(output.regimes) and len(output.regimes) > 1
+
+    @staticmethod
+    def get_regimes_text(output: AnOutput) -> str:
+        rows = ["Zakresy ciśnień o różnym wykładniku n:"]
+        for i, regime in enumerate(output.regimes, start=1):
+            rows.append(f"{i}. p = {regime.p_min/1000_000:.3g}"
+                f"–{regime.p_max/1000_000:.3g} MPa:  "
+                f"A = {regime.A:.3e} m/(s⋅Pa^n),  n = {regime.n:.4f}")
+        return "\n".join(rows)
+
+    @staticmethod
+    def get_bootstrap_text(output: AnOutput) -> str:
+        bs = output.bootstrap
+        return (f"Przedziały percentylowe 95% z {len(bs.n)} prób:\n"
+            f"A: [{bs.A_ci[0]:.3e}; {bs.A_ci[1]:.3e}] m/(s⋅Pa^n),  "
+            f"n: [{bs.n_ci[0]:.4f}; {bs.n_ci[1]:.4f}]")
+
+    @staticmethod
+    def draw_bootstrap_plot(frame, output):
+        bs = output.bootstrap
+        plotfig = frame.create_plot(frame.interior)
+        plot = plotfig.add_subplot(111)
+        plot.set_title("Łączny rozkład bootstrap współczynników A i n")
+        plot.set_xlabel("n")
+        plot.set_ylabel("A [m/(s⋅Pa^n)]")
+        plot.set_yscale("log")
+        plot.grid()
+
+        samples = plot.scatter(bs.n, bs.A, s=2, alpha=0.2)
+        estimate = plot.scatter(output.n, output.A, color="red", marker="x")
+        plot.axvline(bs.n_ci[0], color="green", linestyle="--")
+        plot.axvline(bs.n_ci[1], color="green", linestyle="--")
+        plot.legend((samples, estimate), ("Próby bootstrap", "Aproksymacja"))
+        return plotfig
+
+    @staticmethod
+    def draw_nozzle_design_plot(frame, output):
+        design = output.nozzle_design
+        plotfig = frame.create_plot(frame.interior)
+        plot = plotfig.add_subplot(111)
+        plot.set_title("Średnica krytyczna dyszy dla zadanego ciśnienia "
+            "równowagi w komorze spalania")
+        plot.set_xlabel("Ciśnienie równowagi [MPa]")
+        plot.set_ylabel("dm [mm]")
+        plot.grid()
+
+        for i, grain in enumerate(design.grains):
+            line, = plot.plot(design.pressures, design.jet_d[i], label=grain)
+            if design.jet_d_low is not None:
+                plot.fill_between(design.pressures, design.jet_d_low[i],
+                    design.jet_d_high[i], color=line.get_color(), alpha=0.2)
+        plot.scatter(output.work_pressures,
+            [item.jet_d for item in output.surveys_details],
+            color="red", label="Pomiary")
+        plot.legend()
+        return plotfig
+
     @staticmethod
     def get_plot_cords(output: AnOutput)\
         -> Tuple[tuple, tuple]:
@@ -91,6 +247,14 @@ class AnAct(CalculationActTemplate):
         plot.grid()
 
         cords = self.get_plot_cords(output)
+        handles, labels = [], []
+        traces = [item.trace for item in output.surveys_details
+                  if item.trace is not None and len(item.trace)]
+        if traces:
+            trace = np.log(np.concatenate(traces))
+            handles.append(plot.scatter(trace[:, 0], trace[:, 1], s=2,
+                                        alpha=0.3, color="gray"))
+            labels.append("Punkty przebiegu")
         points = plot.scatter(*cords, color="red")
         for i in range(len(cords[0])):
             plot.annotate(i+1, (cords[0][i], cords[1][i]))
@@ -101,7 +265,13 @@ class AnAct(CalculationActTemplate):
         xs = cords[0][0], cords[0][-1]
         ys = f(xs[0]), f(xs[1])
         line = plot.axline((xs[0], ys[0]), (xs[1], ys[1]), ls="--")
-        plot.legend((points, line), ("Pomiar", "Aproksymacja"))
+        if self.has_regimes(output):
+            for i, regime in enumerate(output.regimes, start=1):
+                x = np.log((regime.p_min, regime.p_max))
+                y = math.log(regime.A) + regime.n * x
+                handles.append(*plot.plot(x, y, lw=2))
+                labels.append(f"Zakres {i}: n = {regime.n:.3g}")
+        plot.legend((*handles, points, line), (*labels, "Pomiar", "Aproksymacja"))
         return plotfig
 
     def draw_work_p_plots(self, frame, output):
@@ -112,30 +282,48 @@ class AnAct(CalculationActTemplate):
         plotfig.figure.subplots_adjust(left=0.071, bottom=0.048,
             right=0.998, top=top, wspace=0.145, hspace=0.200)
 
-        for i, d in enumerate(zip(output.surveys_details, output.work_pressures), start=1):
+        label = "symulacja"
+        if output.trace_fit:
+            simulations = output.trace_fit.simulations
+            label = "symulacja\n(dopasowanie przebiegów)"
+        else:
+            simulations = output.simulations or\
+                (None,) * len(output.surveys_details)
+        for i, d in enumerate(zip(output.surveys_details, output.work_pressures,
+                                  simulations), start=1):
+            simulation = d[2]
             wp = d[1]
             d = d[0]
             size = subplots_rows, 2, i
             self.draw_subplot(plotfig, size, d.smp_time, d.press_values, 
-                wp, d.times[0], d.times[1], d.jet_d, d.point_time)
+                wp, d.times[0], d.times[1], d.jet_d, d.point_time,
+                d.burn_window, simulation, label)
 
         return plotfig
 
-    def draw_subplot(self, plotfig, size, smp_time, press_values, wp, t0, tk, jet_d, t=None):
+    def draw_subplot(self, plotfig, size, smp_time, press_values, wp, t0, tk, jet_d,
+        t=None, window=None, simulation=None, simulation_label="symulacja"):
         plt = plotfig.add_subplot(size)
-        time = tuple((smp_time * i for i in range(len(press_values))))
+        time = smp_time * np.arange(len(press_values))
         plt.plot(time, press_values)
         plt.axhline(wp, color="red")
         plt.axvline(t0, color="green", linestyle="--")
         plt.axvline(tk, color="pink", linestyle="--")
-        plt.axis(xmin=t0 - 10, ymin=0,
-            ymax=max(wp, *press_values) * 1.05, xmax=tk * 1.1)
+        shown_values = window.values if window is not None else press_values
+        ymax = max(wp, np.max(shown_values))
+        if simulation is not None:
+            plt.plot(simulation.time, simulation.pressure, color="gray",
+                linestyle="-.")
+            ymax = max(ymax, simulation.max_pressure)
+        plt.axis(xmin=t0 - 10, ymin=0, ymax=ymax * 1.05, xmax=tk * 1.1)
         dmin = format(jet_d, f'.{self.min_precision}f')
         plt.set_title(f"Pomiar nr {size[-1]}, dm = {dmin} mm")
         plt.set_xlabel("Czas [ms]")
         plt.set_ylabel("Ciśnienie [MPa]")
         legend = ["ciśnienie", f"ciśnienie równowagi\n{round(wp,2)} MPa",
         f"t0 = {int(round(t0, 0))} ms", f"tk = {int(round(tk, 0))} ms"]
+        if simulation is not None:
+            legend.append(simulation_label)
         if t != None:
             plt.axvline(t, color="orange", linestyle="--")
             legend.append(f"t = {int(round(t, 0))} ms")
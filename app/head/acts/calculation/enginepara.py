@@ -1,21 +1,31 @@
 from typing import Tuple
 import tkinter as tk
+import numpy as np
 from ..templates import CalculationActTemplate
-from ....core import EnginePara, EngineParaOutput
+from ....core import EnginePara, EngineParaOutput, EngineParaSummary
 from ....gui.frames import ResultsFrame
 
 
 class EngineParaAct(CalculationActTemplate):
+    INPUT_LABELS = {"da": "Średnica wylotowa dyszy",
+                    "pz": "Ciśnienie zewnętrzne",
+                    "I1": "Impuls jednostkowy",
+                    "g": "Przyspieszenie ziemskie",
+                    "k": "Wykładnik adiabaty k",
+                    "strength": "Siła paliwa",
+                    "jet_d": "Średnica krytyczna dyszy",
+                    "mass": "Masa paliwa"}
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.fuel_name = args[1]
         data = args[2]
         config = args[3]
-        output = EnginePara(data, config).get_results()
+        output = EnginePara(data, config, self.trace).get_results()
         self.generate_report(self.frame, output)
 
     def generate_report(self, 
-        frame: ResultsFrame, output: EngineParaOutput):
+        frame: ResultsFrame, output: EngineParaSummary):
         title = frame.create_title(frame.interior, 
             "WYNIKI OBLICZEŃ WARTOŚCI WSPÓŁCZYNNIKÓW STRAT " 
             f"GAZODYNAMICZNYCH I CIEPLNYCH DLA PALIWA {self.fuel_name}")
@@ -25,24 +35,80 @@ class EngineParaAct(CalculationActTemplate):
 
         export_btn = frame.create_export_btn(frame.interior)
 
+        if output.sensitivity:
+            sens_subtitle = frame.create_subtitle(frame.interior,
+                "WRAŻLIWOŚĆ WSPÓŁCZYNNIKÓW NA DANE WEJŚCIOWE")
+            sens_plotfig = self.draw_tornado_plot(frame, output)
+
+        mean, stdev = output.mean, output.stdev
         title.pack(fill="both")
         tk.Label(frame.interior,
-            text=f"φ_1 = {output.fi1:.3g}", font=16).pack()
+            text=f"φ_1 = {mean.fi1:.3g} ± {stdev.fi1:.2g}", font=16).pack()
         tk.Label(frame.interior,
-            text=f"φ_2 = {output.fi2:.3g}", font=16).pack(pady=10)
+            text=f"φ_2 = {mean.fi2:.3g} ± {stdev.fi2:.2g}",
+            font=16).pack(pady=10)
         tk.Label(frame.interior,
-            text=f"λ = {output.lam:.3g}", font=16).pack(pady=10)
+            text=f"λ = {mean.lam:.3g} ± {stdev.lam:.2g}",
+            font=16).pack(pady=10)
         table.pack(pady=20)
         export_btn.pack(pady=5)
+        if output.sensitivity:
+            sens_subtitle.pack(fill="both", pady=5)
+            sens_plotfig.pack(expand=1, fill="both")
+        self.show_trace(frame)
 
+        if output.sensitivity:
+            sens = output.sensitivity
+            data = list(data)
+            data.append('')
+            data.append(("Elastyczność (średnia z pomiarów)", "φ_1", "φ_2", "λ"))
+            for i, name in enumerate(sens.inputs):
+                data.append((self.INPUT_LABELS.get(name, name),
+                    *np.mean(sens.elasticities[:, i], axis=-1)))
         export_btn.configure(command=lambda: self.export_data(data))
 
     @staticmethod
-    def get_table_data(output: EngineParaOutput) -> Tuple[tuple, ...]:
-        headings = ("K0_k", "zeta_a", "Xa", "Fw","K_k\n[m^(1/2)/s]",
-            "Fmin\n[mm2]", "R\n[N⋅s]", "P\n[MPa⋅s]")
-        data = (f"{output.K0_k:.3g}", f"{output.zeta_a:.3g}",
-            f"{output.Xa:.3g}", f"{output.Fw:.3g}",
-            f"{output.K_k:.3g}", round(output.Fmin, 2),
-            round(output.R, 1), round(output.P, 3))
-        return headings, data
+    def get_table_data(output: EngineParaSummary) -> Tuple[tuple, ...]:
+        headings = ("Lp.", "φ_1", "φ_2", "λ", "K0_k", "zeta_a", "Xa", "Fw",
+            "K_k\n[m^(1/2)/s]", "Fmin\n[mm2]", "R\n[N⋅s]", "P\n[MPa⋅s]")
+        def row(label, item: EngineParaOutput):
+            return (label, f"{item.fi1:.3g}", f"{item.fi2:.3g}",
+                f"{item.lam:.3g}", f"{item.K0_k:.3g}", f"{item.zeta_a:.3g}",
+                f"{item.Xa:.3g}", f"{item.Fw:.3g}",
+                f"{item.K_k:.3g}", round(item.Fmin, 2),
+                round(item.R, 1), round(item.P, 3))
+        data = [row(i, item) for i, item in enumerate(output.surveys, start=1)]
+        data.append(row("Średnia", output.mean))
+        data.append(row("Odch. std.", output.stdev))
+        return (headings, *data)
+
+    def draw_tornado_plot(self, frame, output: EngineParaSummary):
+        """Change [%] of the mean of every coefficient over the surveys with
+        each input lowered and raised, the largest changes on top."""
+        sens = output.sensitivity
+        plotfig = frame.create_plot(frame.interior, figsize=(1, 12))
+        plotfig.figure.subplots_adjust(left=0.28, bottom=0.05, right=0.97,
+            top=0.96, hspace=0.3)
+        labels = [self.INPUT_LABELS.get(name, name) for name in sens.inputs]
+        names = "φ_1", "φ_2", "λ"
+        means = (output.mean.fi1, output.mean.fi2, output.mean.lam)
+        for i, (name, mean) in enumerate(zip(names, means)):
+            low = 100 * (np.mean(sens.low[i], axis=-1) / mean - 1)
+            high = 100 * (np.mean(sens.high[i], axis=-1) / mean - 1)
+            order = np.argsort(np.maximum(np.abs(low), np.abs(high)))
+            rows = np.arange(len(order))
+
+            plot = plotfig.add_subplot(3, 1, i + 1)
+            plot.set_title(f"{name}, dane wejściowe zmienione o "
+                f"±{100 * sens.step:.3g}%")
+            plot.set_xlabel(f"Zmiana {name} [%]")
+            plot.barh(rows, low[order], color="SteelBlue",
+                label=f"-{100 * sens.step:.3g}%")
+            plot.barh(rows, high[order], color="IndianRed",
+                label=f"+{100 * sens.step:.3g}%")
+            plot.set_yticks(rows)
+            plot.set_yticklabels([labels[j] for j in order])
+            plot.axvline(0, color="black", linewidth=0.8)
+            plot.grid(axis="x")
+            plot.legend()
+        return plotfig
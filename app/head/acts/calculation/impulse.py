@@ -1,3 +1,4 @@
+import math
 from typing import Tuple
 from statistics import mean
 from ..templates import CalculationActTemplate
@@ -11,7 +12,7 @@ class ImpulseAct(CalculationActTemplate):
         self.fuel_name = args[1]
         data = args[2]
         config = args[3]
-        output = Impulse(data, config).get_results()
+        output = Impulse(data, config, self.trace).get_results()
         self.generate_report(self.frame, output)
 
     def generate_report(self, 
@@ -26,12 +27,25 @@ class ImpulseAct(CalculationActTemplate):
         title.pack(fill="both")
         table.pack(pady=20)
         export_btn.pack(pady=5)
+        if any(item.time is not None for item in output):
+            plot_subtitle = frame.create_subtitle(frame.interior,
+                "WYKRES IMPULSU CAŁKOWITEGO")
+            plotfig = self.draw_cumulative_impulse_plot(frame, output)
+            plot_subtitle.pack(fill="both", pady=5)
+            plotfig.pack(expand=1, fill="both")
+        self.show_trace(frame)
         export_btn.configure(command=lambda: self.export_data(data))
 
     def get_table_data(self, output: ImpulseOutput) -> Tuple[tuple, ...]:
-        def get_a(item):
-            if item.a:
-                return round(item.a, 2)
+        def get_a(item, value):
+            if not math.isnan(item.a):
+                return round(value, 2)
+            else:
+                return "-"
+
+        def get_curve(item, value, precision):
+            if item.time is not None:
+                return round(value, precision)
             else:
                 return "-"
 
@@ -39,15 +53,40 @@ class ImpulseAct(CalculationActTemplate):
         min_precision = self.get_dm_precision(dms)
 
         headings = ("Nr\npomiaru", "Impuls jednostkowy\n[N⋅s/kg]",
-            "Impuls całkowity\n[N⋅s]", "a\n[-]", "dm [mm]",
+            "Impuls całkowity\n[N⋅s]", "a\n[-]", "a min.\n[-]", "a maks.\n[-]",
+            "Odch. std.\na [-]", "Ciąg maks.\n[N]", "Ciąg śr.\n[N]",
+            "Czas działania\n[s]", "Czas spalania\n[s]", "dm [mm]",
             "Dł. komory\nspalania [mm]", "Śr. komory\nspalania [mm]")
 
         data = [headings]
 
         for i, item in enumerate(output, start=1):
             row = (i, int(round(item.unit_impulse, 0)), round(item.total_impulse, 1),
-                get_a(item), format(item.jet_d, f'.{min_precision}f'), item.chamber_length,
+                get_a(item, item.a), get_a(item, item.a_min), get_a(item, item.a_max),
+                get_a(item, item.a_stdev), get_curve(item, item.peak_thrust, 1),
+                get_curve(item, item.average_thrust, 1),
+                get_curve(item, item.action_time, 3),
+                get_curve(item, item.burn_time, 3), format(item.jet_d, f'.{min_precision}f'), item.chamber_length,
                 item.chamber_d)
             data.append(row)
 
         return data
+
+    @staticmethod
+    def draw_cumulative_impulse_plot(frame: ResultsFrame,
+        output: ImpulseOutput):
+        plotfig = frame.create_plot(frame.interior)
+        plot = plotfig.add_subplot(111)
+        plot.set_title("Wykres impulsu całkowitego w funkcji czasu od t0")
+        plot.set_xlabel("Czas [ms]")
+        plot.set_ylabel("Impuls całkowity [N⋅s]")
+        plot.grid()
+
+        legend = []
+        for i, item in enumerate(output, start=1):
+            if item.time is None:
+                continue
+            plot.plot(item.time, item.cumulative_impulse)
+            legend.append(f"Pomiar nr {i}")
+        plot.legend(legend)
+        return plotfig
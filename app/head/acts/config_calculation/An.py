@@ -1,8 +1,12 @@
-from typing import NamedTuple
+import weakref
+from typing import NamedTuple, Optional
+import numpy as np
 from ...objects import Fuel
 from ...database import Database as db
 from ..templates import ConfigCalculationActTemplate
-from ....core import Data, Config
+from ....core import Data, Config, An
+from ....core.tools import RunningStatistics, Statistics,\
+    sufficient_statistics, LineFit
 from ..calculation import AnAct
 from ....globals import INTEGRATION_METHODS, CALCULATION_METHODS
 
@@ -10,18 +14,164 @@ from ....globals import INTEGRATION_METHODS, CALCULATION_METHODS
 class AnVariables(NamedTuple):
     w: float
     fuel: Fuel
+    bootstrap_resamples: int = 0
+    bootstrap_workers: int = 1
+    decimation: int = 1 #every n-th sample of the whole-trace method
+    max_segments: int = 1 #pressure regimes of the piecewise fit
+    simulate: bool = False #pressure traces from the fitted A and n
+    fit_traces: bool = False #A and n fitted to the measured pressure traces
 
 
 class ConfigAnAct(ConfigCalculationActTemplate):
     FRAME_NUMBER = 10
     NEEDED_SURVEY_TYPES = "press", "pressthru"
+    PREVIEW_CONFIG = "średnich", "trapezów"
+    BOOTSTRAP_RESAMPLES = 5000
+    MAX_SEGMENTS = 3
+
+    def __init__(self, *args, **kwargs):
+        self.points = weakref.WeakKeyDictionary()
+        self.preview_points = {}
+        self.preview_config = None
+        self.running = RunningStatistics()
+        super().__init__(*args, **kwargs)
+
+    def activate_events(self):
+        super().activate_events()
+        self.frame.surveys_list.tree_frame.on_toggle =\
+            lambda: self.update_fit_preview()
+        for field in self.frame.cboxes_frame.fields:
+            field.cbox.bind("<<ComboboxSelected>>",
+                lambda e: self.update_fit_preview(), add="+")
+
+    def update_fit_preview(self):
+        """Adds points of newly checked surveys to the running regression
+        and removes the unchecked ones, so a toggle costs no integration
+        of the other surveys and no refit from scratch. The points of the
+        whole-trace method depend on n of all chosen surveys, so that
+        method refits them at every change."""
+        config = self.get_preview_config()
+        decimation = self.get_decimation()
+        if (config, decimation) != self.preview_config:
+            self.running.clear()
+            self.preview_points = {}
+            self.preview_config = config, decimation
+
+        tree_frame = self.frame.surveys_list.tree_frame
+        chosen = dict(zip(tree_frame.get_chosen_ids(),
+                          self.get_chosen_surveys()))
+        if config.calculation_method == 2:
+            surveys = tuple(chosen.values())
+            fit = An(Data(surveys), config).solve_traces(
+                surveys, decimation)[0] if len(surveys) > 1 else None
+            self.frame.show_fit_preview(
+                self.get_preview_text(fit, len(surveys)))
+            return
+
+        lines = self.frame.surveys_list.surveys_t_lines
+
+        for index in tuple(self.preview_points):
+            entry = self.preview_points[index]
+            if index not in chosen or entry[0] is not chosen[index]\
+                or entry[1] != self.get_point_time(lines, index, config):
+                self.running.remove_statistics(entry[2])
+                del self.preview_points[index]
+
+        for index, survey in chosen.items():
+            if index in self.preview_points:
+                continue
+            t = self.get_point_time(lines, index, config)
+            stats = self.get_statistics(survey, t, config)
+            if stats:
+                self.running.add_statistics(stats)
+                self.preview_points[index] = survey, t, stats
+
+        self.frame.show_fit_preview(self.get_preview_text(
+            self.running.fit(), len(self.preview_points)))
+
+    def get_preview_config(self) -> Config:
+        values = self.frame.cboxes_frame.get_inserted_values()
+        calculation, integration = (value or default for value, default
+                                    in zip(values, self.PREVIEW_CONFIG))
+        return Config(INTEGRATION_METHODS[integration],
+            CALCULATION_METHODS[calculation])
+
+    def get_decimation(self, inputs=None) -> int:
+        "Decimation of the whole-trace method, 1 until a valid one is given."
+        if inputs is None:
+            inputs = self.get_values_from_inputs()
+        try:
+            return max(int(round(float(inputs[1]))), 1)
+        except (ValueError, TypeError, IndexError):
+            return 1
+
+    @staticmethod
+    def get_point_time(lines, index: int, config: Config)\
+        -> Optional[float]:
+        if config.calculation_method != 1:
+            return None
+        x = lines[index].get_xdata()
+        return x[0] if isinstance(x, (list, tuple)) else x
+
+    def get_statistics(self, survey, t: Optional[float], config: Config)\
+        -> Optional[Statistics]:
+        """Sufficient statistics of the survey's (ln p, ln u) points,
+        computed once per channel and config."""
+        channel = survey.values[0]
+        cached = self.points.setdefault(survey, {})
+        key = config, t
+        entry = cached.get(key)
+        if entry is None or entry[0] is not channel:
+            designation = An(Data((survey,)), config)
+            if config.calculation_method == 0:
+                points = np.array([designation.average_p_u(survey)[:2]])
+            else:
+                points = np.array([designation.pointed_p_u(survey, t)[:2]])
+            points = points[np.all(points > 0, axis=1)]
+            stats = sufficient_statistics(*np.log(points).T)\
+                if len(points) else None
+            entry = cached[key] = channel, stats
+        return entry[1]
+
+    @staticmethod
+    def get_preview_text(fit: Optional[LineFit], count: int) -> str:
+        if not fit:
+            return "Podgląd: wybierz co najmniej dwa pomiary"
+        with np.errstate(over="ignore"):
+            A = float(np.exp(fit.intercept))
+        return (f"Podgląd: A = {A:.3e} m/(s⋅Pa^n)"
+            f"   n = {fit.slope:.3g}   R² = {fit.r2:.4f}"
+            f"   (pomiarów: {count})")
+
+    def valid_inputs(self, inputs):
+        "Decimation may be left empty, then every sample is used."
+        if inputs and not inputs[1].strip():
+            inputs = [inputs[0], "1"]
+        return super().valid_inputs(inputs)
+
+    def get_valid_values_from_cboxes(self):
+        "Options may be left empty, then they are off."
+        values, invalid_fields = super().get_valid_values_from_cboxes()
+        return values, [field for field in invalid_fields
+                        if field not in self.frame.OPTION_VARIABLES]
+
+    def get_options(self, cboxes) -> dict:
+        "Whether every option of the frame is on, by its name."
+        return {name: value == self.frame.OPTIONS[1] for name, value
+                in zip(self.frame.OPTION_VARIABLES, cboxes[2:])}
 
     def start_calculation(self, data):
         fuel_name, cboxes, variables, surveys, times =\
              data
 
         fuel = db.load_fuel(fuel_name)
-        An_variables = AnVariables(variables[0], fuel)
+        options = self.get_options(cboxes)
+        An_variables = AnVariables(variables[0], fuel,
+            self.BOOTSTRAP_RESAMPLES, decimation=self.get_decimation(variables),
+            max_segments=self.MAX_SEGMENTS if options[self.frame.SEGMENTS]
+                else 1,
+            simulate=options[self.frame.SIMULATE],
+            fit_traces=options[self.frame.FIT_TRACES])
         data = Data(surveys, times, An_variables)
         config = Config(INTEGRATION_METHODS[cboxes[1]],
             CALCULATION_METHODS[cboxes[0]])
@@ -14,6 +14,7 @@ class EngineParaVariables(NamedTuple):
     pz: float #hPa
     I1: float #kN*s/kg
     g: float #m/s2
+    sensitivity: bool = False #derivatives of the coefficients over inputs
 
 
 class ConfigEngineParaAct(ConfigCalculationActTemplate):
@@ -25,7 +26,7 @@ class ConfigEngineParaAct(ConfigCalculationActTemplate):
              data
 
         fuel = db.load_fuel(fuel_name)
-        An_variables = EngineParaVariables(fuel, *variables)
+        An_variables = EngineParaVariables(fuel, *variables, sensitivity=True)
         data = Data(surveys, times, An_variables)
         config = Config(INTEGRATION_METHODS[cboxes[0]])
         EngineParaAct(self.top, fuel_name, data, config)
@@ -35,10 +36,3 @@ class ConfigEngineParaAct(ConfigCalculationActTemplate):
     def check_surveys(surveys):
         if not surveys:
             return Msg.needs_min_one_survey
-
-    #Disabling 
-    def set_buttons(self):
-        self.frame.navi_buttons[0].configure(
-            command=lambda: self.frame.show_message("Opcja niedostępna w obecnej wersji."))
-        self.frame.navi_buttons[1].configure(
-            command=lambda: self.clean())
@@ -1,10 +1,17 @@
+from typing import NamedTuple
 from ..templates import ConfigCalculationActTemplate
 from ...messages import Messages as Msg
+from ...data_management import DataManager as Dm
 from ....core import Data, Config
 from ..calculation import ImpulseAct
 from ....globals import INTEGRATION_METHODS
 
 
+class ImpulseVariables(NamedTuple):
+    burn_threshold: float
+    time_resolved: bool = True
+
+
 class ConfigImpulseAct(ConfigCalculationActTemplate):
     FRAME_NUMBER = 9
     NEEDED_SURVEY_TYPES = "thrust", "pressthru"
@@ -16,11 +23,21 @@ class ConfigImpulseAct(ConfigCalculationActTemplate):
         if not surveys:
             return Msg.needs_min_one_survey
 
+    def valid_inputs(self, inputs):
+        "The burn threshold is a percentage of the peak thrust."
+        values, report = super().valid_inputs(inputs)
+        if not report:
+            name = f"Wartość \"{self.frame.INPUT_VARIABLES[0]}\""
+            report = Dm.is_equal_or_less_than(values[0], 100, name, "100")
+            report = [report] if report else False
+        return values, report
+
     def start_calculation(self, data):
-        fuel_name, cboxes, _, surveys, _ =\
+        fuel_name, cboxes, variables, surveys, _ =\
              data
 
-        data = Data(surveys)
+        impulse_variables = ImpulseVariables(variables[0] / 100)
+        data = Data(surveys, variables=impulse_variables)
         config = Config(INTEGRATION_METHODS[cboxes[0]])
         ImpulseAct(self.top, fuel_name, data, config)
         self.top.change_frame(self.OUTPUT_FRAME_NUMBER)
@@ -25,16 +25,16 @@ class SurveysListAct(ListActTemplate):
     def edit_survey(self):
         ids = self.get_selected_surveys()
         if ids:
-            db_id = self.tree_list.tree.get_children().index(ids[0])
+            position = self.tree_list.tree.get_children().index(ids[0])
             edit_frame = self.top.frames[8]
-            survey = self.frame.data[db_id]
+            survey = db.load_survey(self.frame.data[position].db_id)
             values = list(survey.export().values())[:12]
             reversed_survey_types =\
                 {val: key for key, val in SURVEY_TYPES.items()}
             values[0] = reversed_survey_types[values[0]]
             values = [self.frame.fuel_name] + values
             edit_frame.survey = survey
-            edit_frame.survey_id = db_id
+            edit_frame.survey_id = survey.db_id
             edit_frame.set_values(values)
             self.top.change_frame(8)
 
@@ -56,13 +56,14 @@ class SurveysListAct(ListActTemplate):
 
             reply = mb.askyesno(title, message)
             if reply:
-                for s_id in ids:
-                    s_db_id = tree.get_children().index(s_id)
-                    tree.selection_remove(s_id)
-                    db.remove_survey(
-                        self.frame.fuel_name, self.frame.data[s_db_id].type, s_db_id)
-                    tree.delete(s_id)
-                    self.frame.data = self.frame.load_data()
+                children = tree.get_children()
+                positions = {children.index(s_id) for s_id in ids}
+                removed = [self.frame.data[i] for i in sorted(positions)]
+                db.remove_surveys(self.frame.fuel_name, removed[0].type,
+                                  [survey.db_id for survey in removed])
+                self.frame.data = [survey for i, survey in
+                    enumerate(self.frame.data) if i not in positions]
+                self.frame.reload_list()
 
     def get_selected_surveys(self):
         return self.tree_list.tree.selection()
@@ -1,7 +1,10 @@
 from tkinter import filedialog as fd
 import csv
+import numpy as np
 from typing import Tuple, Any, Union, Literal
 from ....core import Impulse, ImpulseOutput, Data, Config
+from ....core.tools import Trace, NULL_TRACE
+from ....globals import TRACE_CALCULATIONS
 from ....gui.TopWindow import TopWindow
 
 
@@ -12,6 +15,7 @@ class CalculationActTemplate:
     def __init__(self, top: TopWindow, 
         f_name: str, data: Data, config: Config):
         self.frame = top.frames[self.FRAME_NUMBER]
+        self.trace = Trace() if TRACE_CALCULATIONS else NULL_TRACE
         self.clean_frame()
 
     def clean_frame(self):
@@ -44,6 +48,45 @@ class CalculationActTemplate:
         csv_data = tuple((headings, *data[1:]))
         self.save_csv_file(csv_data)
 
+    def show_trace(self, frame):
+        "Recorded intermediate values and stage times, when tracing is on."
+        if not self.trace.enabled:
+            return
+        subtitle = frame.create_subtitle(frame.interior, "ŚLAD OBLICZEŃ")
+        table = frame.create_table(frame.interior, self.get_trace_data())
+        json_btn = frame.create_export_btn(frame.interior)
+        json_btn.configure(text="Eksportuj do .json",
+                           command=lambda: self.save_json_file())
+        subtitle.pack(fill="both", pady=5)
+        table.pack(pady=20)
+        json_btn.pack(pady=5)
+
+    def get_trace_data(self) -> Tuple[tuple, ...]:
+        headings = "Etap", "Wielkość", "Wartość", "Jednostka"
+        records = tuple((r.stage, r.name, self.format_value(r.value), r.unit)
+                        for r in self.trace.records)
+        timings = tuple((stage, "czas", f"{seconds * 1000:.3g}", "ms")
+                        for stage, seconds in self.trace.timings.items())
+        return (headings, *records, *timings)
+
+    @staticmethod
+    def format_value(value: Any) -> str:
+        values = np.ravel(value)
+        if values.dtype.kind not in "fiu":
+            return str(value)
+        return ", ".join(f"{v:.4g}" for v in values)
+
+    def save_json_file(self) -> Literal[True, None]:
+        filename = fd.asksaveasfilename(
+            filetypes=[('JSON files','*.json')], defaultextension="*.json",
+            initialfile="slad.json")
+
+        if not filename:
+            return
+
+        with open(filename, 'w', encoding="utf-8") as file:
+            self.trace.dump_json(file)
+
     @staticmethod
     def get_dm_precision(dms):
         min_precision = 0
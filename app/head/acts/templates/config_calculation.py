@@ -1,5 +1,6 @@
-from typing import List, Optional, Iterable
-from ....head.database import Database as db
+from itertools import chain
+from typing import List, Optional, Iterable, Sequence
+from ....head.database import Database as db, SurveyHeader
 from ....globals import SURVEY_TYPES
 from ....head.data_management import DataManager as Dm
 from ....head.messages import Messages as Msg
@@ -19,7 +20,8 @@ class ConfigCalculationActTemplate:
     def __init__(self, top: TopWindow):
         self.top = top
         self.frame = top.frames[self.FRAME_NUMBER]
-        self.surveys = {}
+        self.surveys = {} #headers of the fuel's surveys by type
+        self.loaded_surveys = {} #of the surveys previewed or chosen, by db_id
 
         self.frame.ch_fuel_cbox.bind(
             "<Button>", lambda e: self.__set_fuels_cbox())
@@ -86,8 +88,19 @@ class ConfigCalculationActTemplate:
 
     def get_chosen_surveys(self):
         ids = tuple(self.frame.surveys_list.tree_frame.get_chosen_ids())
-        surveys_list = tuple(*filter(lambda x: x, self.surveys.values()))
-        return [surveys_list[i] for i in ids]
+        headers = tuple(chain.from_iterable(
+            filter(lambda x: x, self.surveys.values())))
+        return self.load_surveys([headers[i] for i in ids])
+
+    def load_surveys(self, headers: Sequence[SurveyHeader])\
+        -> List[Survey]:
+        "Surveys of the headers, read from the database on the first use."
+        missing = [h.db_id for h in headers
+                   if h.db_id not in self.loaded_surveys]
+        if missing:
+            self.loaded_surveys.update((survey.db_id, survey)
+                for survey in db.load_surveys_by_id(missing))
+        return [self.loaded_surveys[h.db_id] for h in headers]
 
     def get_times(self):
         ids = tuple(self.frame.surveys_list.tree_frame.get_chosen_ids())
@@ -148,6 +161,7 @@ class ConfigCalculationActTemplate:
         fuel_name = self.frame.ch_fuel_cbox.get()
         if not fuel_name:
             return
+        self.loaded_surveys = {}
         for survey_type in self.NEEDED_SURVEY_TYPES:
             self.surveys.update(
                 {survey_type: self.__load_surveys_from_db(
@@ -163,19 +177,20 @@ class ConfigCalculationActTemplate:
             if not self.surveys[survey_type]:
                 continue
 
-            for survey in self.surveys[survey_type]:
+            for header in self.surveys[survey_type]:
                 list_data.append(
-                    [survey.__getattribute__(arg) for arg in self.SURVEY_ARGS])
+                    [header.__getattribute__(arg) for arg in self.SURVEY_ARGS])
 
-                if self.SHOW_VALUES == "thrust" and survey.type == "pressthru":
-                    plots_data.append((survey.values[1],
-                        survey.sampling_time,
-                        survey.comment))
+                if self.SHOW_VALUES == "thrust" and header.type == "pressthru":
+                    channel = 1
                 else:
-                    plots_data.append((survey.values[0],
-                    survey.sampling_time,
-                    survey.comment))
-                
+                    channel = 0
+                plots_data.append((
+                    lambda h=header, c=channel: self.load_surveys([h])[0].values[c],
+                    header.sampling_time,
+                    header.comment,
+                    header.peak_times[channel]
+                    if channel < len(header.peak_times) else 0.0))
 
         self.frame.surveys_list.tree_frame.set_data(list_data)
         self.frame.surveys_list.set_plots_data(plots_data)
@@ -183,5 +198,5 @@ class ConfigCalculationActTemplate:
     @staticmethod
     def __load_surveys_from_db(
             fuel_name: str, survey_type: str)\
-            -> Optional[List[Survey]]:
-        return db.load_surveys(fuel_name, survey_type)
+            -> Optional[List[SurveyHeader]]:
+        return db.list_survey_headers(fuel_name, survey_type)
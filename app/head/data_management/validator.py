@@ -15,6 +15,11 @@ class DataValidator:
         if val1 < val2:
             return Msg.cannot_be_less_than(name1, name2)
 
+    @staticmethod
+    def is_equal_or_less_than(val1, val2, name1="Wartość", name2="inna"):
+        if val1 > val2:
+            return Msg.cannot_be_bigger_than(name1, name2)
+
     @classmethod
     def is_bigger_than(
             cls, val1, val2, name1="Wartość", name2="inna"):
@@ -0,0 +1,3 @@
+from .database import Database
+from .pickle_store import PickleStore
+from .sqlite_store import SqliteStore, SurveyHeader
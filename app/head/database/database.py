@@ -0,0 +1,184 @@
+import os
+from ...globals import FUELS_FOLDER, DATABASE_FILE, SURVEY_TYPES
+from .pickle_store import PickleStore
+from .sqlite_store import SqliteStore
+
+
+class Database:
+    """Fuels and surveys of the application, kept by the SQLite store
+    opened in FUELS_FOLDER on the first use."""
+    store = None
+
+    @classmethod
+    def test_db(cls):
+        if cls.store is None:
+            cls.open()
+
+    @classmethod
+    def open(cls, folder=FUELS_FOLDER):
+        """
+        :param folder: <string>
+        :return: <SqliteStore>
+        Otwiera bazę danych w folderze (tworząc go w razie potrzeby). Nowa baza
+        przejmuje paliwa i pomiary zapisane w folderze w starym formacie;
+        przerwany import jest powtarzany przy następnym otwarciu.
+        """
+        if not os.path.exists(folder):
+            os.mkdir(folder)
+        path = '%s/%s' % (folder, DATABASE_FILE)
+        is_new = not os.path.exists(path)
+        if cls.store is not None:
+            cls.store.close()
+        cls.store = SqliteStore(path)
+        if is_new:
+            cls.store.set_import_pending(True)
+        if cls.store.is_import_pending():
+            cls.import_legacy(PickleStore(folder))
+        elif cls.store.needs_compaction():
+            cls.store.compact()
+        return cls.store
+
+    @classmethod
+    def get_store(cls):
+        cls.test_db()
+        return cls.store
+
+    @classmethod
+    def import_legacy(cls, legacy):
+        """
+        :param legacy: <PickleStore>
+        :return: None
+        Przepisuje do bazy paliwa i pomiary, których w niej jeszcze nie ma,
+        w jednej transakcji, więc błąd nie zostawia importu w połowie.
+        Pliki starego formatu pozostają na dysku.
+        """
+        store = cls.get_store()
+        with store.connection:
+            for name in legacy.get_fuels_list():
+                fuel = legacy.load_fuel(name)
+                if not fuel or store.is_fuel(name):
+                    continue
+                store.insert_fuel(fuel)
+                for s_type in SURVEY_TYPES.values():
+                    for survey in legacy.load_surveys(name, s_type) or ():
+                        store.insert_survey(name, survey)
+            store.set_import_pending(False)
+
+    ###########################     FUELS   ########################################
+    @classmethod
+    def save_fuel(cls, fuel):
+        """
+        :param : fuel <Fuel object>
+        :return : None
+        Otrzymuje paliwo <obiekt Fuel>, a następnie zapisuje je w bazie.
+        """
+        cls.get_store().save_fuel(fuel)
+
+    @classmethod
+    def load_fuel(cls, f_name):
+        """
+        :param f_name: <string>
+        :return : <fuel object> or False
+        Otrzymuje nazwę paliwa <string>, przeszukuje bazę danych i
+        zwraca paliwo <obiekt Fuel> albo <False> jesli nie znaleziono.
+        """
+        return cls.get_store().load_fuel(f_name)
+
+    @classmethod
+    def edit_fuel(cls, fuel):
+        """
+        :param fuel: <obiekt Fuel>
+        :return None:
+        Wyszukuje paliwo po nazwie pobranej z <obiekt Fuel>, następnie zapisuje
+        je na nowo z zachowaniem daty pierwszego zapisu.
+        """
+        old_fuel = cls.load_fuel(fuel.name)
+        if old_fuel:
+            fuel.save_date = old_fuel.save_date
+            fuel.save_time = old_fuel.save_time
+        cls.save_fuel(fuel)
+
+    @classmethod
+    def remove_fuel(cls, f_name):
+        """
+        :param f_name: <string>
+        :return: None
+        Usuwa paliwo o podanej nazwie <string> razem z jego pomiarami.
+        """
+        cls.get_store().remove_fuel(f_name)
+
+    @classmethod
+    def is_fuel(cls, f_name):
+        """
+        :param f_name: <string>
+        :return: True or False
+        Zwraca True jeśli paliwo o podanej nazwie <string> jest w bazie,
+        False jeśli nie.
+        """
+        return cls.get_store().is_fuel(f_name)
+
+    @classmethod
+    def get_fuels_list(cls):
+        """
+        :return: lista paliw <list>
+        Zwraca nazwy wszystkich paliw.
+        """
+        return cls.get_store().get_fuels_list()
+
+
+    ##############################  SURVEYS #########################################
+
+    @classmethod
+    def save_survey(cls, f_name, survey):
+        cls.get_store().save_survey(f_name, survey)
+
+    @classmethod
+    def load_surveys(cls, f_name, type):
+        return cls.get_store().load_surveys(f_name, type)
+
+    @classmethod
+    def list_survey_headers(cls, f_name, type):
+        """
+        :return: <list> of <SurveyHeader>
+        Zwraca dane pomiarów do list, bez wczytywania ich próbek.
+        """
+        return cls.get_store().list_survey_headers(f_name, type)
+
+    @classmethod
+    def load_survey(cls, s_id):
+        return cls.get_store().load_survey(s_id)
+
+    @classmethod
+    def load_surveys_by_id(cls, s_ids):
+        return cls.get_store().load_surveys_by_id(s_ids)
+
+    @classmethod
+    def find_surveys(cls, f_name, s_type=None, jet_diameter=None,
+        saved_from=None, saved_to=None):
+        return cls.get_store().find_surveys(
+            f_name, s_type, jet_diameter, saved_from, saved_to)
+
+    @classmethod
+    def remove_survey(cls, f_name, s_type, s_id):
+        """
+        :param s_id: <int> db_id pomiaru
+        Oznacza pomiar jako usunięty; miejsce zwalnia dopiero compact().
+        """
+        cls.get_store().remove_survey(f_name, s_type, s_id)
+
+    @classmethod
+    def remove_surveys(cls, f_name, s_type, s_ids):
+        cls.get_store().remove_surveys(f_name, s_type, s_ids)
+
+    @classmethod
+    def edit_survey(cls, f_name, old_s_type, old_s_id, new_survey):
+        """
+        :param old_s_id: <int> db_id pomiaru
+        Zapisuje zmiany pomiaru w miejscu, bez zmiany jego db_id i pozycji
+        na liście.
+        """
+        cls.get_store().edit_survey(f_name, old_s_type, old_s_id, new_survey)
+
+    @classmethod
+    def compact(cls):
+        cls.get_store().compact()
@@ -0,0 +1,358 @@
+import datetime
+import hashlib
+import pickle
+import sqlite3
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple,\
+    Union
+import numpy as np
+from ..objects import Survey, SignalSet
+
+
+class SurveyHeader(NamedTuple):
+    "Metadata of a saved survey, listed without loading its samples."
+    db_id: int
+    type: str
+    jet_diameter: float #mm
+    sampling_time: float #ms
+    fuel_mass: float #g
+    save_date: str
+    save_time: str
+    edit_date: str
+    edit_time: str
+    comment: str
+    peak_times: Tuple[float, ...] #ms, of the largest value of every channel
+
+
+class SqliteStore:
+    """Fuels and surveys in one SQLite file. A survey keeps the metadata
+    lists are filled and filtered with in columns of surveys, the rest of
+    its state pickled in header and its raw channels as one packed
+    (channels x samples) array in samples, read only when the survey
+    itself is loaded. Surveys of a fuel and type are listed in the order
+    they were saved, like the lists of the pickle store, and are known by
+    their ID, which never changes nor is reused. Removed surveys are only
+    marked deleted until compact() drops them. The database is
+    written ahead to its log, so saving a survey appends its rows to the
+    log whatever the size of the collection; SQLite's automatic
+    checkpoints merge the log into the file."""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS fuels (
+            name TEXT PRIMARY KEY,
+            data BLOB NOT NULL);
+        CREATE TABLE IF NOT EXISTS surveys (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fuel TEXT NOT NULL REFERENCES fuels(name) ON DELETE CASCADE,
+            type TEXT NOT NULL,
+            jet_diameter REAL,
+            sampling_time REAL,
+            fuel_mass REAL,
+            saved_at TEXT,
+            header BLOB NOT NULL,
+            deleted INTEGER NOT NULL DEFAULT 0,
+            save_date TEXT,
+            save_time TEXT,
+            edit_date TEXT,
+            edit_time TEXT,
+            comment TEXT,
+            peak_times BLOB);
+        CREATE INDEX IF NOT EXISTS surveys_by_type
+            ON surveys(fuel, type, id);
+        CREATE INDEX IF NOT EXISTS surveys_by_jet_diameter
+            ON surveys(fuel, jet_diameter);
+        CREATE INDEX IF NOT EXISTS surveys_by_date
+            ON surveys(fuel, saved_at);
+        CREATE TABLE IF NOT EXISTS samples (
+            survey INTEGER PRIMARY KEY
+                REFERENCES surveys(id) ON DELETE CASCADE,
+            dtype TEXT NOT NULL,
+            channels INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            digest BLOB);
+        """
+    #columns missing in databases created before they were added
+    ADDED_COLUMNS = (("surveys", "deleted", "INTEGER NOT NULL DEFAULT 0"),
+                     ("samples", "digest", "BLOB"),
+                     ("surveys", "save_date", "TEXT"),
+                     ("surveys", "save_time", "TEXT"),
+                     ("surveys", "edit_date", "TEXT"),
+                     ("surveys", "edit_time", "TEXT"),
+                     ("surveys", "comment", "TEXT"),
+                     ("surveys", "peak_times", "BLOB"))
+    COMPACTION_SHARE = 0.25 #of deleted surveys worth compacting on opening
+    IMPORT_PENDING = 1 #user_version until the legacy folder is imported
+    #columns of surveys written from a survey, fuel aside
+    METADATA_COLUMNS = "type", "jet_diameter", "sampling_time", "fuel_mass",\
+        "saved_at", "save_date", "save_time", "edit_date", "edit_time",\
+        "comment", "peak_times", "header"
+    HEADER_COLUMNS = "id, type, jet_diameter, sampling_time, fuel_mass, "\
+        "save_date, save_time, edit_date, edit_time, comment, peak_times"
+    SURVEY_COLUMNS = "surveys.id, surveys.header, surveys.type, "\
+        "surveys.sampling_time, samples.dtype, samples.channels, samples.data"
+    FROM_SURVEYS = "FROM surveys JOIN samples ON samples.survey = surveys.id"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        #a crash may lose the last save but never corrupts the file
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        self.upgrade()
+
+    def upgrade(self):
+        """Adds the missing columns, filling the metadata ones from the
+        surveys already saved."""
+        added = False
+        for table, column, definition in self.ADDED_COLUMNS:
+            columns = [row[1] for row in self.connection.execute(
+                "PRAGMA table_info(%s)" % table)]
+            if column not in columns:
+                with self.connection:
+                    self.connection.execute("ALTER TABLE %s ADD COLUMN %s %s"
+                                            % (table, column, definition))
+                added = True
+        if added:
+            with self.connection:
+                for row in self.connection.execute(
+                    "SELECT %s %s" % (self.SURVEY_COLUMNS, self.FROM_SURVEYS))\
+                    .fetchall():
+                    metadata, _ = self.to_rows(self.to_survey(*row))
+                    self.connection.execute(
+                        "UPDATE surveys SET %s WHERE id = ?" % self.assignments(),
+                        metadata + (row[0],))
+
+    def close(self):
+        self.connection.close()
+
+    def needs_compaction(self) -> bool:
+        share, = self.connection.execute(
+            "SELECT AVG(deleted) FROM surveys").fetchone()
+        return share is not None and share >= self.COMPACTION_SHARE
+
+    def is_import_pending(self) -> bool:
+        version, = self.connection.execute("PRAGMA user_version").fetchone()
+        return version == self.IMPORT_PENDING
+
+    def set_import_pending(self, pending: bool):
+        "Part of the open transaction, if there is one."
+        self.connection.execute("PRAGMA user_version = %i"
+                                % (self.IMPORT_PENDING if pending else 0))
+
+    def compact(self):
+        "Drops deleted surveys for good and gives their space back."
+        with self.connection:
+            self.connection.execute("DELETE FROM surveys WHERE deleted")
+        self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.connection.execute("VACUUM")
+
+    ###########################     FUELS   ########################################
+    def save_fuel(self, fuel):
+        with self.connection:
+            self.insert_fuel(fuel)
+
+    def insert_fuel(self, fuel):
+        self.connection.execute(
+            "INSERT INTO fuels(name, data) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET data = excluded.data",
+            (fuel.name, pickle.dumps(fuel)))
+
+    def load_fuel(self, f_name):
+        row = self.connection.execute(
+            "SELECT data FROM fuels WHERE name = ?", (f_name,)).fetchone()
+        return pickle.loads(row[0]) if row else False
+
+    def remove_fuel(self, f_name):
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM fuels WHERE name = ?", (f_name,))
+
+    def is_fuel(self, f_name):
+        return self.connection.execute(
+            "SELECT 1 FROM fuels WHERE name = ?", (f_name,)).fetchone()\
+            is not None
+
+    def get_fuels_list(self):
+        return [name for name, in self.connection.execute(
+            "SELECT name FROM fuels ORDER BY name")]
+
+
+    ##############################  SURVEYS #########################################
+
+    def save_survey(self, f_name, survey):
+        with self.connection:
+            self.insert_survey(f_name, survey)
+
+    def save_surveys(self, f_name, surveys: Sequence[Survey]):
+        "Saves all the surveys in one transaction."
+        with self.connection:
+            for survey in surveys:
+                self.insert_survey(f_name, survey)
+
+    def load_surveys(self, f_name, type):
+        surveys = [self.to_survey(*row) for row in self.connection.execute(
+            "SELECT %s %s WHERE surveys.fuel = ? AND surveys.type = ? "
+            "AND NOT surveys.deleted ORDER BY surveys.id"
+            % (self.SURVEY_COLUMNS, self.FROM_SURVEYS), (f_name, type))]
+        return surveys or False
+
+    def list_survey_headers(self, f_name, type)\
+        -> List[SurveyHeader]:
+        return [self.to_header(*row) for row in self.connection.execute(
+            "SELECT %s FROM surveys WHERE fuel = ? AND type = ? "
+            "AND NOT deleted ORDER BY id" % self.HEADER_COLUMNS,
+            (f_name, type))]
+
+    def load_survey(self, s_id: int):
+        row = self.connection.execute(
+            "SELECT %s %s WHERE surveys.id = ? AND NOT surveys.deleted"
+            % (self.SURVEY_COLUMNS, self.FROM_SURVEYS), (s_id,)).fetchone()
+        return self.to_survey(*row) if row else False
+
+    def load_surveys_by_id(self, s_ids: Sequence[int])\
+        -> List[Survey]:
+        "Surveys of the IDs in their order, skipping the ones not found."
+        surveys = {}
+        for start in range(0, len(s_ids), 500): #below the parameters limit
+            chunk = s_ids[start:start+500]
+            for row in self.connection.execute(
+                "SELECT %s %s WHERE surveys.id IN (%s) AND NOT surveys.deleted"
+                % (self.SURVEY_COLUMNS, self.FROM_SURVEYS,
+                   ", ".join("?" * len(chunk))), tuple(chunk)):
+                surveys[row[0]] = self.to_survey(*row)
+        return [surveys[s_id] for s_id in s_ids if s_id in surveys]
+
+    def find_surveys(self, f_name, s_type: Optional[str] = None,
+        jet_diameter: Optional[float] = None,
+        saved_from: Optional[datetime.datetime] = None,
+        saved_to: Optional[datetime.datetime] = None)\
+        -> List[Survey]:
+        """Surveys of the fuel matching every given criterion, oldest
+        first; dates bound the save time inclusively."""
+        conditions = ["surveys.fuel = ?", "NOT surveys.deleted"]
+        parameters = [f_name]
+        for condition, value in (("surveys.type = ?", s_type),
+                                 ("surveys.jet_diameter = ?", jet_diameter),
+                                 ("surveys.saved_at >= ?", saved_from),
+                                 ("surveys.saved_at <= ?", saved_to)):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value.isoformat(" ")
+                    if isinstance(value, datetime.datetime) else value)
+        return [self.to_survey(*row) for row in self.connection.execute(
+            "SELECT %s %s WHERE %s ORDER BY surveys.saved_at, surveys.id"
+            % (self.SURVEY_COLUMNS, self.FROM_SURVEYS,
+               " AND ".join(conditions)), parameters)]
+
+    def remove_survey(self, f_name, s_type, s_id):
+        self.remove_surveys(f_name, s_type, (s_id,))
+
+    def remove_surveys(self, f_name, s_type, s_ids: Iterable[int]):
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE surveys SET deleted = 1 "
+                "WHERE id = ? AND fuel = ? AND type = ?",
+                ((s_id, f_name, s_type) for s_id in s_ids))
+
+    def edit_survey(self, f_name, old_s_type, old_s_id, new_survey):
+        """Updates the survey in place, keeping its ID and place on the
+        list. Its samples are written only if they changed."""
+        metadata, samples = self.to_rows(new_survey)
+        with self.connection:
+            cursor = self.connection.execute(
+                "UPDATE surveys SET fuel = ?, %s "
+                "WHERE id = ? AND type = ? AND NOT deleted"
+                % self.assignments(),
+                (f_name,) + metadata + (old_s_id, old_s_type))
+            if not cursor.rowcount:
+                raise KeyError(old_s_id)
+            self.connection.execute(
+                "UPDATE samples SET dtype = ?, channels = ?, data = ?, "
+                "digest = ? WHERE survey = ? AND digest IS NOT ?",
+                samples + (old_s_id, samples[-1]))
+        new_survey.db_id = old_s_id
+
+    def insert_survey(self, f_name, survey: Survey):
+        metadata, samples = self.to_rows(survey)
+        cursor = self.connection.execute(
+            "INSERT INTO surveys(fuel, %s) VALUES (?%s)"
+            % (", ".join(self.METADATA_COLUMNS),
+               ", ?" * len(self.METADATA_COLUMNS)), (f_name,) + metadata)
+        self.connection.execute(
+            "INSERT INTO samples(survey, dtype, channels, data, digest) "
+            "VALUES (?, ?, ?, ?, ?)", (cursor.lastrowid,) + samples)
+        survey.db_id = cursor.lastrowid
+
+    def to_rows(self, survey: Survey)\
+        -> Tuple[tuple, tuple]:
+        "Values of METADATA_COLUMNS and of the samples columns."
+        state = survey.__getstate__()
+        state.pop("db_id", None)
+        raw = np.ascontiguousarray(state.pop("raw_values").data)
+        data = raw.tobytes()
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(("%s %i " % (raw.dtype.str, len(raw))).encode())
+        digest.update(data)
+        return (survey.type, survey.jet_diameter, survey.sampling_time,
+                survey.fuel_mass, self.saved_at(survey), survey.save_date,
+                survey.save_time, survey.edit_date, survey.edit_time,
+                survey.comment, self.peak_times(survey, raw),
+                pickle.dumps(state)),\
+            (raw.dtype.str, len(raw), data, digest.digest())
+
+    @staticmethod
+    def peak_times(survey: Survey, raw: np.ndarray)\
+        -> Optional[bytes]:
+        """Times of the largest value of every channel. Patches that no
+        longer fit the raw values, replaced after them, are left out, and
+        multipliers that do not fit the channels give None."""
+        try:
+            values = survey.values.data
+        except (IndexError, ValueError):
+            try:
+                multipliers = np.ones(len(raw))
+                multipliers[:len(survey.multipliers)] =\
+                    survey.multipliers[:len(raw)]
+            except (TypeError, ValueError):
+                return None
+            values = raw * multipliers[:, None]
+        peak_times = survey.sampling_time * np.argmax(values, axis=1)\
+            if values.size else np.empty(len(values))
+        return peak_times.astype("<f8").tobytes()
+
+    def assignments(self) -> str:
+        return ", ".join("%s = ?" % column for column in self.METADATA_COLUMNS)
+
+    @staticmethod
+    def to_header(s_id: int, s_type: str, jet_diameter: float,
+        sampling_time: float, fuel_mass: float, save_date: str,
+        save_time: str, edit_date: str, edit_time: str, comment: str,
+        peak_times: bytes)\
+        -> SurveyHeader:
+        return SurveyHeader(s_id, s_type, jet_diameter, sampling_time,
+            fuel_mass, save_date, save_time, edit_date, edit_time, comment,
+            tuple(np.frombuffer(peak_times or b"", dtype="<f8").tolist()))
+
+    @staticmethod
+    def to_survey(s_id: int, header: bytes, s_type: str, sampling_time: float,
+        dtype: str, channels: int, data: bytes)\
+        -> Survey:
+        state = pickle.loads(header)
+        raw = np.frombuffer(data, dtype=dtype).reshape(channels, -1)\
+            if channels else ()
+        state["raw_values"] = SignalSet.for_survey(
+            s_type, raw, sampling_time, np.dtype(dtype))
+        survey = Survey.__new__(Survey)
+        survey.__setstate__(state)
+        survey.db_id = s_id
+        return survey
+
+    @staticmethod
+    def saved_at(survey: Survey) -> Union[str, None]:
+        "Save date and time of the survey as a sortable ISO string."
+        try:
+            return datetime.datetime.strptime(
+                "%s %s" % (survey.save_date, survey.save_time),
+                "%d.%m.%Y %H:%M:%S").isoformat(" ")
+        except (AttributeError, ValueError):
+            return None
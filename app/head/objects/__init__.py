@@ -1,2 +1,3 @@
 from .fuel import Fuel
 from .survey import Survey
+from .signal_set import SignalSet
@@ -0,0 +1,68 @@
+from typing import Sequence, Tuple, Iterator
+import numpy as np
+from ...globals import PRESS, THRUST, PRESSTHRU
+
+
+CHANNELS = {PRESS: (("ciśnienie", "MPa"),),
+            THRUST: (("ciąg", "kN"),),
+            PRESSTHRU: (("ciśnienie", "MPa"), ("ciąg", "kN"))}
+
+
+class SignalSet:
+    """Equally long channels of one survey stored in one contiguous
+    (channels x samples) array, with their names, units and the sampling
+    time [ms]. Indexing returns a row view; assigning a channel writes it
+    in place and hands out a new view object, so caches keyed by the
+    channel object notice the change."""
+
+    def __init__(self, channels: Sequence[Sequence[float]] = (),
+        names: Sequence[str] = (), units: Sequence[str] = (),
+        sampling_time: float = 0, dtype=np.float64):
+        self.data = np.array(channels, dtype=dtype, ndmin=2)
+        if not len(channels):
+            self.data = np.empty((0, 0), dtype=dtype)
+        self.names = tuple(names)
+        self.units = tuple(units)
+        self.sampling_time = sampling_time
+        self.__rows = list(self.data)
+
+    @classmethod
+    def for_survey(cls, s_type: str, channels: Sequence[Sequence[float]],
+        sampling_time: float, dtype=np.float64) -> "SignalSet":
+        names, units = zip(*CHANNELS[s_type]) if s_type in CHANNELS\
+            else ((), ())
+        return cls(channels, names, units, sampling_time, dtype)
+
+    def __len__(self):
+        return len(self.__rows)
+
+    def __getitem__(self, channel: int) -> np.ndarray:
+        return self.__rows[channel]
+
+    def __setitem__(self, channel: int, values: Sequence[float]):
+        self.data[channel] = values
+        self.__rows[channel] = self.data[channel]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return iter(self.__rows)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.data.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def copy(self) -> "SignalSet":
+        return SignalSet(self.data, self.names, self.units,
+                         self.sampling_time, self.data.dtype)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_SignalSet__rows"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__rows = list(self.data)
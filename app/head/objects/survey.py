@@ -1,8 +1,12 @@
+from typing import Optional, Sequence
+import numpy as np
 from .template import Template
+from .signal_set import SignalSet
 
 
 class Survey(Template):
     ARGS_NUM = 12
+    DERIVED_FROM = "raw_values", "multipliers", "patches"
 
     def __init__(self):
         self.type: str = ""
@@ -21,11 +25,93 @@ class Survey(Template):
 
         self.comment: str = ""
 
-        self.raw_values = []
-        self.values = []
+        self.raw_values = SignalSet()
         self.multipliers = []
+        self.patches = []
+        #(channel, start, end, samples) - samples None bridges start and end
         self.t0: float = 0
         self.tk: float = 0
         self.tc: float = 0
+        self.db_id: Optional[int] = None #given by the database on saving
 
         super().__init__()
+
+    def __setattr__(self, name, value):
+        if name in self.DERIVED_FROM:
+            self.__dict__.pop("_values", None)
+        if name == "raw_values" and not isinstance(value, SignalSet):
+            value = SignalSet.for_survey(self.type, value, self.sampling_time)
+        super().__setattr__(name, value)
+
+    @property
+    def values(self) -> SignalSet:
+        """raw_values times multipliers with patches applied. Computed on
+        the first read after raw_values, multipliers or patches change."""
+        values = self.__dict__.get("_values")
+        if values is None:
+            values = self.__dict__["_values"] = self.__derive_values()
+        return values
+
+    @values.setter
+    def values(self, values: Sequence[Sequence[float]]):
+        "Keeps given values as patches over raw_values times multipliers."
+        self.patches = []
+        self.__patch_differences(values)
+
+    def set_multiplier(self, channel: int, multiplier: float):
+        multipliers = list(self.multipliers)
+        multipliers[channel] = multiplier
+        self.multipliers = multipliers
+
+    def add_patch(self, channel: int, start: int, end: int,
+        samples: Optional[Sequence[float]] = None):
+        self.patches = self.patches + [(channel, start, end, samples)]
+
+    def reset_values(self):
+        self.update({"multipliers": [1 for _ in self.raw_values],
+                     "patches": []})
+
+    def __derive_values(self) -> SignalSet:
+        values = self.raw_values.copy()
+        if not len(values):
+            return values
+
+        multipliers = np.ones(len(values))
+        multipliers[:len(self.multipliers)] = self.multipliers[:len(values)]
+        values.data *= multipliers[:, None].astype(values.data.dtype)
+
+        for channel, start, end, samples in self.patches:
+            data = values.data[channel]
+            if samples is None:
+                samples = np.linspace(data[start], data[end], end - start + 1)
+            data[start:end+1] = samples
+        return values
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_values", None)
+        return state
+
+    def __setstate__(self, state):
+        """Surveys pickled before SignalSet kept their channels as lists
+        and stored the corrected values next to the raw ones."""
+        self.__dict__.update(state)
+        self.raw_values = self.raw_values #lists to SignalSet
+        self.__dict__.setdefault("patches", [])
+        self.__dict__.setdefault("db_id", None)
+
+        stored = self.__dict__.pop("values", None)
+        if stored is not None and len(stored):
+            self.__patch_differences(stored)
+
+    def __patch_differences(self, stored):
+        derived = self.values
+        for channel, samples in enumerate(stored):
+            samples = np.asarray(samples, dtype=float)
+            changed = np.flatnonzero(~np.isclose(samples, derived[channel]))
+            if not len(changed):
+                continue
+            runs = np.split(changed, np.flatnonzero(np.diff(changed) > 1) + 1)
+            for run in runs:
+                start, end = int(run[0]), int(run[-1])
+                self.add_patch(channel, start, end, samples[start:end+1])
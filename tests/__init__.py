@@ -1,5 +1,9 @@
 import unittest
 from tests.data_management import *
+from tests.core.tools import *
+from tests.core.designations import *
+from tests.objects import *
+from tests.database import *
 from .impulse import ImpulseTest
 
 
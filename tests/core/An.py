@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 import tabulate as t
 from typing import Tuple, NamedTuple
 from app.core import Data, Config, An, AnOutput
@@ -73,7 +74,7 @@ class AnTest():
 
         for survey in surveys:
             data = survey.values[0]
-            times.append(data.index(max(data)) * survey.sampling_time)
+            times.append(int(np.argmax(data)) * survey.sampling_time)
         
         return Data(surveys, times)
 
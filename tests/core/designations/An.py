@@ -0,0 +1,121 @@
+import unittest
+import numpy as np
+from app.core import Data, Config, An
+from .surveys import steady_burn, varying_burn, make_variables
+
+
+class AnTest(unittest.TestCase):
+    A, n = 3e-5, 0.4
+
+    def make_An(self, noises=(0.0,) * 6, method=0, **variables):
+        pressures = np.linspace(2, 12, len(noises))
+        surveys = tuple(steady_burn(p, self.A, self.n, 4 + i, noise=noise)
+                        for i, (p, noise) in enumerate(zip(pressures, noises)))
+        return An(Data(surveys, variables=make_variables(**variables)),
+                  Config(1, method))
+
+    def test_mean_method_recovers_A_and_n(self):
+        output = self.make_An().get_results()
+        self.assertAlmostEqual(output.n, self.n, places=3)
+        self.assertAlmostEqual(output.A / self.A, 1, places=2)
+
+    def test_trace_method_recovers_n_other_than_1(self):
+        A, n = 1e-6, 0.6
+        surveys = tuple(varying_burn(p, A, n, bulge, 4 + i)
+            for i, (p, bulge) in enumerate(zip((2, 4, 6, 9, 12),
+                                               (0.3, -0.2, 0.5, 0.1, -0.4))))
+        an = An(Data(surveys, variables=make_variables(decimation=3)),
+                Config(1, 2))
+        fit = an.calculate_An(surveys)
+        self.assertAlmostEqual(fit.n, n, places=4)
+        self.assertAlmostEqual(fit.A / A, 1, places=3)
+        np.testing.assert_allclose(an.details[0].trace[:, 1],
+            A * an.details[0].trace[:, 0]**n, rtol=1e-3)
+
+    def test_close_pressures_give_unbounded_interval_of_A(self):
+        surveys = tuple(steady_burn(p, self.A, self.n, 4 + i, noise=noise)
+            for i, (p, noise) in enumerate(zip((6, 6.05, 6.1),
+                                               (0.03, -0.02, 0.04))))
+        an = An(Data(surveys, variables=make_variables()), Config(1, 0))
+        fit = an.calculate_An(surveys)
+        self.assertEqual(fit.A_ci[1], np.inf)
+        self.assertLessEqual(fit.A_ci[0], fit.A)
+
+    def test_trace_method_errors_count_surveys_not_samples(self):
+        surveys = tuple(varying_burn(p, 1e-6, 0.6, bulge, 4 + i)
+            for i, (p, bulge) in enumerate(zip((2, 4, 6, 9, 12),
+                                               (0.3, -0.2, 0.5, 0.1, -0.4))))
+        for survey, scale in zip(surveys, (1.03, 0.98, 1.01, 0.96, 1.04)):
+            survey.values[0][:] = scale * np.asarray(survey.values[0])
+        mean = An(Data(surveys, variables=make_variables()),
+                  Config(1, 0)).calculate_An(surveys)
+        trace = An(Data(surveys, variables=make_variables()),
+                   Config(1, 2)).calculate_An(surveys)
+        self.assertEqual(len(trace.residuals), len(surveys))
+        self.assertAlmostEqual(trace.n_se / mean.n_se, 1, delta=0.2)
+
+    def test_trace_method_needs_two_pressures(self):
+        surveys = (varying_burn(6, 1e-6, 0.6, 0.3, 4),)
+        an = An(Data(surveys, variables=make_variables()), Config(1, 2))
+        self.assertIsNone(an.solve_traces(surveys)[0])
+        output = an.get_results()
+        self.assertTrue(np.isnan(output.n))
+        self.assertTrue(np.isnan(output.n_se))
+
+    def test_work_p_sweep_matches_work_p_of_every_survey(self):
+        an = self.make_An()
+        surveys = an.data.surveys
+        jets = [survey.jet_diameter for survey in surveys]
+        sweep = an.work_p_sweep(jets, surveys, (self.A, 2 * self.A),
+                                (self.n, 0.5))
+        self.assertEqual(sweep.shape, (len(jets), len(surveys), 2))
+        for i, survey in enumerate(surveys):
+            self.assertAlmostEqual(sweep[i, i, 0],
+                an.work_p(survey, self.A, self.n), places=9)
+            self.assertAlmostEqual(sweep[i, i, 1],
+                an.work_p(survey, 2 * self.A, 0.5), places=9)
+
+    def test_jet_d_sweep_inverts_work_p_sweep(self):
+        an = self.make_An()
+        surveys = an.data.surveys[:2]
+        jets = np.linspace(3, 9, 7)
+        A, n = (self.A, 2 * self.A), (self.n, 0.5)
+        pressures = an.work_p_sweep(jets, surveys, A, n)
+        for grain in range(len(surveys)):
+            for pair in range(len(A)):
+                d = an.jet_d_sweep(pressures[:, grain, pair], surveys, A, n)
+                np.testing.assert_allclose(d[:, grain, pair], jets)
+
+    def test_bootstrap_is_reproducible(self):
+        an = self.make_An((0.03, -0.02, 0.04, -0.03, 0.01, 0.02))
+        an.calculate_An(an.data.surveys)
+        first = an.bootstrap_An(3000, seed=7)
+        second = an.bootstrap_An(3000, seed=7)
+        other = an.bootstrap_An(3000, seed=8)
+        np.testing.assert_array_equal(first.n, second.n)
+        np.testing.assert_array_equal(first.A, second.A)
+        self.assertFalse(np.array_equal(first.n, other.n))
+
+    def test_bootstrap_workers_give_same_resamples(self):
+        an = self.make_An((0.03, -0.02, 0.04, -0.03, 0.01, 0.02))
+        an.calculate_An(an.data.surveys)
+        an.BOOTSTRAP_CHUNK = 1000
+        serial = an.bootstrap_An(3500, workers=1, seed=3)
+        pooled = an.bootstrap_An(3500, workers=2, seed=3)
+        np.testing.assert_array_equal(serial.n, pooled.n)
+        self.assertEqual(serial.A_ci, pooled.A_ci)
+        self.assertEqual(serial.n_ci, pooled.n_ci)
+
+    def test_bootstrap_intervals_contain_estimate(self):
+        an = self.make_An((0.03, -0.02, 0.04, -0.03, 0.01, 0.02))
+        fit = an.calculate_An(an.data.surveys)
+        bootstrap = an.bootstrap_An(5000, seed=1)
+        self.assertLess(bootstrap.n_ci[0], fit.n)
+        self.assertLess(fit.n, bootstrap.n_ci[1])
+        self.assertLess(bootstrap.A_ci[0], fit.A)
+        self.assertLess(fit.A, bootstrap.A_ci[1])
+        self.assertLess(bootstrap.n_ci[1] - bootstrap.n_ci[0], 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
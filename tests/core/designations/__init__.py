@@ -0,0 +1,4 @@
+from .impulse import ImpulseCalculationTest
+from .An import AnTest
+from .ballistics import BallisticsTest
+from .enginepara import EngineParaTest
@@ -0,0 +1,94 @@
+import unittest
+import warnings
+import numpy as np
+from app.core import Data, Config, An
+from app.core.ballistics import Ballistics
+from .surveys import steady_burn, make_survey, make_variables, GRAIN
+
+#long grains keep the burning surface nearly constant through the burn
+LONG_GRAIN = {"fuel_length": 400.0, "fuel_mass": 150.0,
+              "chamber_length": 420.0}
+
+
+class BallisticsTest(unittest.TestCase):
+    A, n = 3e-5, 0.4
+
+    def make_data(self, burns=((6, 16), (12, 13), (3, 20))):
+        "Surveys long enough to hold the burn at (pressure [MPa], jet)."
+        surveys = tuple(steady_burn(pressure, self.A, self.n, jet,
+                                    sampling_time=0.05)
+                        for pressure, jet in burns)
+        for survey in surveys:
+            survey.update(LONG_GRAIN)
+        return Data(surveys, variables=make_variables())
+
+    def test_quasi_steady_pressure_is_work_pressure(self):
+        data = self.make_data()
+        an = An(data, Config(1, 0))
+        outputs = Ballistics(data, Config(1, 0)).simulate(self.A, self.n)
+        for survey, output in zip(data.surveys, outputs):
+            self.assertAlmostEqual(output.max_pressure /
+                an.work_p(survey, self.A, self.n), 1, delta=0.02)
+
+    def test_burn_time_is_web_over_burn_rate(self):
+        data = self.make_data()
+        outputs = Ballistics(data, Config(1, 0)).simulate(self.A, self.n)
+        for survey, output in zip(data.surveys, outputs):
+            web = 1e-3 * (survey.fuel_outer_diameter -
+                          survey.fuel_inner_diameter) / 4
+            start = int(round(survey.t0 / survey.sampling_time))
+            end = start + int(output.burn_time / survey.sampling_time)
+            u = self.A * np.mean((1e6 * output.pressure[start:end+1])**self.n)
+            self.assertAlmostEqual(1e-3 * output.burn_time / (web / u), 1,
+                                   delta=0.01)
+
+    def test_small_chamber_does_not_slow_the_batch(self):
+        data = self.make_data()
+        data.surveys[0].update({"chamber_length": 1.0}) #least free volume
+        ballistics = Ballistics(data, Config(1, 0))
+        burns = ballistics.integrate(ballistics.get_grains(data.surveys),
+            np.full(3, self.A), np.full(3, self.n), 1.0)
+        for burn in burns:
+            self.assertLess(len(burn.time), 2 * ballistics.STEPS_PER_BURN)
+        outputs = ballistics.simulate(self.A, self.n)
+        self.assertTrue(all(np.all(np.isfinite(o.pressure)) for o in outputs))
+
+    def make_traces(self) -> Ballistics:
+        "Ballistics of simulated traces with 0.02 MPa of noise."
+        data = Data(tuple(steady_burn(pressure, self.A, self.n, jet)
+                          for pressure, jet in ((8, 5), (15, 4))),
+                    variables=make_variables())
+        outputs = Ballistics(data, Config(1, 0)).simulate(self.A, self.n)
+        rng = np.random.default_rng(2)
+        surveys = tuple(make_survey("press", [output.pressure +
+                rng.normal(0, 0.02, len(output.pressure))], #MPa of noise
+            survey.sampling_time, survey.t0, survey.tk, survey.tc,
+            jet_diameter=survey.jet_diameter, **GRAIN)
+            for survey, output in zip(data.surveys, outputs))
+        return Ballistics(Data(surveys, variables=make_variables()),
+                          Config(1, 0))
+
+    def test_fit_traces_recovers_A_and_n_of_simulated_traces(self):
+        ballistics = self.make_traces()
+        fit = ballistics.fit_traces(1.2 * self.A, 0.35)
+        self.assertLess(fit.iterations, ballistics.FIT_ITERATIONS)
+        self.assertAlmostEqual(fit.A / self.A, 1, delta=0.01)
+        self.assertAlmostEqual(fit.n, self.n, delta=0.005)
+        self.assertAlmostEqual(fit.rms, 0.02, delta=0.002)
+
+    def test_fit_traces_from_a_start_not_matching_the_geometry(self):
+        ballistics = self.make_traces()
+        n_min, n_max = ballistics.N_BOUNDS
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            for A, n in ((30 * self.A, 0.9), (self.A / 30, 0.05),
+                         (1e3 * self.A, 1.5), (1e-3 * self.A, -1.0)):
+                fit = ballistics.fit_traces(A, n)
+                if fit is None:
+                    continue
+                self.assertTrue(all(np.isfinite((fit.A, fit.n, fit.rms))))
+                self.assertTrue(n_min <= fit.n <= n_max)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+import numpy as np
+from app.core import Data, Config
+from app.core.enginepara import EnginePara, EngineInputs
+
+
+class EngineParaTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = EnginePara(Data(()), Config(1))
+        self.inputs = EngineInputs(1.25, 1.0, 12.0, 1013.0, 2.0, 9.81,
+            np.array([5.0, 6.0, 4.5]), np.array([15.0, 14.0, 16.0]),
+            np.array([300.0, 280.0, 320.0]), np.array([1.0e6, 0.8e6, 1.3e6]),
+            np.array([55.0, 50.0, 60.0]))
+
+    def test_evaluate_of_arrays_matches_every_survey(self):
+        batched = self.engine.evaluate(self.inputs)
+        for i in range(3):
+            single = self.engine.evaluate(EngineInputs(*(
+                value[i] if np.ndim(value) else value
+                for value in self.inputs)))
+            for name, value in single._asdict().items():
+                column = np.broadcast_to(getattr(batched, name), (3,))
+                np.testing.assert_allclose(value, column[i], rtol=1e-12,
+                                           err_msg=name)
+
+    def test_fi2_elasticities(self):
+        sensitivity = self.engine.sensitivity(self.inputs)
+        fi2 = dict(zip(sensitivity.inputs, sensitivity.elasticities[1]))
+        np.testing.assert_allclose(fi2["mass"], 1, atol=1e-9)
+        np.testing.assert_allclose(fi2["strength"], 0.5, atol=1e-4)
+        np.testing.assert_allclose(fi2["g"], -0.5, atol=1e-4)
+        np.testing.assert_allclose(fi2["pz"], 0, atol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import math
+import numpy as np
+from app.core import Data, Config, Impulse, Quantity, ThrustCoefficient
+from .surveys import make_survey
+
+
+class ImpulseCalculationTest(unittest.TestCase):
+    def setUp(self):
+        self.impulse = Impulse(Data(surveys=()), Config(1))
+
+    def test_a_matches_sample_loop(self):
+        rng = np.random.default_rng(4)
+        press = rng.uniform(1, 5, 50)
+        press[[3, 10, 11]] = 0
+        thrust = rng.uniform(0.5, 2, 50)
+        thrust[10] = 0
+        jet_field = 2e-4
+        a = self.impulse.get_a(Quantity(press, 1e6), Quantity(thrust, 1e3),
+                               jet_field)
+
+        ratios = [f * 1e3 / (p * 1e6 * jet_field)
+                  for p, f in zip(press, thrust) if p]
+        counted = sum(1 for p, f in zip(press, thrust) if p or f)
+        self.assertAlmostEqual(a.mean, sum(ratios) / counted)
+        self.assertAlmostEqual(a.min, min(ratios))
+        self.assertAlmostEqual(a.max, max(ratios))
+        self.assertAlmostEqual(a.stdev, np.std(ratios, ddof=1))
+        self.assertTrue(np.isnan(a.series[[3, 10, 11]]).all())
+        np.testing.assert_allclose(a.series[~np.isnan(a.series)], ratios)
+
+    def test_a_without_pressure(self):
+        a = self.impulse.get_a(Quantity(np.zeros(4)), Quantity(np.zeros(4)),
+                               1e-4)
+        self.assertEqual((a.mean, a.min, a.max, a.stdev), (0, 0, 0, 0))
+
+    def test_surveys_without_pressure_get_empty_a(self):
+        thrust = [0.0, 1.0, 2.0, 2.0, 1.0, 0.0]
+        surveys = (make_survey("thrust", [thrust], 1.0, 0, 5, 5,
+                               jet_diameter=5, fuel_mass=10),
+                   make_survey("pressthru", [[0.0, 2, 4, 4, 2, 0], thrust],
+                               1.0, 0, 5, 5, jet_diameter=5, fuel_mass=10))
+        outputs = Impulse(Data(surveys), Config(1)).get_results()
+        empty = ThrustCoefficient.empty()
+        self.assertTrue(math.isnan(outputs[0].a))
+        self.assertEqual(len(outputs[0].a_series), 0)
+        self.assertTrue(all(math.isnan(v) for v in
+                            (empty.mean, empty.min, empty.max, empty.stdev)))
+        jet_field = math.pi * 0.005**2 / 4
+        self.assertAlmostEqual(outputs[1].a, 0.5e3 / (1e6 * jet_field))
+        self.assertAlmostEqual(outputs[0].total_impulse,
+                               outputs[1].total_impulse)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+from typing import Sequence
+import numpy as np
+from app.head.objects import Survey, SignalSet, Fuel
+
+GRAIN = {"fuel_outer_diameter": 20.0, "fuel_inner_diameter": 8.0,
+         "fuel_length": 40.0, "fuel_mass": 15.0, "chamber_diameter": 24.0,
+         "chamber_length": 60.0, "heat_lose_factor": 1.0,
+         "expense_lose_factor": 1.0}
+
+
+def make_survey(s_type: str, channels: Sequence[Sequence[float]],
+    sampling_time: float, t0: float, tk: float, tc: float, **fields)\
+    -> Survey:
+    survey = Survey()
+    fields.update({"type": s_type, "sampling_time": sampling_time,
+        "raw_values": SignalSet.for_survey(s_type, channels, sampling_time),
+        "multipliers": [1] * len(channels), "t0": t0, "tk": tk, "tc": tc})
+    survey.update(fields)
+    return survey
+
+
+def make_fuel(strength: float = 1.0, k: float = 1.25) -> Fuel:
+    fuel = Fuel()
+    fuel.update({"name": "P", "strength": strength, "k": k})
+    return fuel
+
+
+def make_variables(**fields) -> SimpleNamespace:
+    fields.setdefault("w", 100.0)
+    fields.setdefault("fuel", make_fuel())
+    return SimpleNamespace(**fields)
+
+
+def steady_burn(pressure: float, A: float, n: float, jet_diameter: float,
+    sampling_time: float = 0.1, noise: float = 0.0)\
+    -> Survey:
+    """Press survey of the grain burning at a constant pressure [MPa] for
+    the web over A p^n, times noise, with a quiet 10 ms before and after."""
+    web = (GRAIN["fuel_outer_diameter"] - GRAIN["fuel_inner_diameter"]) / 4
+    burn_time = 1e-3 * web / (A * (1e6 * pressure)**n) * (1 + noise) #s
+    samples = int(round(1e3 * burn_time / sampling_time))
+    quiet = int(round(10 / sampling_time))
+    values = np.zeros(2 * quiet + samples + 1)
+    values[quiet:quiet+samples+1] = pressure
+    t0 = quiet * sampling_time
+    tk = (quiet + samples) * sampling_time
+    return make_survey("press", [values], sampling_time, t0, tk,
+        tk + 5, jet_diameter=jet_diameter, **GRAIN)
+
+
+def varying_burn(pressure: float, A: float, n: float, bulge: float,
+    jet_diameter: float, sampling_time: float = 0.1)\
+    -> Survey:
+    """Press survey of pressure [MPa] p * (1 + bulge * sin(pi * t / tb))
+    through the burn, p rescaled so that A p^n integrated by trapezes from
+    t0 to tk burns exactly the web."""
+    web = 1e-3 * (GRAIN["fuel_outer_diameter"] -
+                  GRAIN["fuel_inner_diameter"]) / 4
+    burn_time = web / (A * (1e6 * pressure)**n) #s
+    samples = int(round(1e3 * burn_time / sampling_time))
+    shape = 1 + bulge * np.sin(np.linspace(0, np.pi, samples + 1))
+    powers = shape**n
+    integral = 1e-3 * sampling_time * (powers.sum() - (powers[0] +
+                                                       powers[-1]) / 2)
+    scale = 1e-6 * (web / (A * integral))**(1 / n)
+    quiet = int(round(10 / sampling_time))
+    values = np.zeros(2 * quiet + samples + 1)
+    values[quiet:quiet+samples+1] = scale * shape
+    t0 = quiet * sampling_time
+    tk = (quiet + samples) * sampling_time
+    return make_survey("press", [values], sampling_time, t0, tk,
+        tk + 5, jet_diameter=jet_diameter, **GRAIN)
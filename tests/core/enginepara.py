@@ -25,9 +25,5 @@ class EngineParaTest:
 
         headers = ("fi1", "fi2", "lam", "K0_k", "z_a", "Xa", "Fw",
             "K_k", "Fmin\n[mm2]", "R\n[N*s]", "P\n[MPa*s]")
-        values = []
-        for val in results:
-            values.append(val)
-
-        data = values, 
+        data = (*results.surveys, results.mean, results.stdev)
         print(t.tabulate(data, headers, tablefmt='orgtbl'))
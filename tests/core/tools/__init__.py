@@ -0,0 +1,5 @@
+from .integrals import IntegralsTest
+from .integral_index import IntegralIndexTest
+from .regression import RegressionTest
+from .nozzle import NozzleTest
+from .trace import TraceTest
@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+from app.core.tools import Integrals, IntegralIndex
+
+
+class Owner:
+    def __init__(self, values):
+        self.values = values
+
+
+class IntegralIndexTest(unittest.TestCase):
+    METHODS = (Integrals.rect, Integrals.trapeze,
+               Integrals.simpson, Integrals.composite_simpson)
+
+    def test_windows_match_integrals(self):
+        rng = np.random.default_rng(1)
+        values = rng.uniform(0, 5, 60)
+        for method, integral in enumerate(self.METHODS):
+            index = IntegralIndex(values, 0.2, method)
+            for start, end in ((0, 59), (3, 3), (3, 4), (3, 5), (4, 11),
+                               (7, 30), (10, 59), (1, 58)):
+                with self.subTest(method=method, start=start, end=end):
+                    self.assertAlmostEqual(
+                        index.window(start, end),
+                        integral(values[start:end+1], 0.2))
+
+    def test_cumulative_matches_windows(self):
+        rng = np.random.default_rng(2)
+        values = rng.uniform(0, 5, 40)
+        for method in range(len(self.METHODS)):
+            index = IntegralIndex(values, 0.2, method)
+            for start, end in ((0, 39), (3, 3), (3, 5), (5, 30)):
+                with self.subTest(method=method, start=start, end=end):
+                    expected = [index.window(start, i)
+                                for i in range(start, end + 1)]
+                    np.testing.assert_allclose(
+                        index.cumulative(start, end), expected)
+
+    def test_index_is_cached_until_channel_changes(self):
+        owner = Owner([[1.0, 2.0, 3.0]])
+        index = IntegralIndex.of(owner, 0, 1, 1.0)
+        self.assertIs(IntegralIndex.of(owner, 0, 1, 1.0), index)
+        owner.values[0] = [2.0, 4.0, 6.0]
+        new_index = IntegralIndex.of(owner, 0, 1, 1.0)
+        self.assertIsNot(new_index, index)
+        self.assertEqual(new_index.window(0, 2), 8.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
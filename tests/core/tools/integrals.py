@@ -0,0 +1,71 @@
+import unittest
+import math
+import array
+import numpy as np
+from app.core.tools import Integrals
+
+
+def matrix_simpson(values, smp_time):
+    "Per-interval Vandermonde solve, as the method was first written."
+    h_smp_time = smp_time / 2
+    x = [h_smp_time * i for i in range(2 * len(values) - 1)]
+    y = [values[0]]
+    for val in values[1:]:
+        y.append((val + y[-1]) / 2)
+        y.append(val)
+
+    total_sum = 0
+    for v in range(len(values) - 1):
+        j = 2 * v
+        f_m = np.array([[x[j + i] ** 2, x[j + i], 1] for i in range(3)])
+        a, b, c = np.linalg.inv(f_m) @ np.array(y[j:j + 3])
+        x_p, x_k = x[j], x[j + 2]
+        total_sum += a * (x_k**3 - x_p**3) / 3 +\
+            b * (x_k**2 - x_p**2) / 2 + c * (x_k - x_p)
+    return total_sum
+
+
+class IntegralsTest(unittest.TestCase):
+    def test_simpson_matches_matrix_method(self):
+        rng = np.random.default_rng(0)
+        for length in (2, 3, 10, 101):
+            values = tuple(rng.uniform(0, 10, length))
+            with self.subTest(length=length):
+                self.assertAlmostEqual(
+                    Integrals.simpson(values, 0.01),
+                    matrix_simpson(values, 0.01), places=6)
+
+    def test_single_sample(self):
+        for method in (Integrals.rect, Integrals.trapeze,
+                       Integrals.simpson, Integrals.composite_simpson):
+            with self.subTest(method=method.__name__):
+                self.assertEqual(method((4.0,), 0.5), 2.0)
+
+    def test_composite_simpson_is_exact_for_cubics(self):
+        for intervals in (2, 3, 4, 5, 8, 9):
+            xs = np.linspace(0, 2, intervals + 1)
+            values = xs**3 - xs**2 + 1
+            with self.subTest(intervals=intervals):
+                self.assertAlmostEqual(
+                    Integrals.composite_simpson(values, xs[1] - xs[0]),
+                    2**4 / 4 - 2**3 / 3 + 2)
+
+    def test_composite_simpson_converges(self):
+        xs = np.linspace(0, math.pi, 1001)
+        self.assertAlmostEqual(
+            Integrals.composite_simpson(np.sin(xs), xs[1] - xs[0]), 2, places=10)
+
+    def test_accepts_buffers(self):
+        values = [0.5, 1.5, 3.0, 2.0, 1.0, 0.25]
+        buffers = (tuple(values), np.array(values),
+                   array.array("d", values), memoryview(array.array("d", values)))
+        for method in (Integrals.rect, Integrals.trapeze,
+                       Integrals.simpson, Integrals.composite_simpson):
+            expected = method(values, 0.1)
+            for buffer in buffers:
+                with self.subTest(method=method.__name__, type=type(buffer)):
+                    self.assertAlmostEqual(method(buffer, 0.1), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+import numpy as np
+from app.core.tools import solve_Xa, XaTable
+from app.core.tools.nozzle import K0_k
+
+
+class NozzleTest(unittest.TestCase):
+    def test_solves_expansion_equation(self):
+        k, zeta_a = np.meshgrid(np.linspace(1.1, 1.4, 7),
+                                np.linspace(1.0, 25.0, 9))
+        Xa = solve_Xa(k, K0_k(k), zeta_a)
+        lhs = np.sqrt(Xa**(1/k) - Xa**((k+1)/k))
+        np.testing.assert_allclose(lhs, K0_k(k) / zeta_a**2, rtol=1e-10)
+        self.assertTrue(np.all(Xa < 1 / (k + 1)))
+
+    def test_known_value(self):
+        self.assertAlmostEqual(float(solve_Xa(1.25, K0_k(1.25), 4.5)),
+                               1.0705695376542814e-05, delta=1e-18)
+
+    def test_no_solution_is_nan(self):
+        self.assertTrue(np.isnan(solve_Xa(1.2, 5.0, 1.0)))
+
+    def test_table_within_error(self):
+        table = XaTable()
+        rng = np.random.default_rng(5)
+        k = rng.uniform(1.05, 1.45, 500)
+        zeta_a = rng.uniform(1.2, 22.0, 500)
+        exact = solve_Xa(k, K0_k(k), zeta_a)
+        np.testing.assert_allclose(table(k, zeta_a), exact,
+                                   rtol=table.error)
+        self.assertLess(table.error, 1e-3)
@@ -0,0 +1,109 @@
+import unittest
+import math
+import numpy as np
+from app.core.tools import sufficient_statistics, fit_line, RunningStatistics,\
+    fit_segments, f_test
+
+
+class RegressionTest(unittest.TestCase):
+    def test_fit_matches_polyfit(self):
+        rng = np.random.default_rng(3)
+        xs = rng.uniform(14, 16, 12)
+        ys = 0.4 * xs - 11 + rng.normal(0, 0.02, 12)
+        fit = fit_line(sufficient_statistics(xs, ys))
+        (slope, intercept), cov = np.polyfit(xs, ys, 1, cov="unscaled")
+
+        residuals = ys - (slope * xs + intercept)
+        s2 = residuals @ residuals / (len(xs) - 2)
+        self.assertAlmostEqual(fit.slope, slope)
+        self.assertAlmostEqual(fit.intercept, intercept)
+        self.assertAlmostEqual(fit.slope_se, math.sqrt(s2 * cov[0, 0]))
+        self.assertAlmostEqual(fit.intercept_se, math.sqrt(s2 * cov[1, 1]))
+        self.assertAlmostEqual(fit.r2, np.corrcoef(xs, ys)[0, 1]**2)
+        self.assertAlmostEqual(fit.slope_ci[1] - fit.slope,
+                               2.228 * fit.slope_se)
+
+    def test_two_points_have_no_errors(self):
+        fit = fit_line(sufficient_statistics((1.0, 2.0), (3.0, 5.0)))
+        self.assertAlmostEqual(fit.slope, 2.0)
+        self.assertAlmostEqual(fit.intercept, 1.0)
+        self.assertTrue(math.isnan(fit.slope_se))
+
+    def test_running_statistics_follow_toggles(self):
+        points = ((1.0, 2.0), (2.0, 2.9), (3.0, 4.2), (4.0, 5.1))
+        running = RunningStatistics()
+        for point in points:
+            running.add(*point)
+        running.remove(*points[1])
+        self.assertEqual(len(running), 3)
+
+        expected = sufficient_statistics(*zip(*(points[0], *points[2:])))
+        for value, expected_value in zip(running.statistics, expected):
+            self.assertAlmostEqual(value, expected_value)
+        running.remove(*points[0])
+        running.remove(*points[2])
+        self.assertIsNone(running.fit())
+
+    def test_running_statistics_merge_point_sets(self):
+        running = RunningStatistics()
+        first = sufficient_statistics((1.0, 2.0), (2.0, 3.1))
+        second = sufficient_statistics((3.0, 4.0), (3.9, 5.2))
+        running.add_statistics(first)
+        running.add_statistics(second)
+        fit = running.fit()
+        expected = fit_line(sufficient_statistics(
+            (1.0, 2.0, 3.0, 4.0), (2.0, 3.1, 3.9, 5.2)))
+        self.assertAlmostEqual(fit.slope, expected.slope)
+        running.remove_statistics(first)
+        self.assertEqual(len(running), 2)
+
+    def test_segments_find_slope_break(self):
+        rng = np.random.default_rng(4)
+        xs = rng.uniform(14, 16, 300)
+        ys = np.where(xs < 15, 0.7 * (xs - 15), 0.2 * (xs - 15)) +\
+            rng.normal(0, 0.005, 300)
+        fit = fit_segments(xs, ys)
+        self.assertEqual(len(fit.lines), 2)
+        self.assertAlmostEqual(fit.breaks[0], 15, places=1)
+        self.assertAlmostEqual(fit.lines[0].slope, 0.7, places=1)
+        self.assertAlmostEqual(fit.lines[1].slope, 0.2, places=1)
+
+    def test_segments_find_two_breaks_among_many_points(self):
+        rng = np.random.default_rng(6)
+        xs = rng.uniform(0, 3, 30_000)
+        ys = np.where(xs < 1, 0.3 * xs, np.where(xs < 2, 0.3 + 0.9 * (xs - 1),
+                                                 1.2 + 0.2 * (xs - 2))) +\
+            rng.normal(0, 0.02, 30_000)
+        fit = fit_segments(xs, ys)
+        self.assertEqual(len(fit.lines), 3)
+        self.assertAlmostEqual(fit.breaks[0], 1, places=1)
+        self.assertAlmostEqual(fit.breaks[1], 2, places=1)
+        every = fit_segments(xs[:2000], ys[:2000], max_first_splits=2000)
+        strided = fit_segments(xs[:2000], ys[:2000], max_first_splits=50)
+        self.assertEqual(strided.breaks, every.breaks)
+
+    def test_segments_keep_one_line_without_break(self):
+        rng = np.random.default_rng(5)
+        xs = rng.uniform(14, 16, 200)
+        fit = fit_segments(xs, 0.4 * xs + rng.normal(0, 0.01, 200))
+        self.assertEqual(len(fit.lines), 1)
+        self.assertEqual(fit.breaks, ())
+
+    def test_segments_keep_one_line_of_few_surveys(self):
+        rng = np.random.default_rng(7)
+        split = 0
+        for trial in range(500):
+            count = 6 + trial % 7
+            xs = np.log(rng.uniform(2e6, 12e6, count))
+            ys = np.log(3e-5) + 0.4 * xs + rng.normal(0, 0.03, count)
+            split += len(fit_segments(xs, ys).lines) > 1
+        self.assertLess(split / 500, 0.02)
+
+    def test_f_test_matches_t_test_of_one_parameter(self):
+        #F(1, 10) of t = 2.228 is the two-sided 5% point of t with 10 d.o.f.
+        p = f_test(1 + 2.228**2 / 10, 11, 1.0, 10)
+        self.assertAlmostEqual(p, 0.05, places=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
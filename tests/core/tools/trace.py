@@ -0,0 +1,40 @@
+import unittest
+import io
+import json
+import numpy as np
+from app.core.tools import Trace, NULL_TRACE
+
+
+class TraceTest(unittest.TestCase):
+    def test_records_under_open_stage(self):
+        trace = Trace()
+        trace.record("outside", 1)
+        with trace.stage("nozzle"):
+            trace.record("Xa", np.array([1e-5, 2e-5]))
+        with trace.stage("nozzle"):
+            trace.record("Fw", 2.9, "-")
+
+        self.assertEqual([(r.stage, r.name) for r in trace.records],
+                         [("", "outside"), ("nozzle", "Xa"), ("nozzle", "Fw")])
+        self.assertEqual(list(trace.timings), ["nozzle"])
+        self.assertGreaterEqual(trace.timings["nozzle"], 0)
+
+    def test_dumps_numpy_values_as_json(self):
+        trace = Trace()
+        with trace.stage("integrals"):
+            trace.record("P", np.array([1.5, 2.5]), "Pa*s")
+            trace.record("n", np.float64(0.4))
+        file = io.StringIO()
+        trace.dump_json(file)
+
+        dumped = json.loads(file.getvalue())
+        self.assertEqual(dumped["records"][0], {"stage": "integrals",
+            "name": "P", "value": [1.5, 2.5], "unit": "Pa*s"})
+        self.assertEqual(dumped["records"][1]["value"], 0.4)
+        self.assertIn("integrals", dumped["timings"])
+
+    def test_null_trace_records_nothing(self):
+        with NULL_TRACE.stage("fit"):
+            NULL_TRACE.record("A", 1.0)
+        self.assertFalse(NULL_TRACE.enabled)
+        self.assertFalse(hasattr(NULL_TRACE, "records"))
@@ -0,0 +1 @@
+from .sqlite_store import SqliteStoreTest
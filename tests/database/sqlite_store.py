@@ -0,0 +1,172 @@
+import unittest
+import datetime
+import tempfile
+from unittest import mock
+import numpy as np
+from app.head.database import Database as db, PickleStore
+from app.head.objects import Fuel, Survey, SignalSet
+
+
+def make_survey(jet_diameter, samples=(0.0, 1.5, 3.0), save_date="01.02.2020"):
+    survey = Survey()
+    survey.update({"type": "pressthru", "sampling_time": 0.5,
+                   "jet_diameter": jet_diameter, "fuel_mass": 10.0,
+                   "raw_values": SignalSet.for_survey(
+                       "pressthru", [samples, samples[::-1]], 0.5),
+                   "multipliers": [1, 2]})
+    survey.add_patch(0, 0, 2)
+    survey.save_date = save_date
+    return survey
+
+
+class SqliteStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        db.open(self.folder.name)
+        fuel = Fuel()
+        fuel.update({"name": "P1", "k": 1.2})
+        db.save_fuel(fuel)
+
+    def tearDown(self):
+        db.store.close()
+        db.store = None
+        self.folder.cleanup()
+
+    def test_surveys_keep_samples_and_order(self):
+        for diameter in (4, 5, 6):
+            db.save_survey("P1", make_survey(diameter))
+        surveys = db.load_surveys("P1", "pressthru")
+        self.assertEqual([s.jet_diameter for s in surveys], [4, 5, 6])
+        self.assertEqual(surveys[0].raw_values.units, ("MPa", "kN"))
+        self.assertEqual(surveys[0].values[1].tolist(), [6.0, 3.0, 0.0])
+        self.assertEqual(surveys[0].patches, [(0, 0, 2, None)])
+        self.assertFalse(db.load_surveys("P1", "press"))
+
+    def test_saving_survey_only_appends(self):
+        for diameter in range(30):
+            db.save_survey("P1", make_survey(diameter))
+        statements = []
+        db.store.connection.set_trace_callback(statements.append)
+        db.save_survey("P1", make_survey(30))
+        db.store.connection.set_trace_callback(None)
+        queries = [s.split()[0] for s in statements]
+        self.assertEqual(queries, ["BEGIN", "INSERT", "INSERT", "COMMIT"])
+        self.assertEqual(db.store.connection.execute(
+            "PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_ids_stay_through_removal_and_edit(self):
+        for diameter in (4, 5, 6):
+            db.save_survey("P1", make_survey(diameter))
+        ids = [s.db_id for s in db.load_surveys("P1", "pressthru")]
+        db.remove_survey("P1", "pressthru", ids[1])
+        db.edit_survey("P1", "pressthru", ids[0], make_survey(7))
+        surveys = db.load_surveys("P1", "pressthru")
+        self.assertEqual([s.jet_diameter for s in surveys], [7, 6])
+        self.assertEqual([s.db_id for s in surveys], [ids[0], ids[2]])
+
+    def test_metadata_edit_leaves_samples(self):
+        db.save_survey("P1", make_survey(4))
+        survey, = db.load_surveys("P1", "pressthru")
+        survey.update({"comment": "nowy"})
+        changes = db.store.connection.total_changes
+        db.edit_survey("P1", "pressthru", survey.db_id, survey)
+        self.assertEqual(db.store.connection.total_changes - changes, 1)
+        survey.raw_values = [[1.0, 2.0], [3.0, 4.0]]
+        db.edit_survey("P1", "pressthru", survey.db_id, survey)
+        edited, = db.load_surveys("P1", "pressthru")
+        self.assertEqual(edited.comment, "nowy")
+        self.assertEqual(edited.raw_values[1].tolist(), [3.0, 4.0])
+        header, = db.list_survey_headers("P1", "pressthru")
+        self.assertEqual(header.peak_times, (0.5, 0.5))
+
+    def test_deleted_surveys_wait_for_compaction(self):
+        for diameter in (4, 5, 6, 7):
+            db.save_survey("P1", make_survey(diameter))
+        ids = [s.db_id for s in db.load_surveys("P1", "pressthru")]
+        db.remove_surveys("P1", "pressthru", ids[:2])
+        self.assertEqual(len(db.load_surveys("P1", "pressthru")), 2)
+        count = "SELECT COUNT(*) FROM samples"
+        self.assertEqual(db.store.connection.execute(count).fetchone()[0], 4)
+        self.assertTrue(db.store.needs_compaction())
+        db.compact()
+        self.assertEqual(db.store.connection.execute(count).fetchone()[0], 2)
+        self.assertFalse(db.store.needs_compaction())
+
+    def test_headers_list_without_samples(self):
+        for diameter in (4, 5):
+            db.save_survey("P1", make_survey(diameter, samples=(0.0, 5.0, 1.0)))
+        statements = []
+        db.store.connection.set_trace_callback(statements.append)
+        headers = db.list_survey_headers("P1", "pressthru")
+        db.store.connection.set_trace_callback(None)
+        self.assertNotIn("samples", " ".join(statements))
+        self.assertEqual([h.jet_diameter for h in headers], [4, 5])
+        self.assertEqual(headers[0].save_date, "01.02.2020")
+        self.assertEqual(headers[0].peak_times, (1.0, 0.5))
+        surveys = db.load_surveys_by_id([headers[1].db_id, headers[0].db_id])
+        self.assertEqual([s.jet_diameter for s in surveys], [5, 4])
+        self.assertEqual(db.load_survey(headers[0].db_id).values[1].tolist(),
+                         [2.0, 10.0, 0.0])
+
+    def test_upgrade_fills_peaks_of_surveys_with_stale_patches(self):
+        survey = make_survey(4)
+        survey.raw_values = [[1.0, 2.0], [3.0, 4.0]] #patch up to sample 2
+        db.save_survey("P1", survey)
+        with db.store.connection:
+            db.store.connection.execute(
+                "ALTER TABLE surveys DROP COLUMN peak_times")
+        db.open(self.folder.name)
+        header, = db.list_survey_headers("P1", "pressthru")
+        self.assertEqual(header.peak_times, (0.5, 0.5))
+
+    def test_find_surveys_filters_metadata(self):
+        db.save_survey("P1", make_survey(4, save_date="01.02.2020"))
+        db.save_survey("P1", make_survey(5, save_date="03.02.2020"))
+        db.save_survey("P1", make_survey(4, save_date="05.02.2020"))
+        found = db.find_surveys("P1", jet_diameter=4,
+                                saved_from=datetime.datetime(2020, 2, 2))
+        self.assertEqual([s.save_date for s in found], ["05.02.2020"])
+
+    def test_removing_fuel_removes_surveys(self):
+        db.save_survey("P1", make_survey(4))
+        db.remove_fuel("P1")
+        self.assertFalse(db.is_fuel("P1"))
+        self.assertEqual(db.store.connection.execute(
+            "SELECT COUNT(*) FROM samples").fetchone()[0], 0)
+
+    def test_legacy_folder_is_imported(self):
+        with tempfile.TemporaryDirectory() as folder:
+            legacy = PickleStore(folder)
+            fuel = Fuel()
+            fuel.update({"name": "P2"})
+            legacy.save_fuel(fuel)
+            legacy.save_survey("P2", make_survey(8))
+            store = db.open(folder)
+            self.assertEqual(store.get_fuels_list(), ["P2"])
+            survey, = db.load_surveys("P2", "pressthru")
+            np.testing.assert_array_equal(survey.raw_values.data,
+                                          make_survey(8).raw_values.data)
+
+    def test_interrupted_legacy_import_is_retried(self):
+        with tempfile.TemporaryDirectory() as folder:
+            legacy = PickleStore(folder)
+            for name in ("P2", "P3"):
+                fuel = Fuel()
+                fuel.update({"name": name})
+                legacy.save_fuel(fuel)
+                legacy.save_survey(name, make_survey(8))
+            with mock.patch.object(PickleStore, "load_surveys",
+                                   side_effect=EOFError):
+                with self.assertRaises(EOFError):
+                    db.open(folder)
+            self.assertEqual(db.get_fuels_list(), [])
+            self.assertTrue(db.store.is_import_pending())
+
+            store = db.open(folder)
+            self.assertEqual(store.get_fuels_list(), ["P2", "P3"])
+            self.assertEqual(len(db.load_surveys("P3", "pressthru")), 1)
+            self.assertFalse(store.is_import_pending())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,2 @@
+from .signal_set import SignalSetTest
+from .survey import SurveyTest
@@ -0,0 +1,34 @@
+import unittest
+import pickle
+import numpy as np
+from app.head.objects import SignalSet
+
+
+class SignalSetTest(unittest.TestCase):
+    def test_channels_share_one_buffer(self):
+        signals = SignalSet.for_survey("pressthru", [[1, 2, 3], [4, 5, 6]], 0.5)
+        self.assertEqual(signals.names, ("ciśnienie", "ciąg"))
+        self.assertEqual(signals.units, ("MPa", "kN"))
+        self.assertEqual(len(signals), 2)
+        self.assertTrue(np.shares_memory(signals[1], signals.data))
+
+    def test_assignment_replaces_channel_view(self):
+        signals = SignalSet([[1, 2, 3]])
+        channel = signals[0]
+        self.assertIs(signals[0], channel)
+        signals[0] = [2, 4, 6]
+        self.assertIsNot(signals[0], channel)
+        self.assertEqual(signals[0].tolist(), [2.0, 4.0, 6.0])
+
+    def test_float32_storage(self):
+        signals = SignalSet([[1, 2, 3]], dtype=np.float32)
+        self.assertEqual(signals.nbytes, 12)
+
+    def test_pickle_roundtrip(self):
+        signals = pickle.loads(pickle.dumps(SignalSet([[1, 2], [3, 4]], sampling_time=2)))
+        self.assertEqual(signals[1].tolist(), [3.0, 4.0])
+        self.assertEqual(signals.sampling_time, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import pickle
+from app.head.objects import Survey, SignalSet
+
+
+class SurveyTest(unittest.TestCase):
+    def setUp(self):
+        self.survey = Survey()
+        self.survey.update({"type": "pressthru", "sampling_time": 1.0,
+            "raw_values": SignalSet.for_survey(
+                "pressthru", [[0, 1, 5, 3, 4], [1, 1, 1, 1, 1]], 1.0),
+            "multipliers": [1, 1]})
+
+    def test_values_are_derived_from_raw_values(self):
+        self.survey.set_multiplier(1, 2)
+        self.assertEqual(self.survey.values[0].tolist(), [0, 1, 5, 3, 4])
+        self.assertEqual(self.survey.values[1].tolist(), [2, 2, 2, 2, 2])
+        self.assertEqual(self.survey.raw_values[1].tolist(), [1, 1, 1, 1, 1])
+
+    def test_values_are_cached_until_invalidated(self):
+        values = self.survey.values
+        self.assertIs(self.survey.values, values)
+        self.survey.set_multiplier(0, 3)
+        self.assertIsNot(self.survey.values, values)
+
+    def test_bridge_patch_survives_multiplier_change(self):
+        self.survey.add_patch(0, 1, 3)
+        self.assertEqual(self.survey.values[0].tolist(), [0, 1, 2, 3, 4])
+        self.survey.set_multiplier(0, 2)
+        self.assertEqual(self.survey.values[0].tolist(), [0, 2, 4, 6, 8])
+        self.survey.reset_values()
+        self.assertEqual(self.survey.values[0].tolist(), [0, 1, 5, 3, 4])
+
+    def test_pickle_keeps_only_raw_values(self):
+        self.survey.add_patch(0, 1, 3)
+        self.survey.values
+        state = self.survey.__getstate__()
+        self.assertNotIn("_values", state)
+        loaded = pickle.loads(pickle.dumps(self.survey))
+        self.assertEqual(loaded.values[0].tolist(), [0, 1, 2, 3, 4])
+
+    def test_legacy_survey_lists_are_converted(self):
+        survey = Survey()
+        state = survey.__dict__.copy()
+        state.update({"type": "press", "sampling_time": 0.1,
+                      "raw_values": [[0.0, 1.0]], "values": [[0.0, 2.0]]})
+        legacy = Survey.__new__(Survey)
+        legacy.__setstate__(state)
+        self.assertIsInstance(legacy.values, SignalSet)
+        self.assertEqual(legacy.values[0].tolist(), [0.0, 2.0])
+        self.assertEqual(legacy.raw_values.units, ("MPa",))
+
+
+if __name__ == "__main__":
+    unittest.main()